@@ -2,16 +2,30 @@
 FastAPI routes for entity extraction.
 """
 
+import asyncio
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException, status
 from ..schemas.entity import (
     EntityRequest,
     EntityBatchRequest,
     EntityResponse,
     EntityBatchResponse,
+    EntityCooccurrenceRequest,
+    EntityCooccurrenceResponse,
     ErrorResponse,
     EntitySummary
 )
-from ..services.entity_extractor import EntityExtractor, get_extractor
+from ..services.entity_extractor import (
+    EntityExtractor,
+    get_extractor,
+    extract_entities_batch as run_batch_extraction
+)
+from ..services.entity_index import get_entity_index
+from ..services.inference_executor import get_inference_executor
+from ..services.micro_batcher import get_micro_batcher
+from ..services.model_registry import get_model_registry
+from ..services.result_cache import get_result_cache
 
 router = APIRouter(prefix="/entities", tags=["Entity Extraction"])
 
@@ -34,6 +48,7 @@ async def extract_entities(request: EntityRequest) -> EntityResponse:
     - **text**: The text to extract entities from
     - **model**: NER model to use (default: biomedical-ner-all)
     - **confidence_threshold**: Minimum confidence score (0-1)
+    - **article_id**: Optional article ID, to update the entity index
     """
     try:
         extractor = get_extractor(
@@ -41,9 +56,18 @@ async def extract_entities(request: EntityRequest) -> EntityResponse:
             confidence_threshold=request.confidence_threshold
         )
 
-        entities = extractor.extract_entities(request.text)
+        entities = await get_micro_batcher().extract(
+            request.text,
+            request.model,
+            request.confidence_threshold
+        )
         summary_data = extractor.get_entity_summary(entities)
 
+        if request.article_id is not None:
+            await asyncio.to_thread(
+                get_entity_index().index_article, request.article_id, entities
+            )
+
         return EntityResponse(
             success=True,
             entities=entities,
@@ -82,16 +106,31 @@ async def extract_entities_batch(request: EntityBatchRequest) -> EntityBatchResp
     - **texts**: List of texts to process
     - **model**: NER model to use
     - **confidence_threshold**: Minimum confidence score
+    - **batch_size**: Token windows per model forward pass (optional; server default)
+    - **article_ids**: Optional article ID per text, to update the entity index
     """
+    if request.article_ids is not None and len(request.article_ids) != len(request.texts):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="article_ids must have one entry per text"
+        )
+
     try:
         extractor = get_extractor(
             model_name=request.model,
             confidence_threshold=request.confidence_threshold
         )
 
+        batch_entities = await get_inference_executor().run(
+            run_batch_extraction,
+            request.texts,
+            request.model,
+            request.confidence_threshold,
+            request.batch_size
+        )
+
         results = []
-        for text in request.texts:
-            entities = extractor.extract_entities(text)
+        for text, entities in zip(request.texts, batch_entities):
             summary_data = extractor.get_entity_summary(entities)
 
             results.append(EntityResponse(
@@ -102,6 +141,12 @@ async def extract_entities_batch(request: EntityBatchRequest) -> EntityBatchResp
                 model_used=request.model
             ))
 
+        if request.article_ids is not None:
+            await asyncio.to_thread(
+                get_entity_index().index_articles,
+                dict(zip(request.article_ids, batch_entities))
+            )
+
         return EntityBatchResponse(
             success=True,
             results=results,
@@ -115,6 +160,86 @@ async def extract_entities_batch(request: EntityBatchRequest) -> EntityBatchResp
         )
 
 
+@router.get(
+    "/stats",
+    summary="Inference metrics",
+    description="Inference pool queue depth and wait/run times, micro-batching, loaded model and result cache statistics."
+)
+async def inference_stats() -> dict:
+    """Get inference executor, batching, model and cache metrics."""
+    return {
+        "executor": get_inference_executor().stats(),
+        "batching": get_micro_batcher().stats(),
+        "models": get_model_registry().stats(),
+        "cache": get_result_cache().stats()
+    }
+
+
+@router.get(
+    "/executor/stats",
+    summary="Inference executor metrics",
+    description="Queue depth, running tasks and wait/run times of the NER inference pool. "
+                "Kept for existing clients; GET /entities/stats includes the same data.",
+    deprecated=True
+)
+async def executor_stats() -> dict:
+    """Get inference executor metrics."""
+    return get_inference_executor().stats()
+
+
+@router.post(
+    "/index/articles",
+    response_model=EntityCooccurrenceResponse,
+    summary="Find articles mentioning entities together",
+    description="Articles whose extracted entities include every requested (type, text) pair."
+)
+async def articles_with_entities(request: EntityCooccurrenceRequest) -> EntityCooccurrenceResponse:
+    """
+    Find articles in which all given entities co-occur.
+
+    - **entities**: (type, text) pairs, e.g. a drug and an adverse event
+    - **article_ids**: Optional set of articles to search within
+    - **limit**: Maximum article IDs returned
+    """
+    keys = [(entity.type, entity.text) for entity in request.entities]
+    article_ids = await asyncio.to_thread(
+        get_entity_index().articles_with, keys, request.article_ids
+    )
+    return EntityCooccurrenceResponse(
+        count=len(article_ids),
+        article_ids=article_ids[:request.limit]
+    )
+
+
+@router.get(
+    "/index/cooccurring",
+    summary="Entities co-occurring with an entity",
+    description="Entities most often mentioned in the same articles as the given one."
+)
+async def cooccurring_entities(
+    type: str,
+    text: str,
+    other_type: Optional[str] = None,
+    limit: int = 20
+) -> dict:
+    """Get entities that co-occur with (type, text), most frequent first."""
+    entities = await asyncio.to_thread(
+        get_entity_index().cooccurring, (type, text), other_type, limit
+    )
+    return {"entity": {"type": type, "text": text}, "cooccurring": entities}
+
+
+@router.get(
+    "/index/top",
+    summary="Most mentioned entities",
+    description="Entities in the entity index ranked by number of articles mentioning them."
+)
+async def top_entities(type: Optional[str] = None, limit: int = 20) -> dict:
+    """Get the most widely mentioned entities."""
+    entities = await asyncio.to_thread(get_entity_index().top_entities, type, limit)
+    return {"entities": entities}
+
+
 @router.get(
     "/models",
     summary="List available NER models",
@@ -0,0 +1,325 @@
+"""
+FastAPI routes for the screening workflow.
+"""
+
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Response, status
+from ..schemas.screening import (
+    ArticleSchema,
+    ProjectStatsResponse,
+    QueueResponse,
+    ReviewDecision,
+    ReviewRequest,
+    ReviewResponse,
+    ScreeningProject,
+    SearchRequest,
+    SearchResponse
+)
+from ..services.relevance_ranker import get_relevance_ranker
+from ..services.review_prefetch import PrefetchedArticle, get_review_prefetcher
+from ..services.screening_jobs import get_job_manager
+from ..services.screening_store import (
+    ArticleNotFoundError,
+    ProjectNotFoundError,
+    ReviewConflictError,
+    get_screening_store
+)
+
+router = APIRouter(prefix="/screening", tags=["Screening"])
+
+
+def _not_found(e: KeyError) -> HTTPException:
+    kind = "Project" if isinstance(e, ProjectNotFoundError) else "Article"
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"{kind} not found: {e.args[0]}"
+    )
+
+
+def _json_response(fields: dict, key: str, article: Optional[PrefetchedArticle]) -> Response:
+    """Build a JSON response, splicing in an article's pre-serialized body."""
+    body = json.dumps(fields, separators=(",", ":")).encode("utf-8")
+    payload = article.payload if article else b"null"
+    return Response(
+        content=body[:-1] + b',"' + key.encode("utf-8") + b'":' + payload + b"}",
+        media_type="application/json"
+    )
+
+
+@router.post(
+    "/projects",
+    response_model=SearchResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Create a screening project from a search",
+    description="Create the project and fill it in the background: search, fetch, "
+                "queue and extract entities. Articles are reviewable as soon as they are queued."
+)
+async def create_project(request: SearchRequest) -> SearchResponse:
+    """
+    Create a screening project.
+
+    - **query**: Search query
+    - **source** / **sources**: Source(s) to search
+    - **max_results**: Maximum results per source
+    - **project_name**: Project name (defaults to the query)
+    - **extract_entities**: Run NER on queued articles
+    """
+    try:
+        job = await get_job_manager().start(request)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    project = await asyncio.to_thread(get_screening_store().get_project, job.project_id)
+    return SearchResponse(
+        project_id=project.id,
+        project_name=project.name,
+        query=request.query,
+        source=project.source.value,
+        total_articles=project.total_articles,
+        message="Project created; articles are being queued in the background",
+        job_id=job.id
+    )
+
+
+@router.get("/jobs", summary="List screening jobs")
+async def list_jobs() -> dict:
+    """List background project-building jobs, newest first."""
+    jobs = await asyncio.to_thread(get_job_manager().list)
+    return {"jobs": [job.to_dict() for job in jobs]}
+
+
+@router.get("/jobs/{job_id}", summary="Get job progress")
+async def get_job(job_id: str) -> dict:
+    """Get a job's status and found / queued / extracted counts."""
+    job = await asyncio.to_thread(get_job_manager().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job not found: {job_id}")
+    return job.to_dict()
+
+
+@router.post("/jobs/{job_id}/cancel", summary="Cancel a job")
+async def cancel_job(job_id: str) -> dict:
+    """Cancel a running job; articles already queued are kept."""
+    manager = get_job_manager()
+    if await asyncio.to_thread(manager.get, job_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Job not found: {job_id}")
+    return {"success": await manager.cancel(job_id), "job_id": job_id}
+
+
+@router.get("/projects", summary="List screening projects")
+async def list_projects() -> list[ScreeningProject]:
+    """List all screening projects, newest first."""
+    return await asyncio.to_thread(get_screening_store().list_projects)
+
+
+@router.get("/projects/{project_id}", response_model=ScreeningProject, summary="Get a project")
+async def get_project(project_id: str) -> ScreeningProject:
+    """Get a screening project and its counters."""
+    try:
+        return await asyncio.to_thread(get_screening_store().get_project, project_id)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+
+
+@router.delete("/projects/{project_id}", summary="Delete a project")
+async def delete_project(project_id: str) -> dict:
+    """Delete a screening project and its queue."""
+    try:
+        await asyncio.to_thread(get_screening_store().delete_project, project_id)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+    return {"success": True, "project_id": project_id}
+
+
+@router.post(
+    "/projects/{project_id}/articles",
+    summary="Add articles manually",
+    description="Append articles (e.g. from manual searching) to the end of a project's queue."
+)
+async def add_articles(project_id: str, articles: list[ArticleSchema]) -> dict:
+    """Add articles to a project's queue."""
+    try:
+        added = await asyncio.to_thread(get_screening_store().add_articles, project_id, articles)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+    return {"success": True, "added": added}
+
+
+@router.get(
+    "/projects/{project_id}/articles",
+    summary="List a project's articles",
+    description="Articles in queue order, optionally filtered by decision."
+)
+async def list_articles(
+    project_id: str,
+    decision: Optional[ReviewDecision] = None,
+    limit: int = 100,
+    offset: int = 0
+) -> dict:
+    """List a project's articles."""
+    store = get_screening_store()
+    try:
+        await asyncio.to_thread(store.get_project, project_id)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+    articles = await asyncio.to_thread(store.list_articles, project_id, decision, limit, offset)
+    return {
+        "project_id": project_id,
+        "articles": [
+            {"position": position, **article.model_dump()} for position, article in articles
+        ]
+    }
+
+
+@router.get(
+    "/projects/{project_id}/queue",
+    response_model=QueueResponse,
+    summary="Get the next article to review"
+)
+async def get_queue(project_id: str, reviewer: str = "default") -> Response:
+    """
+    Get the reviewer's current pending article.
+
+    Articles come in ranked order (most likely relevant first once the
+    relevance ranker is trained), served from a lookahead buffer of
+    articles leased to the reviewer, so reviewers working the same
+    project never get the same article.
+    """
+    try:
+        project = await asyncio.to_thread(get_screening_store().get_project, project_id)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+
+    prefetcher = get_review_prefetcher()
+    current = await asyncio.to_thread(prefetcher.next, project_id, reviewer)
+    prefetcher.schedule_refill(project_id, reviewer)
+    return _json_response(
+        {
+            "success": True,
+            "has_more": current is not None,
+            "position": current.position if current else 0,
+            "total": project.total_articles,
+            "pending": project.pending_count
+        },
+        "article",
+        current
+    )
+
+
+@router.post(
+    "/projects/{project_id}/review",
+    response_model=ReviewResponse,
+    summary="Submit a review decision",
+    description="Record a decision for an article and get the next pending article. "
+                "Returns 409 if the article changed since `version` or is leased to "
+                "another reviewer."
+)
+async def submit_review(project_id: str, request: ReviewRequest) -> Response:
+    """
+    Review an article.
+
+    - **article_id**: Article to review
+    - **decision**: include, exclude, maybe (or pending to undo)
+    - **notes**: Optional reviewer notes
+    - **reviewer**: Reviewer whose queue continues after this article
+    - **version**: Article version the decision was based on
+
+    Include/exclude decisions feed the relevance ranker, which re-ranks
+    the queue in the background every few decisions.
+    """
+    store = get_screening_store()
+    try:
+        await asyncio.to_thread(
+            store.review,
+            project_id,
+            request.article_id,
+            request.decision,
+            request.notes,
+            reviewer=request.reviewer,
+            expected_version=request.version
+        )
+    except (ProjectNotFoundError, ArticleNotFoundError) as e:
+        raise _not_found(e)
+    except ReviewConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    # The reviewed article has left the reviewer's buffer; serve the next one
+    prefetcher = get_review_prefetcher()
+    upcoming = await asyncio.to_thread(prefetcher.next, project_id, request.reviewer)
+    prefetcher.schedule_refill(project_id, request.reviewer)
+    await get_relevance_ranker().schedule(project_id)
+    stats = await asyncio.to_thread(store.stats, project_id)
+
+    return _json_response(
+        {
+            "success": True,
+            "article_id": request.article_id,
+            "decision": request.decision.value,
+            "message": f"Article marked as {request.decision.value}",
+            "stats": stats
+        },
+        "next_article",
+        upcoming
+    )
+
+
+@router.post(
+    "/projects/{project_id}/release",
+    summary="Release a reviewer's articles",
+    description="Return the articles leased to a reviewer to the shared queue, "
+                "e.g. when they stop reviewing."
+)
+async def release_articles(project_id: str, reviewer: str = "default") -> dict:
+    """Release a reviewer's leased articles."""
+    try:
+        await asyncio.to_thread(get_screening_store().get_project, project_id)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+    released = await asyncio.to_thread(get_review_prefetcher().release, project_id, reviewer)
+    return {"success": True, "reviewer": reviewer, "released": released}
+
+
+@router.get(
+    "/projects/{project_id}/ranking",
+    summary="Get the relevance ranker state",
+    description="When the queue was last re-ranked, on how many decisions, "
+                "and the estimated recall."
+)
+async def ranking_status(project_id: str) -> dict:
+    """Get a project's active-learning ranker state."""
+    try:
+        return await asyncio.to_thread(get_relevance_ranker().status, project_id)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+
+
+@router.post(
+    "/projects/{project_id}/ranking/retrain",
+    summary="Retrain the relevance ranker",
+    description="Re-rank the queue now instead of waiting for the next batch of decisions."
+)
+async def retrain_ranking(project_id: str) -> dict:
+    """Start a background retrain of a project's ranker."""
+    ranker = get_relevance_ranker()
+    try:
+        started = await ranker.schedule(project_id, force=True)
+        return {"success": started, **await asyncio.to_thread(ranker.status, project_id)}
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
+
+
+@router.get(
+    "/projects/{project_id}/stats",
+    response_model=ProjectStatsResponse,
+    summary="Get project statistics"
+)
+async def project_stats(project_id: str) -> ProjectStatsResponse:
+    """Get decision counts and progress for a project."""
+    try:
+        stats = await asyncio.to_thread(get_screening_store().stats, project_id)
+        return ProjectStatsResponse(**stats)
+    except ProjectNotFoundError as e:
+        raise _not_found(e)
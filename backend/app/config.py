@@ -0,0 +1,141 @@
+"""
+Application configuration.
+
+Settings are read from environment variables (prefixed with VIGI_) so each
+deployment can tune the API without code changes.
+"""
+
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable."""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+# Inference executor
+# "thread" runs NER in a thread pool inside the API process,
+# "process" runs it in a process pool holding one model copy per worker.
+INFERENCE_EXECUTOR = os.getenv("VIGI_INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = _env_int("VIGI_INFERENCE_WORKERS", 1)
+# torch intra-op threads per inference worker (0 keeps the torch default)
+INFERENCE_THREADS = _env_int("VIGI_INFERENCE_THREADS", 0)
+
+# Micro-batching of concurrent single-text extraction requests
+BATCH_MAX_SIZE = _env_int("VIGI_BATCH_MAX_SIZE", 16)
+BATCH_MAX_WAIT_MS = _env_int("VIGI_BATCH_MAX_WAIT_MS", 5)
+
+# Loaded model cache (see ModelRegistry)
+MODEL_CACHE_CAPACITY = _env_int("VIGI_MODEL_CACHE_CAPACITY", 3)
+# Total weight budget in MB across loaded models (0 for no limit)
+MODEL_CACHE_MAX_MB = _env_int("VIGI_MODEL_CACHE_MAX_MB", 0)
+
+# Inference batching and long-document windows
+# Default number of token windows per forward pass
+INFERENCE_BATCH_SIZE = _env_int("VIGI_INFERENCE_BATCH_SIZE", 16)
+# Texts longer than this many tokens are split into overlapping windows
+NER_WINDOW_TOKENS = _env_int("VIGI_NER_WINDOW_TOKENS", 384)
+# Tokens shared by consecutive windows
+NER_WINDOW_STRIDE = _env_int("VIGI_NER_WINDOW_STRIDE", 64)
+
+# Local data directory for on-disk caches and stores
+DATA_DIR = os.getenv("VIGI_DATA_DIR", "data")
+
+# NER result cache (see ResultCache)
+RESULT_CACHE_MEMORY_ENTRIES = _env_int("VIGI_RESULT_CACHE_MEMORY_ENTRIES", 10000)
+# SQLite file for the on-disk tier (empty string disables it)
+RESULT_CACHE_PATH = os.getenv(
+    "VIGI_RESULT_CACHE_PATH", os.path.join(DATA_DIR, "ner_results.sqlite3")
+)
+# Model revision used for loading weights and keying cached results
+MODEL_REVISION = os.getenv("VIGI_MODEL_REVISION", "main")
+
+# Inference backends a model can run on (see services/onnx_backend.py)
+MODEL_BACKEND_CHOICES = ("torch", "onnx", "onnx-int8")
+
+
+def _parse_model_backends(value: str) -> dict[str, str]:
+    """Parse a "model=backend,model=backend" setting, rejecting unknown backends."""
+    backends = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        model_name, _, backend = item.partition("=")
+        backend = backend.strip()
+        if backend not in MODEL_BACKEND_CHOICES:
+            raise ValueError(
+                f"VIGI_MODEL_BACKENDS: unknown inference backend '{backend}' for "
+                f"'{model_name.strip()}' (expected one of {', '.join(MODEL_BACKEND_CHOICES)})"
+            )
+        backends[model_name.strip()] = backend
+    return backends
+
+
+# Inference backend per model, e.g. "biomedical-ner-all=onnx-int8,clinical-ner=onnx"
+# Backends: torch (default), onnx, onnx-int8. Validated here so a bad value
+# stops the API at startup instead of failing every extraction request.
+MODEL_BACKENDS = _parse_model_backends(os.getenv("VIGI_MODEL_BACKENDS", ""))
+
+# Models loaded and warmed up at startup (comma-separated, empty to disable)
+PRELOAD_MODELS = [
+    name.strip()
+    for name in os.getenv("VIGI_PRELOAD_MODELS", "biomedical-ner-all").split(",")
+    if name.strip()
+]
+
+# Shared HTTP client for literature APIs (see http_client.py)
+HTTP2 = os.getenv("VIGI_HTTP2", "1") not in ("0", "false", "False")
+HTTP_MAX_CONNECTIONS = _env_int("VIGI_HTTP_MAX_CONNECTIONS", 20)
+HTTP_MAX_KEEPALIVE = _env_int("VIGI_HTTP_MAX_KEEPALIVE", 10)
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("VIGI_HTTP_KEEPALIVE_EXPIRY", "30"))
+
+# Persistent cache of literature API responses (see http_cache.py)
+# SQLite file (empty string disables the cache)
+HTTP_CACHE_PATH = os.getenv(
+    "VIGI_HTTP_CACHE_PATH", os.path.join(DATA_DIR, "http_cache.sqlite3")
+)
+# Seconds a cached response is served before revalidation
+HTTP_CACHE_TTL = _env_int("VIGI_HTTP_CACHE_TTL", 3600)
+HTTP_CACHE_MAX_MB = _env_int("VIGI_HTTP_CACHE_MAX_MB", 256)
+
+# Upstream API rate limits shared by all worker processes (see rate_limit.py)
+# SQLite file (empty string keeps a per-process limit; single worker only)
+RATE_LIMIT_PATH = os.getenv(
+    "VIGI_RATE_LIMIT_PATH", os.path.join(DATA_DIR, "rate_limits.sqlite3")
+)
+
+# Local PubMed article store filled by `python -m app.services.pubmed_ingest`
+ARTICLE_STORE_PATH = os.getenv(
+    "VIGI_ARTICLE_STORE_PATH", os.path.join(DATA_DIR, "articles.sqlite3")
+)
+
+# Entity-to-article inverted index (see entity_index.py)
+ENTITY_INDEX_PATH = os.getenv(
+    "VIGI_ENTITY_INDEX_PATH", os.path.join(DATA_DIR, "entity_index.sqlite3")
+)
+
+# Screening projects and queues (see screening_store.py)
+SCREENING_DB_PATH = os.getenv(
+    "VIGI_SCREENING_DB_PATH", os.path.join(DATA_DIR, "screening.sqlite3")
+)
+
+# Background screening jobs (see screening_jobs.py)
+# Articles buffered between pipeline stages, and per insert/NER batch
+SCREENING_JOB_QUEUE_SIZE = _env_int("VIGI_SCREENING_JOB_QUEUE_SIZE", 256)
+SCREENING_JOB_BATCH_SIZE = _env_int("VIGI_SCREENING_JOB_BATCH_SIZE", 32)
+SCREENING_NER_MODEL = os.getenv("VIGI_SCREENING_NER_MODEL", "biomedical-ner-all")
+SCREENING_NER_THRESHOLD = float(os.getenv("VIGI_SCREENING_NER_THRESHOLD", "0.7"))
+
+# Per-reviewer review queue lookahead (see review_prefetch.py)
+# Articles buffered per reviewer, and whether buffered articles without
+# entities are sent through NER while they wait
+SCREENING_PREFETCH_DEPTH = _env_int("VIGI_SCREENING_PREFETCH_DEPTH", 5)
+SCREENING_PREFETCH_EXTRACT = os.getenv("VIGI_SCREENING_PREFETCH_EXTRACT", "1") not in ("0", "false", "False")
+# How long articles handed to a reviewer stay reserved for them (seconds)
+SCREENING_LEASE_SECONDS = float(os.getenv("VIGI_SCREENING_LEASE_SECONDS", "600"))
+
+# Active-learning queue ranking (see relevance_ranker.py)
+# New include/exclude decisions per retrain, and decisions needed to start
+SCREENING_RANKER_BATCH_SIZE = _env_int("VIGI_SCREENING_RANKER_BATCH_SIZE", 10)
+SCREENING_RANKER_MIN_LABELS = _env_int("VIGI_SCREENING_RANKER_MIN_LABELS", 10)
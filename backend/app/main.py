@@ -4,16 +4,61 @@ Vigi-Vault Backend API
 FastAPI application for pharmacovigilance entity extraction and screening.
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from .api.entity_routes import router as entity_router
+from .api.screening_routes import router as screening_router
+from .services.http_client import create_http_client, set_http_client
+from .services.inference_executor import get_inference_executor, shutdown_inference_executor
+from .services.micro_batcher import get_micro_batcher
+from .services.relevance_ranker import get_relevance_ranker
+from .services.screening_jobs import get_job_manager
+from .services.shared_memory import worker_memory_report
+
+
+async def warm_up_models(app: FastAPI) -> None:
+    """Preload configured models and mark the app ready once they are hot."""
+    try:
+        app.state.warm_up_timings = await get_inference_executor().warm_up()
+        app.state.ready = True
+    except Exception as e:
+        app.state.warm_up_error = str(e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown."""
+    app.state.ready = False
+    app.state.warm_up_timings = {}
+    app.state.warm_up_error = None
+
+    # Shared pooled client for the literature search services
+    http_client = create_http_client()
+    set_http_client(http_client)
+
+    # Warm up in the background so liveness checks pass while models load
+    warm_up_task = asyncio.create_task(warm_up_models(app))
+    yield
+    warm_up_task.cancel()
+    await get_job_manager().shutdown()
+    await get_relevance_ranker().shutdown()
+    set_http_client(None)
+    await http_client.aclose()
+    get_micro_batcher.cache_clear()
+    shutdown_inference_executor()
+
 
 app = FastAPI(
     title="Vigi-Vault API",
     description="Pharmacovigilance Clinical Database API - Entity Extraction & Screening",
     version="0.1.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS middleware for frontend integration
@@ -27,6 +72,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(entity_router, prefix="/api/v1")
+app.include_router(screening_router, prefix="/api/v1")
 
 
 @app.get("/", tags=["Health"])
@@ -45,6 +91,27 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/memory", tags=["Health"])
+async def memory_report():
+    """Memory report - RSS vs shared pages for this worker and its siblings."""
+    return worker_memory_report()
+
+
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Readiness check endpoint - OK once preloaded models are warm."""
+    if app.state.ready:
+        return {"status": "ready", "models": app.state.warm_up_timings}
+
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "failed" if app.state.warm_up_error else "warming_up",
+            "detail": app.state.warm_up_error
+        }
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
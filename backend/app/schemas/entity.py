@@ -25,6 +25,10 @@ class EntityRequest(BaseModel):
         le=1.0,
         description="Minimum confidence score for including entities"
     )
+    article_id: Optional[str] = Field(
+        None,
+        description="Article the text belongs to; if set, entities are added to the entity index"
+    )
 
     class Config:
         json_schema_extra = {
@@ -55,6 +59,17 @@ class EntityBatchRequest(BaseModel):
         le=1.0,
         description="Minimum confidence score for including entities"
     )
+    batch_size: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=100,
+        description="Token windows per model forward pass (texts are split into windows "
+                    "and sorted by length); defaults to the server's configured batch size"
+    )
+    article_ids: Optional[list[str]] = Field(
+        None,
+        description="Article ID per text; if set, entities are added to the entity index"
+    )
 
 
 class Entity(BaseModel):
@@ -138,6 +153,47 @@ class EntityBatchResponse(BaseModel):
     total_texts: int = Field(..., description="Number of texts processed")
 
 
+class EntityKey(BaseModel):
+    """An entity to look up in the entity index."""
+
+    type: str = Field(..., description="Entity type")
+    text: str = Field(..., min_length=1, description="Entity text (matched case-insensitively)")
+
+
+class EntityCooccurrenceRequest(BaseModel):
+    """Request for articles mentioning all of a set of entities."""
+
+    entities: list[EntityKey] = Field(
+        ...,
+        min_length=1,
+        max_length=10,
+        description="Entities that must all appear in an article"
+    )
+    article_ids: Optional[list[str]] = Field(
+        None,
+        description="Only consider these articles (e.g. the included ones)"
+    )
+    limit: int = Field(default=1000, ge=1, le=100000, description="Maximum article IDs returned")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "entities": [
+                    {"type": "Medication", "text": "metformin"},
+                    {"type": "Sign_symptom", "text": "lactic acidosis"}
+                ],
+                "limit": 1000
+            }
+        }
+
+
+class EntityCooccurrenceResponse(BaseModel):
+    """Articles mentioning all requested entities."""
+
+    count: int = Field(..., description="Number of matching articles")
+    article_ids: list[str] = Field(..., description="Matching article IDs (up to limit)")
+
+
 class ErrorResponse(BaseModel):
     """Error response schema."""
 
@@ -22,6 +22,7 @@ class ArticleSource(str, Enum):
     EUROPEPMC = "europepmc"
     PMC = "pmc"
     PREPRINT = "preprint"
+    LOCAL = "local"
     MANUAL = "manual"
 
 
@@ -32,6 +33,10 @@ class SearchRequest(BaseModel):
         default=ArticleSource.PUBMED,
         description="Data source to search"
     )
+    sources: Optional[list[ArticleSource]] = Field(
+        None,
+        description="Search several sources at once (overrides source)"
+    )
     max_results: int = Field(
         default=100,
         ge=1,
@@ -42,6 +47,10 @@ class SearchRequest(BaseModel):
         None,
         description="Name for this screening project"
     )
+    extract_entities: bool = Field(
+        default=True,
+        description="Run entity extraction on queued articles in the background"
+    )
 
     class Config:
         json_schema_extra = {
@@ -59,6 +68,7 @@ class ArticleSchema(BaseModel):
     id: str = Field(..., description="Unique article ID")
     pmid: Optional[str] = Field(None, description="PubMed ID if available")
     doi: Optional[str] = Field(None, description="DOI if available")
+    pmcid: Optional[str] = Field(None, description="PubMed Central ID if available")
     title: str = Field(..., description="Article title")
     abstract: str = Field(default="", description="Article abstract")
     authors: list[str] = Field(default=[], description="List of authors")
@@ -74,6 +84,10 @@ class ArticleSchema(BaseModel):
     )
     reviewer_notes: Optional[str] = Field(None, description="Reviewer notes")
     reviewed_at: Optional[datetime] = Field(None, description="Review timestamp")
+    version: int = Field(
+        default=0,
+        description="Decision version, incremented by every review"
+    )
 
     # Entity extraction
     entities_extracted: bool = Field(
@@ -100,6 +114,11 @@ class ScreeningProject(BaseModel):
     included_count: int = Field(default=0)
     excluded_count: int = Field(default=0)
     maybe_count: int = Field(default=0)
+    estimated_recall: Optional[float] = Field(
+        None,
+        description="Estimated share of relevant articles already included "
+                    "(set once the relevance ranker has been trained)"
+    )
 
 
 class ReviewRequest(BaseModel):
@@ -107,13 +126,21 @@ class ReviewRequest(BaseModel):
     article_id: str = Field(..., description="Article ID to review")
     decision: ReviewDecision = Field(..., description="Review decision")
     notes: Optional[str] = Field(None, description="Optional reviewer notes")
+    reviewer: str = Field("default", description="Reviewer submitting the decision")
+    version: Optional[int] = Field(
+        None,
+        description="Article version the decision was based on; "
+                    "rejected with 409 if the article changed since"
+    )
 
     class Config:
         json_schema_extra = {
             "example": {
                 "article_id": "12345678",
                 "decision": "include",
-                "notes": "Relevant RCT with clear adverse event reporting"
+                "notes": "Relevant RCT with clear adverse event reporting",
+                "reviewer": "reviewer-1",
+                "version": 0
             }
         }
 
@@ -127,12 +154,20 @@ class SearchResponse(BaseModel):
     source: str
     total_articles: int
     message: str
+    job_id: Optional[str] = Field(
+        None,
+        description="Background job filling the project (see /screening/jobs)"
+    )
 
 
 class QueueResponse(BaseModel):
     """Response with current article for review."""
     success: bool = True
-    has_more: bool = Field(..., description="Whether there are more articles to review")
+    has_more: bool = Field(
+        ...,
+        description="Whether an article is available to review; false once every "
+                    "pending article is decided or leased to another reviewer"
+    )
     position: int = Field(..., description="Current position in queue (1-indexed)")
     total: int = Field(..., description="Total articles in queue")
     pending: int = Field(..., description="Remaining pending articles")
@@ -162,3 +197,4 @@ class ProjectStatsResponse(BaseModel):
     excluded: int
     maybe: int
     progress_percent: float
+    estimated_recall: Optional[float] = None
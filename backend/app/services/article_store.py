@@ -0,0 +1,349 @@
+"""
+Local Article Store Service
+
+SQLite store of PubMed articles loaded from the annual baseline and daily
+update files (see pubmed_ingest.py), so historical lookups do not need
+live E-utilities.
+
+Titles, abstracts and keywords are indexed in an FTS5 table kept in sync
+by triggers, so the corpus can be searched offline (see local_search.py).
+
+Every row remembers the rank of the file it came from. Writes only apply
+when they come from a file of equal or higher rank, and deletions are kept
+as tombstones, so ingesting files again, out of order or from parallel
+workers always converges on the same state.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from .. import config
+from .pubmed_search import Article
+
+
+_FILE_RANK_PATTERN = re.compile(r"(\d+)n(\d+)\.xml")
+
+
+def file_rank(filename: str) -> int:
+    """
+    Order PubMed distribution files, e.g. pubmed25n0001.xml.gz.
+
+    Files from a later annual baseline outrank every file of the previous
+    one; within a year, update files continue the baseline numbering.
+    Unrecognized names rank lowest.
+    """
+    match = _FILE_RANK_PATTERN.search(os.path.basename(filename))
+    if match is None:
+        return 0
+    year, number = match.groups()
+    return int(year) * 100000 + int(number)
+
+
+class ArticleStore:
+    """
+    PubMed articles on disk, keyed by PMID.
+
+    Usage:
+        store = ArticleStore("data/articles.sqlite3")
+        store.upsert_articles(articles, rank=file_rank(path))
+        article = store.get("12345678")
+    """
+
+    def __init__(self, path: str, timeout: float = 60.0):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path: SQLite database file
+            timeout: Seconds to wait for another writer's lock
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "pmid TEXT PRIMARY KEY, "
+                "title TEXT NOT NULL DEFAULT '', "
+                "abstract TEXT NOT NULL DEFAULT '', "
+                "authors TEXT NOT NULL DEFAULT '[]', "
+                "journal TEXT NOT NULL DEFAULT '', "
+                "pub_date TEXT NOT NULL DEFAULT '', "
+                "doi TEXT, "
+                "pmcid TEXT, "
+                "keywords TEXT NOT NULL DEFAULT '[]', "
+                "file_rank INTEGER NOT NULL, "
+                "deleted INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._create_search_index()
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ingested_files ("
+                "name TEXT PRIMARY KEY, file_rank INTEGER NOT NULL, "
+                "articles INTEGER NOT NULL, deletions INTEGER NOT NULL, "
+                "ingested_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+
+    def _create_search_index(self) -> None:
+        """
+        Create the full-text index and its sync triggers (lock held).
+
+        Only live articles are indexed; tombstoning an article removes it
+        from the index, so searches never need to filter deletions.
+        """
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"
+        ).fetchone()
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+            "title, abstract, keywords, content='articles', content_rowid='rowid')"
+        )
+        remove_old = (
+            "INSERT INTO articles_fts (articles_fts, rowid, title, abstract, keywords) "
+            "SELECT 'delete', old.rowid, old.title, old.abstract, old.keywords "
+            "WHERE old.deleted = 0; "
+        )
+        add_new = (
+            "INSERT INTO articles_fts (rowid, title, abstract, keywords) "
+            "SELECT new.rowid, new.title, new.abstract, new.keywords "
+            "WHERE new.deleted = 0; "
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles "
+            "BEGIN " + add_new + "END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles "
+            "BEGIN " + remove_old + "END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles "
+            "BEGIN " + remove_old + add_new + "END"
+        )
+        if not exists:
+            # Index articles stored before the index existed
+            self._conn.execute(
+                "INSERT INTO articles_fts (rowid, title, abstract, keywords) "
+                "SELECT rowid, title, abstract, keywords FROM articles WHERE deleted = 0"
+            )
+
+    def upsert_articles(self, articles: Iterable[Article], rank: int) -> int:
+        """
+        Insert or update articles in one transaction.
+
+        Rows last written by a higher-ranked file are left untouched.
+
+        Args:
+            articles: Parsed articles
+            rank: Rank of the file they came from
+
+        Returns:
+            Number of articles submitted
+        """
+        rows = [
+            (
+                a.pmid, a.title, a.abstract, json.dumps(a.authors), a.journal,
+                a.pub_date, a.doi, a.pmcid, json.dumps(a.keywords or []), rank
+            )
+            for a in articles
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO articles (pmid, title, abstract, authors, journal, "
+                "pub_date, doi, pmcid, keywords, file_rank) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (pmid) DO UPDATE SET "
+                "title = excluded.title, abstract = excluded.abstract, "
+                "authors = excluded.authors, journal = excluded.journal, "
+                "pub_date = excluded.pub_date, doi = excluded.doi, "
+                "pmcid = excluded.pmcid, keywords = excluded.keywords, "
+                "file_rank = excluded.file_rank, deleted = 0 "
+                "WHERE excluded.file_rank >= articles.file_rank",
+                rows
+            )
+        return len(rows)
+
+    def delete_articles(self, pmids: Iterable[str], rank: int) -> int:
+        """
+        Tombstone deleted PMIDs.
+
+        A tombstone is written even for unseen PMIDs, so a lower-ranked
+        file ingested later cannot bring the article back.
+
+        Returns:
+            Number of PMIDs submitted
+        """
+        rows = [(pmid, rank) for pmid in pmids]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO articles (pmid, file_rank, deleted) VALUES (?, ?, 1) "
+                "ON CONFLICT (pmid) DO UPDATE SET "
+                "file_rank = excluded.file_rank, deleted = 1 "
+                "WHERE excluded.file_rank >= articles.file_rank",
+                rows
+            )
+        return len(rows)
+
+    def mark_ingested(self, name: str, rank: int, articles: int, deletions: int) -> None:
+        """Record a fully ingested file."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingested_files "
+                "(name, file_rank, articles, deletions) VALUES (?, ?, ?, ?)",
+                (name, rank, articles, deletions)
+            )
+
+    def ingested_files(self) -> set[str]:
+        """Names of files already ingested."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name FROM ingested_files").fetchall()
+        return {name for (name,) in rows}
+
+    @staticmethod
+    def _row_to_article(row: tuple) -> Article:
+        pmid, title, abstract, authors, journal, pub_date, doi, pmcid, keywords = row
+        return Article(
+            pmid=pmid,
+            title=title,
+            abstract=abstract,
+            authors=json.loads(authors),
+            journal=journal,
+            pub_date=pub_date,
+            doi=doi,
+            pmcid=pmcid,
+            keywords=json.loads(keywords),
+            source="pubmed"
+        )
+
+    def get(self, pmid: str) -> Optional[Article]:
+        """Get an article by PMID, or None if unknown or deleted."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pmid, title, abstract, authors, journal, pub_date, doi, "
+                "pmcid, keywords FROM articles WHERE pmid = ? AND deleted = 0",
+                (pmid,)
+            ).fetchone()
+        return self._row_to_article(row) if row else None
+
+    def get_many(self, pmids: list[str]) -> dict[str, Article]:
+        """Get the stored articles among `pmids`, keyed by PMID."""
+        found = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(pmids), 500):
+            chunk = pmids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT pmid, title, abstract, authors, journal, pub_date, doi, "
+                    f"pmcid, keywords FROM articles WHERE pmid IN ({placeholders}) "
+                    "AND deleted = 0",
+                    chunk
+                ).fetchall()
+            for row in rows:
+                found[row[0]] = self._row_to_article(row)
+        return found
+
+    def rank_matches(self, match: str, limit: Optional[int] = None) -> list[tuple]:
+        """
+        Full-text search, best BM25 matches first.
+
+        Title matches weigh more than keyword matches, which weigh more
+        than abstract matches. Matches are scored from the index alone and
+        only the top `limit` are kept while sorting; article rows are read
+        for those only.
+
+        Args:
+            match: FTS5 MATCH expression
+            limit: Maximum matches (None for all)
+
+        Returns:
+            List of (score, rowid, pmid); lower scores rank higher
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT hits.score, a.rowid, a.pmid FROM ("
+                "SELECT rowid, bm25(articles_fts, 10.0, 1.0, 5.0) AS score "
+                "FROM articles_fts WHERE articles_fts MATCH ? ORDER BY score LIMIT ?"
+                ") AS hits JOIN articles AS a ON a.rowid = hits.rowid ORDER BY hits.score",
+                (match, -1 if limit is None else limit)
+            ).fetchall()
+
+    def count_matches(self, match: str, limit: int) -> int:
+        """Count articles matching an FTS5 expression, up to `limit`."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM articles_fts "
+                "WHERE articles_fts MATCH ? LIMIT ?)",
+                (match, limit)
+            ).fetchone()[0]
+
+    def get_by_rowid(self, rowids: list[int]) -> dict[int, Article]:
+        """Get articles by rowid (from `rank_matches`), keyed by rowid."""
+        found = {}
+        for start in range(0, len(rowids), 500):
+            chunk = rowids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, pmid, title, abstract, authors, journal, pub_date, doi, "
+                    f"pmcid, keywords FROM articles WHERE rowid IN ({placeholders})",
+                    chunk
+                ).fetchall()
+            for row in rows:
+                found[row[0]] = self._row_to_article(row[1:])
+        return found
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM articles WHERE deleted = 0"
+            ).fetchone()[0]
+
+    def stats(self) -> dict:
+        """
+        Get store metrics.
+
+        Returns:
+            Dict with article, tombstone and ingested file counts
+        """
+        with self._lock:
+            articles, deleted = self._conn.execute(
+                "SELECT COUNT(*) - COALESCE(SUM(deleted), 0), COALESCE(SUM(deleted), 0) "
+                "FROM articles"
+            ).fetchone()
+            files = self._conn.execute("SELECT COUNT(*) FROM ingested_files").fetchone()[0]
+        return {
+            "path": self.path,
+            "articles": articles,
+            "deleted": deleted,
+            "ingested_files": files
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_article_store() -> Optional[ArticleStore]:
+    """
+    Get the shared ArticleStore, or None if none has been ingested.
+
+    The store is only opened if its file exists, so deployments without a
+    local baseline keep using E-utilities alone.
+    """
+    if not config.ARTICLE_STORE_PATH or not os.path.exists(config.ARTICLE_STORE_PATH):
+        return None
+    return ArticleStore(config.ARTICLE_STORE_PATH)
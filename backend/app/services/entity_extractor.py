@@ -6,9 +6,17 @@ Primary model: d4data/biomedical-ner-all
 Entities: Drug, Disease, Gene, Species
 """
 
+import time
 from typing import Optional
-from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
-from functools import lru_cache
+
+from .. import config
+from .model_registry import get_model_registry
+from .onnx_backend import load_onnx_model
+from .result_cache import get_result_cache, result_cache_key
+
+
+# Short text used to exercise each model once at startup
+WARM_UP_TEXT = "The patient was treated with Metformin for Type 2 Diabetes."
 
 
 class EntityExtractor:
@@ -39,7 +47,10 @@ class EntityExtractor:
         self,
         model_name: str = "biomedical-ner-all",
         device: int = -1,  # -1 for CPU, 0+ for GPU
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        revision: Optional[str] = None,
+        use_cache: bool = True,
+        backend: Optional[str] = None
     ):
         """
         Initialize the entity extractor.
@@ -48,24 +59,46 @@ class EntityExtractor:
             model_name: Key from SUPPORTED_MODELS or full HuggingFace model path
             device: -1 for CPU, 0+ for specific GPU
             confidence_threshold: Minimum confidence score to include entity
+            revision: Model revision (branch, tag or commit) to load
+            use_cache: Whether to read and write the shared result cache
+            backend: "torch", "onnx" or "onnx-int8" (None for the model's
+                configured backend, see VIGI_MODEL_BACKENDS)
         """
         self.model_path = self.SUPPORTED_MODELS.get(model_name, model_name)
         self.device = device
         self.confidence_threshold = confidence_threshold
-        self._pipeline = None
+        self.revision = revision or config.MODEL_REVISION
+        self.use_cache = use_cache
+        self.backend = backend or config.MODEL_BACKENDS.get(model_name, "torch")
 
     @property
     def pipeline(self):
-        """Lazy load the NER pipeline."""
-        if self._pipeline is None:
-            self._pipeline = self._load_pipeline()
-        return self._pipeline
+        """Get the NER pipeline from the shared model registry (lazy loaded)."""
+        return get_model_registry().get(
+            (self.model_path, self.revision, self.backend, self.device),
+            self._load_pipeline
+        )
 
     def _load_pipeline(self):
         """Load the HuggingFace NER pipeline."""
+        # Imported here so that importing this module (and the API) does
+        # not pay the multi-second torch/transformers import cost
+        from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
+
         try:
-            tokenizer = AutoTokenizer.from_pretrained(self.model_path)
-            model = AutoModelForTokenClassification.from_pretrained(self.model_path)
+            tokenizer = AutoTokenizer.from_pretrained(
+                self.model_path, revision=self.revision
+            )
+            if self.backend == "torch":
+                model = AutoModelForTokenClassification.from_pretrained(
+                    self.model_path, revision=self.revision
+                )
+            else:
+                model = load_onnx_model(
+                    self.model_path,
+                    revision=self.revision,
+                    quantize=self.backend == "onnx-int8"
+                )
 
             return pipeline(
                 "ner",
@@ -77,12 +110,17 @@ class EntityExtractor:
         except Exception as e:
             raise RuntimeError(f"Failed to load NER model '{self.model_path}': {e}")
 
-    def extract_entities(self, text: str) -> list[dict]:
+    def extract_entities(
+        self,
+        text: str,
+        confidence_threshold: Optional[float] = None
+    ) -> list[dict]:
         """
         Extract biomedical entities from text.
 
         Args:
             text: Input text (abstract, clinical note, etc.)
+            confidence_threshold: Override the extractor's default threshold
 
         Returns:
             List of entity dictionaries with keys:
@@ -97,31 +135,62 @@ class EntityExtractor:
             return []
 
         # Run NER pipeline
-        raw_entities = self.pipeline(text)
+        raw_entities = self.extract_raw_entities_batch([text])[0]
 
-        # Process and filter entities
-        entities = []
-        for entity in raw_entities:
-            score = entity.get("score", 0)
-
-            # Filter by confidence threshold
-            if score < self.confidence_threshold:
-                continue
+        return self.filter_entities(raw_entities, confidence_threshold)
 
+    def _normalize_entities(self, pipeline_output: list[dict]) -> list[dict]:
+        """
+        Convert raw pipeline output into entity dicts, without filtering.
+        """
+        entities = []
+        for entity in pipeline_output:
             entity_type = entity.get("entity_group", "Unknown")
 
             entities.append({
                 "text": entity.get("word", ""),
                 "type": entity_type,
-                "start": entity.get("start", 0),
-                "end": entity.get("end", 0),
-                "confidence": round(score, 4),
+                "start": int(entity.get("start", 0)),
+                "end": int(entity.get("end", 0)),
+                "confidence": float(entity.get("score", 0)),
                 "color": self.ENTITY_COLORS.get(entity_type, "#757575")
             })
 
+        return entities
+
+    def filter_entities(
+        self,
+        raw_entities: list[dict],
+        confidence_threshold: Optional[float] = None
+    ) -> list[dict]:
+        """
+        Apply the confidence threshold to unfiltered entities.
+
+        Thresholding is a cheap post-filter, so one model pass can serve
+        requests with different thresholds.
+
+        Args:
+            raw_entities: Entities from extract_raw_entities_batch
+            confidence_threshold: Override the extractor's default threshold
+
+        Returns:
+            Filtered entities with adjacent same-type spans merged
+        """
+        if confidence_threshold is None:
+            confidence_threshold = self.confidence_threshold
+
+        # Filter by confidence threshold
+        entities = [
+            entity for entity in raw_entities
+            if entity["confidence"] >= confidence_threshold
+        ]
+
         # Merge adjacent entities of same type
         entities = self._merge_adjacent_entities(entities)
 
+        for entity in entities:
+            entity["confidence"] = round(entity["confidence"], 4)
+
         return entities
 
     def _merge_adjacent_entities(self, entities: list[dict]) -> list[dict]:
@@ -149,17 +218,207 @@ class EntityExtractor:
         merged.append(current)
         return merged
 
-    def extract_entities_batch(self, texts: list[str]) -> list[list[dict]]:
+    def extract_entities_batch(
+        self,
+        texts: list[str],
+        batch_size: Optional[int] = None,
+        confidence_threshold: Optional[float] = None
+    ) -> list[list[dict]]:
         """
-        Extract entities from multiple texts.
+        Extract entities from multiple texts with batched inference.
 
         Args:
             texts: List of input texts
+            batch_size: Windows per forward pass (None for the configured default)
+            confidence_threshold: Override the extractor's default threshold
 
         Returns:
             List of entity lists, one per input text
         """
-        return [self.extract_entities(text) for text in texts]
+        return [
+            self.filter_entities(raw_entities, confidence_threshold)
+            for raw_entities in self.extract_raw_entities_batch(texts, batch_size)
+        ]
+
+    def extract_raw_entities_batch(
+        self,
+        texts: list[str],
+        batch_size: Optional[int] = None
+    ) -> list[list[dict]]:
+        """
+        Get unfiltered entities per text, from the result cache if possible.
+
+        Only texts missing from the cache are run through the model.
+
+        Args:
+            texts: List of input texts
+            batch_size: Windows per forward pass (None for the configured default)
+
+        Returns:
+            List of unfiltered entity lists, one per input text
+        """
+        if not self.use_cache:
+            return self._infer_raw_entities_batch(texts, batch_size)
+
+        cache = get_result_cache()
+        keys = [
+            result_cache_key(text, self.model_path, self.revision, self.backend)
+            for text in texts
+        ]
+
+        results = [cache.get(key) for key in keys]
+
+        # Run each distinct uncached text once
+        missing = {}
+        for i, entities in enumerate(results):
+            if entities is None:
+                missing.setdefault(keys[i], i)
+        if missing:
+            computed = self._infer_raw_entities_batch(
+                [texts[i] for i in missing.values()], batch_size
+            )
+            computed = dict(zip(missing, computed))
+            for key, entities in computed.items():
+                cache.set(key, entities)
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = [dict(entity) for entity in computed[key]]
+
+        return results
+
+    def _infer_raw_entities_batch(
+        self,
+        texts: list[str],
+        batch_size: Optional[int] = None
+    ) -> list[list[dict]]:
+        """
+        Run batched inference and return unfiltered entities per text.
+
+        Texts longer than the model's window are split into overlapping
+        token windows (see _split_windows). All windows are sorted by token
+        length so that each forward pass pads to a similar length, then run
+        in chunks of `batch_size`. Results are returned in input order with
+        offsets into the original texts.
+
+        Args:
+            texts: List of input texts
+            batch_size: Windows per forward pass (None for the configured default)
+
+        Returns:
+            List of unfiltered entity lists, one per input text
+        """
+        results = [[] for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return results
+
+        # Sort by token length to limit padding waste within each batch
+        windows = sorted(self._split_windows(texts, indices), key=lambda w: w[3])
+        windows_per_text = {}
+        for window in windows:
+            windows_per_text[window[0]] = windows_per_text.get(window[0], 0) + 1
+
+        batch_size = batch_size or config.INFERENCE_BATCH_SIZE
+        for offset in range(0, len(windows), batch_size):
+            chunk = windows[offset:offset + batch_size]
+            batch_output = self.pipeline(
+                [texts[i][start:end] for i, start, end, _ in chunk],
+                batch_size=len(chunk)
+            )
+            for (i, start, _, _), pipeline_output in zip(chunk, batch_output):
+                for entity in self._normalize_entities(pipeline_output):
+                    entity["start"] += start
+                    entity["end"] += start
+                    results[i].append(entity)
+
+        for i, count in windows_per_text.items():
+            if count > 1:
+                results[i] = self._reconcile_overlaps(results[i])
+
+        return results
+
+    def _split_windows(
+        self,
+        texts: list[str],
+        indices: list[int]
+    ) -> list[tuple[int, int, int, int]]:
+        """
+        Split texts into overlapping token windows.
+
+        Windows hold at most NER_WINDOW_TOKENS tokens (capped by the model's
+        maximum length) and consecutive windows share NER_WINDOW_STRIDE
+        tokens, so entities cut at one window's edge are seen whole in the
+        next.
+
+        Returns:
+            List of (text index, char start, char end, token count)
+        """
+        tokenizer = self.pipeline.tokenizer
+        if not tokenizer.is_fast:
+            # Offset mappings need a fast tokenizer; run texts whole
+            lengths = tokenizer([texts[i] for i in indices], return_length=True)["length"]
+            return [(i, 0, len(texts[i]), n) for i, n in zip(indices, lengths)]
+
+        special = tokenizer.num_special_tokens_to_add()
+        window = min(config.NER_WINDOW_TOKENS, tokenizer.model_max_length - special)
+        stride = min(config.NER_WINDOW_STRIDE, window // 2)
+
+        encoding = tokenizer(
+            [texts[i] for i in indices],
+            truncation=True,
+            max_length=window + special,
+            stride=stride,
+            return_overflowing_tokens=True,
+            return_offsets_mapping=True,
+            return_special_tokens_mask=True
+        )
+
+        spans = {i: [] for i in indices}
+        for sample, offsets, special_mask in zip(
+            encoding["overflow_to_sample_mapping"],
+            encoding["offset_mapping"],
+            encoding["special_tokens_mask"]
+        ):
+            i = indices[sample]
+            tokens = [o for o, m in zip(offsets, special_mask) if not m]
+            if not tokens:
+                continue
+
+            # Widen to word boundaries so no window starts or ends mid-word
+            text = texts[i]
+            start, end = tokens[0][0], tokens[-1][1]
+            while start > 0 and text[start - 1].isalnum():
+                start -= 1
+            while end < len(text) and text[end].isalnum():
+                end += 1
+            spans[i].append((i, start, end, len(offsets)))
+
+        windows = []
+        for i, text_spans in spans.items():
+            if len(text_spans) <= 1:
+                # Short text: keep it whole so offsets match a direct call
+                n_tokens = text_spans[0][3] if text_spans else special
+                windows.append((i, 0, len(texts[i]), n_tokens))
+            else:
+                windows.extend(text_spans)
+
+        return windows
+
+    def _reconcile_overlaps(self, entities: list[dict]) -> list[dict]:
+        """
+        Resolve duplicate entities from overlapping windows.
+
+        Overlapping spans are collapsed to the highest-confidence one.
+        """
+        reconciled = []
+        for entity in sorted(entities, key=lambda e: (e["start"], -e["end"])):
+            if reconciled and entity["start"] < reconciled[-1]["end"]:
+                if entity["confidence"] > reconciled[-1]["confidence"]:
+                    reconciled[-1] = entity
+            else:
+                reconciled.append(entity)
+
+        return reconciled
 
     def get_entity_summary(self, entities: list[dict]) -> dict:
         """
@@ -200,13 +459,16 @@ class EntityExtractor:
         return summary
 
 
-# Singleton instance for reuse
-@lru_cache(maxsize=1)
 def get_extractor(
     model_name: str = "biomedical-ner-all",
     confidence_threshold: float = 0.7
 ) -> EntityExtractor:
-    """Get cached EntityExtractor instance."""
+    """
+    Get an EntityExtractor instance.
+
+    Extractors are cheap: loaded pipelines are shared through the model
+    registry, so a new threshold never triggers a model reload.
+    """
     return EntityExtractor(
         model_name=model_name,
         confidence_threshold=confidence_threshold
@@ -232,3 +494,64 @@ def extract_entities(
     """
     extractor = get_extractor(model_name, confidence_threshold)
     return extractor.extract_entities(text)
+
+
+def extract_entities_batch(
+    texts: list[str],
+    model_name: str = "biomedical-ner-all",
+    confidence_threshold: float = 0.7,
+    batch_size: Optional[int] = None
+) -> list[list[dict]]:
+    """
+    Quick entity extraction from multiple texts.
+
+    Args:
+        texts: Input texts
+        model_name: Model to use
+        confidence_threshold: Minimum confidence
+        batch_size: Windows per forward pass (None for the configured default)
+
+    Returns:
+        List of entity lists, one per input text
+    """
+    extractor = get_extractor(model_name, confidence_threshold)
+    return extractor.extract_entities_batch(texts, batch_size)
+
+
+def extract_raw_entities_batch(
+    texts: list[str],
+    model_name: str = "biomedical-ner-all",
+    batch_size: Optional[int] = None
+) -> list[list[dict]]:
+    """
+    Quick unfiltered entity extraction from multiple texts.
+
+    Args:
+        texts: Input texts
+        model_name: Model to use
+        batch_size: Windows per forward pass (None for the configured default)
+
+    Returns:
+        List of unfiltered entity lists, one per input text
+    """
+    extractor = get_extractor(model_name)
+    return extractor.extract_raw_entities_batch(texts, batch_size)
+
+
+def warm_up_models(model_names: list[str]) -> dict[str, float]:
+    """
+    Load models and run one inference each to trigger lazy allocations.
+
+    Args:
+        model_names: Keys from SUPPORTED_MODELS or HuggingFace model paths
+
+    Returns:
+        Dict of model name to warm-up time in seconds
+    """
+    timings = {}
+    for model_name in model_names:
+        started = time.perf_counter()
+        extractor = get_extractor(model_name)
+        extractor._infer_raw_entities_batch([WARM_UP_TEXT])
+        timings[model_name] = round(time.perf_counter() - started, 3)
+    return timings
@@ -0,0 +1,353 @@
+"""
+Entity Index Service
+
+Persistent inverted index from extracted entities to the articles that
+mention them, for pharmacovigilance signal queries such as "which
+articles mention Metformin together with lactic acidosis".
+
+Entities are keyed on their normalized (type, text). For every article
+the index keeps postings with character offsets plus a per-article
+mention count, and each entity keeps a running document frequency.
+Re-indexing an article replaces its previous entries, so the index can be
+updated incrementally as extraction results arrive.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from .. import config
+
+
+def normalize_entity(entity_type: str, text: str) -> tuple[str, str]:
+    """
+    Normalize an entity to its index key.
+
+    Text is case-folded, whitespace is collapsed and surrounding
+    punctuation removed, so "Metformin," and "metformin" share a key.
+    """
+    text = re.sub(r"\s+", " ", text).strip().strip(".,;:()[]{}\"'").strip()
+    return entity_type.strip(), text.casefold()
+
+
+class EntityIndex:
+    """
+    Entity-to-article inverted index stored in SQLite.
+
+    Usage:
+        index = EntityIndex("data/entity_index.sqlite3")
+        index.index_article("12345678", entities)
+        index.articles_with([("Medication", "metformin"), ("Sign_symptom", "lactic acidosis")])
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the index.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=60.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        # Keys are never deleted, so their ids can be cached
+        self._key_id_cache: dict[tuple[str, str], int] = {}
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entity_keys ("
+                "id INTEGER PRIMARY KEY, entity_type TEXT NOT NULL, text TEXT NOT NULL, "
+                "doc_count INTEGER NOT NULL DEFAULT 0, UNIQUE (entity_type, text))"
+            )
+            # Article-level entries, clustered by entity for posting-list scans
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entity_articles ("
+                "entity_id INTEGER NOT NULL, article_id TEXT NOT NULL, "
+                "mentions INTEGER NOT NULL, PRIMARY KEY (entity_id, article_id)"
+                ") WITHOUT ROWID"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS entity_articles_article "
+                "ON entity_articles (article_id)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entity_postings ("
+                "entity_id INTEGER NOT NULL, article_id TEXT NOT NULL, "
+                "start INTEGER NOT NULL, end INTEGER NOT NULL, "
+                "PRIMARY KEY (entity_id, article_id, start)"
+                ") WITHOUT ROWID"
+            )
+
+    def _remove(self, article_id: str) -> None:
+        """Drop an article's entries and decrement frequencies (lock held)."""
+        self._conn.execute(
+            "UPDATE entity_keys SET doc_count = doc_count - 1 WHERE id IN ("
+            "SELECT entity_id FROM entity_articles WHERE article_id = ?)",
+            (article_id,)
+        )
+        entity_ids = self._conn.execute(
+            "SELECT entity_id FROM entity_articles WHERE article_id = ?", (article_id,)
+        ).fetchall()
+        self._conn.executemany(
+            "DELETE FROM entity_postings WHERE entity_id = ? AND article_id = ?",
+            [(entity_id, article_id) for (entity_id,) in entity_ids]
+        )
+        self._conn.execute("DELETE FROM entity_articles WHERE article_id = ?", (article_id,))
+
+    def _key_ids(self, keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], int]:
+        """Get ids for keys, creating missing ones (lock held)."""
+        missing = [key for key in keys if key not in self._key_id_cache]
+        if missing:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO entity_keys (entity_type, text) VALUES (?, ?)", missing
+            )
+            for key in missing:
+                self._key_id_cache[key] = self._conn.execute(
+                    "SELECT id FROM entity_keys WHERE entity_type = ? AND text = ?", key
+                ).fetchone()[0]
+        return {key: self._key_id_cache[key] for key in keys}
+
+    def index_articles(self, results: dict[str, list[dict]]) -> int:
+        """
+        Index extraction results for several articles in one transaction.
+
+        Args:
+            results: {article_id: entities} with entity dicts as returned
+                by EntityExtractor (text, type, start, end)
+
+        Returns:
+            Number of postings written
+        """
+        written = 0
+        with self._lock:
+            try:
+                with self._conn:
+                    for article_id, entities in results.items():
+                        written += self._index(article_id, entities)
+            except Exception:
+                # Keys created in the rolled-back transaction are gone
+                self._key_id_cache.clear()
+                raise
+        return written
+
+    def _index(self, article_id: str, entities: list[dict]) -> int:
+        """Replace one article's entries (lock held, inside a transaction)."""
+        self._remove(article_id)
+
+        postings = {}
+        for entity in entities:
+            key = normalize_entity(entity["type"], entity["text"])
+            if key[1]:
+                postings.setdefault(key, set()).add((entity["start"], entity["end"]))
+        if not postings:
+            return 0
+
+        ids = self._key_ids(postings)
+        self._conn.executemany(
+            "INSERT INTO entity_articles (entity_id, article_id, mentions) "
+            "VALUES (?, ?, ?)",
+            [(ids[key], article_id, len(spans)) for key, spans in postings.items()]
+        )
+        rows = [
+            (ids[key], article_id, start, end)
+            for key, spans in postings.items()
+            for start, end in spans
+        ]
+        # Overlapping spans may share a start; keep the first
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO entity_postings (entity_id, article_id, start, end) "
+            "VALUES (?, ?, ?, ?)",
+            rows
+        )
+        self._conn.executemany(
+            "UPDATE entity_keys SET doc_count = doc_count + 1 WHERE id = ?",
+            [(entity_id,) for entity_id in ids.values()]
+        )
+        return len(rows)
+
+    def index_article(self, article_id: str, entities: list[dict]) -> int:
+        """Index (or re-index) one article's entities."""
+        return self.index_articles({article_id: entities})
+
+    def remove_article(self, article_id: str) -> None:
+        """Remove an article from the index."""
+        with self._lock, self._conn:
+            self._remove(article_id)
+
+    def _lookup_ids(self, keys: list[tuple[str, str]]) -> Optional[list[int]]:
+        """Ids of existing keys, or None if any key is unknown (lock held)."""
+        ids = []
+        for entity_type, text in keys:
+            row = self._conn.execute(
+                "SELECT id FROM entity_keys WHERE entity_type = ? AND text = ?",
+                normalize_entity(entity_type, text)
+            ).fetchone()
+            if row is None:
+                return None
+            ids.append(row[0])
+        return ids
+
+    def _intersection_query(self, ids: list[int], select: str) -> tuple[str, list[int]]:
+        """
+        Join the posting lists of `ids`, driven by the rarest (lock held).
+
+        The rarest entity's articles are scanned and every other entity
+        is probed by primary key, so cost scales with the smallest list.
+        """
+        ids = sorted(set(ids), key=lambda entity_id: self._conn.execute(
+            "SELECT doc_count FROM entity_keys WHERE id = ?", (entity_id,)
+        ).fetchone()[0])
+        joins = "".join(
+            f"JOIN entity_articles AS e{i} "
+            f"ON e{i}.entity_id = ? AND e{i}.article_id = e0.article_id "
+            for i in range(1, len(ids))
+        )
+        query = f"SELECT {select} FROM entity_articles AS e0 {joins}WHERE e0.entity_id = ?"
+        return query, ids[1:] + ids[:1]
+
+    def articles_with(
+        self,
+        keys: list[tuple[str, str]],
+        article_ids: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None
+    ) -> list[str]:
+        """
+        Articles that mention every given entity.
+
+        Args:
+            keys: (type, text) pairs, normalized before lookup
+            article_ids: Restrict results to these articles (e.g. included ones)
+            limit: Maximum article IDs to return
+
+        Returns:
+            Matching article IDs, sorted
+        """
+        if not keys:
+            return []
+        with self._lock:
+            ids = self._lookup_ids(keys)
+            if ids is None:
+                return []
+            query, params = self._intersection_query(ids, "e0.article_id")
+            matches = {article_id for (article_id,) in self._conn.execute(query, params)}
+
+        if article_ids is not None:
+            matches &= set(article_ids)
+        result = sorted(matches)
+        return result[:limit] if limit is not None else result
+
+    def count_articles_with(
+        self,
+        keys: list[tuple[str, str]],
+        article_ids: Optional[Iterable[str]] = None
+    ) -> int:
+        """Number of articles that mention every given entity."""
+        if article_ids is not None:
+            return len(self.articles_with(keys, article_ids))
+        if not keys:
+            return 0
+        with self._lock:
+            ids = self._lookup_ids(keys)
+            if ids is None:
+                return 0
+            query, params = self._intersection_query(ids, "COUNT(*)")
+            return self._conn.execute(query, params).fetchone()[0]
+
+    def cooccurring(
+        self,
+        key: tuple[str, str],
+        entity_type: Optional[str] = None,
+        limit: int = 20
+    ) -> list[dict]:
+        """
+        Entities that appear in the same articles as `key`, most frequent first.
+
+        Args:
+            key: (type, text) of the anchor entity
+            entity_type: Only count co-occurring entities of this type
+            limit: Maximum entities to return
+
+        Returns:
+            List of {type, text, articles, doc_count} dicts
+        """
+        with self._lock:
+            ids = self._lookup_ids([key])
+            if ids is None:
+                return []
+            query = (
+                "SELECT k.entity_type, k.text, COUNT(*) AS articles, k.doc_count "
+                "FROM entity_articles AS anchor "
+                "JOIN entity_articles AS other "
+                "ON other.article_id = anchor.article_id AND other.entity_id != anchor.entity_id "
+                "JOIN entity_keys AS k ON k.id = other.entity_id "
+                "WHERE anchor.entity_id = ? "
+            )
+            params: list = [ids[0]]
+            if entity_type is not None:
+                query += "AND k.entity_type = ? "
+                params.append(entity_type)
+            query += "GROUP BY other.entity_id ORDER BY articles DESC, k.text LIMIT ?"
+            params.append(limit)
+            rows = self._conn.execute(query, params).fetchall()
+
+        return [
+            {"type": t, "text": text, "articles": articles, "doc_count": doc_count}
+            for t, text, articles, doc_count in rows
+        ]
+
+    def postings(self, key: tuple[str, str], article_id: str) -> list[tuple[int, int]]:
+        """Character spans of an entity's mentions in one article."""
+        with self._lock:
+            ids = self._lookup_ids([key])
+            if ids is None:
+                return []
+            rows = self._conn.execute(
+                "SELECT start, end FROM entity_postings "
+                "WHERE entity_id = ? AND article_id = ? ORDER BY start",
+                (ids[0], article_id)
+            ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def top_entities(self, entity_type: Optional[str] = None, limit: int = 20) -> list[dict]:
+        """Most widely mentioned entities by document frequency."""
+        query = "SELECT entity_type, text, doc_count FROM entity_keys WHERE doc_count > 0 "
+        params: list = []
+        if entity_type is not None:
+            query += "AND entity_type = ? "
+            params.append(entity_type)
+        query += "ORDER BY doc_count DESC, text LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [{"type": t, "text": text, "doc_count": count} for t, text, count in rows]
+
+    def stats(self) -> dict:
+        """
+        Get index metrics.
+
+        Returns:
+            Dict with entity, article and posting counts
+        """
+        with self._lock:
+            entities = self._conn.execute(
+                "SELECT COUNT(*) FROM entity_keys WHERE doc_count > 0"
+            ).fetchone()[0]
+            articles = self._conn.execute(
+                "SELECT COUNT(DISTINCT article_id) FROM entity_articles"
+            ).fetchone()[0]
+            postings = self._conn.execute("SELECT COUNT(*) FROM entity_postings").fetchone()[0]
+        return {"entities": entities, "articles": articles, "postings": postings}
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_entity_index() -> EntityIndex:
+    """Get the shared EntityIndex configured from app settings."""
+    return EntityIndex(config.ENTITY_INDEX_PATH)
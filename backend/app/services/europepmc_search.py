@@ -5,10 +5,14 @@ Uses Europe PMC REST API to search articles.
 API Documentation: https://europepmc.org/RestfulWebService
 """
 
+import asyncio
 import httpx
-from typing import Optional
+from typing import AsyncIterator, Optional
 from dataclasses import dataclass
 
+from .http_cache import get_article_cache
+from .http_client import http_session
+
 
 @dataclass
 class Article:
@@ -61,6 +65,39 @@ class EuropePMCSearchService:
 
     BASE_URL = "https://www.ebi.ac.uk/europepmc/webservices/rest"
 
+    # Request timeout in seconds
+    TIMEOUT = 30.0
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize Europe PMC search service.
+
+        Args:
+            client: HTTP client to use (defaults to the app's shared client)
+        """
+        self.client = client
+        self.article_cache = get_article_cache()
+
+    async def _get_search(self, params: dict) -> dict:
+        """GET the search endpoint and return the decoded JSON."""
+        async with http_session(self.client) as client:
+            response = await client.get(
+                f"{self.BASE_URL}/search",
+                params=params,
+                timeout=self.TIMEOUT
+            )
+            response.raise_for_status()
+            return response.json()
+
+    async def _remember(self, result_list: list[dict]) -> None:
+        """Keep search results so later lookups by ID are served locally."""
+        if self.article_cache is not None:
+            await asyncio.to_thread(self.article_cache.set_many, [
+                (result["source"], result["id"], result)
+                for result in result_list
+                if result.get("source") and result.get("id")
+            ])
+
     async def search(
         self,
         query: str,
@@ -93,16 +130,9 @@ class EuropePMCSearchService:
         if source:
             params["query"] = f"(SRC:{source}) AND ({query})"
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/search",
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
-
+        data = await self._get_search(params)
         result_list = data.get("resultList", {}).get("result", [])
+        await self._remember(result_list)
         articles = [self._parse_article(r) for r in result_list]
 
         return {
@@ -113,6 +143,80 @@ class EuropePMCSearchService:
             "articles": [a.to_dict() for a in articles]
         }
 
+    async def iter_search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        sort: str = "RELEVANCE",
+        source: Optional[str] = None,
+        page_size: int = 1000
+    ) -> AsyncIterator[Article]:
+        """
+        Stream articles for a query page by page.
+
+        Pages are walked with Europe PMC's cursorMark (deep paging that,
+        unlike `page`, stays stable and cheap past the first few thousand
+        hits). As soon as a page arrives its nextCursorMark is used to
+        request the following page, which downloads while the caller
+        consumes the current one.
+
+        Usage:
+            async for article in service.iter_search(query, limit=5000):
+                ...
+
+        Args:
+            query: Search query
+            limit: Maximum articles to yield (None for all hits)
+            sort: Sort order (see `search`)
+            source: Filter by source - "MED", "PMC", "PPR"
+            page_size: Results per request (max 1000)
+
+        Yields:
+            Article objects in result order
+        """
+        if source:
+            query = f"(SRC:{source}) AND ({query})"
+
+        remaining = limit
+
+        def fetch_page(cursor_mark: str) -> asyncio.Task:
+            size = page_size if remaining is None else min(page_size, remaining)
+            return asyncio.create_task(self._get_search({
+                "query": query,
+                "format": "json",
+                "pageSize": min(size, 1000),
+                "sort": sort,
+                "cursorMark": cursor_mark
+            }))
+
+        next_page = fetch_page("*") if remaining is None or remaining > 0 else None
+        try:
+            while next_page is not None:
+                data = await next_page
+                next_page = None
+
+                result_list = data.get("resultList", {}).get("result", [])
+                if remaining is not None:
+                    result_list = result_list[:remaining]
+                    remaining -= len(result_list)
+                await self._remember(result_list)
+
+                # The last page echoes the cursor it was requested with
+                cursor_mark = data.get("nextCursorMark")
+                if (
+                    result_list
+                    and cursor_mark
+                    and cursor_mark != data.get("request", {}).get("cursorMark")
+                    and (remaining is None or remaining > 0)
+                ):
+                    next_page = fetch_page(cursor_mark)
+
+                for result in result_list:
+                    yield self._parse_article(result)
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
     def _parse_article(self, data: dict) -> Article:
         """Parse Europe PMC result into Article object."""
         # Authors
@@ -166,20 +270,19 @@ class EuropePMCSearchService:
             article_id: Article ID (PMID for PubMed, etc.)
             source: Source database (MED, PMC, PPR)
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/search",
-                params={
-                    "query": f"(SRC:{source}) AND (EXT_ID:{article_id})",
-                    "format": "json",
-                    "pageSize": 1
-                },
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        if self.article_cache is not None:
+            record = await asyncio.to_thread(self.article_cache.get, source, article_id)
+            if record is not None:
+                return self._parse_article(record)
+
+        data = await self._get_search({
+            "query": f"(SRC:{source}) AND (EXT_ID:{article_id})",
+            "format": "json",
+            "pageSize": 1
+        })
 
         results = data.get("resultList", {}).get("result", [])
+        await self._remember(results)
         if results:
             return self._parse_article(results[0])
         return None
@@ -0,0 +1,261 @@
+"""
+Federated Search Service
+
+Fans one SearchRequest out to several literature sources concurrently,
+normalizes every result to ArticleSchema and drops duplicates that share
+a DOI, PMID or PMC ID. Merged results are streamed as each source
+delivers them, so total latency is bounded by the slowest source rather
+than the sum of all of them.
+"""
+
+import asyncio
+from typing import AsyncIterator, Optional, Union
+
+from ..schemas.screening import ArticleSchema, ArticleSource, SearchRequest
+from .europepmc_search import Article as EuropePMCArticle
+from .europepmc_search import EuropePMCSearchService
+from .local_search import LocalSearchService
+from .pubmed_search import Article as PubMedArticle
+from .pubmed_search import PubMedSearchService
+
+
+# Europe PMC `SRC:` filter per source (None searches everything)
+EUROPEPMC_SOURCES = {
+    ArticleSource.EUROPEPMC: None,
+    ArticleSource.PMC: "PMC",
+    ArticleSource.PREPRINT: "PPR",
+}
+
+SEARCHABLE_SOURCES = [ArticleSource.PUBMED, ArticleSource.LOCAL, *EUROPEPMC_SOURCES]
+
+# End-of-source marker on the merge queue
+_DONE = object()
+
+
+def normalize_article(
+    article: Union[PubMedArticle, EuropePMCArticle, ArticleSchema],
+    source: ArticleSource
+) -> ArticleSchema:
+    """
+    Convert a source-specific article into the shared ArticleSchema.
+
+    Args:
+        article: PubMed, Europe PMC or local (already ArticleSchema) article
+        source: Source the article was found in
+
+    Returns:
+        ArticleSchema with identifiers normalized for deduplication
+    """
+    if isinstance(article, ArticleSchema):
+        article_id = article.id
+    elif isinstance(article, PubMedArticle):
+        article_id = article.pmid
+    else:
+        article_id = article.pmid or article.pmcid or article.id
+
+    return ArticleSchema(
+        id=article_id,
+        pmid=article.pmid or None,
+        doi=article.doi.strip().lower() if article.doi else None,
+        pmcid=article.pmcid.strip().upper() if article.pmcid else None,
+        title=article.title or "",
+        abstract=article.abstract or "",
+        authors=article.authors or [],
+        journal=article.journal or "",
+        pub_date=article.pub_date or "",
+        keywords=article.keywords or [],
+        source=source.value
+    )
+
+
+class ArticleIndex:
+    """
+    Hash index of seen articles keyed on DOI, PMID and PMC ID.
+
+    An article is a duplicate if any of its identifiers was seen before.
+    All identifiers of a new article are indexed, so a record that only
+    shares a PMC ID with an earlier one still matches it.
+    """
+
+    def __init__(self):
+        self._keys: dict[tuple[str, str], str] = {}
+
+    @staticmethod
+    def _article_keys(article: ArticleSchema) -> list[tuple[str, str]]:
+        keys = []
+        if article.doi:
+            keys.append(("doi", article.doi))
+        if article.pmid:
+            keys.append(("pmid", article.pmid))
+        if article.pmcid:
+            keys.append(("pmcid", article.pmcid))
+        return keys
+
+    def add(self, article: ArticleSchema) -> bool:
+        """
+        Index an article.
+
+        Returns:
+            True if the article is new, False if it duplicates a seen one
+        """
+        keys = self._article_keys(article)
+        if any(key in self._keys for key in keys):
+            # Remember identifiers only this copy carries
+            for key in keys:
+                self._keys.setdefault(key, article.id)
+            return False
+
+        for key in keys:
+            self._keys[key] = article.id
+        return True
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class FederatedSearchService:
+    """
+    Concurrent search across PubMed, Europe PMC and the local store.
+
+    Usage:
+        service = FederatedSearchService()
+        request = SearchRequest(query="metformin", sources=["pubmed", "europepmc"])
+        async for article in service.iter_search(request):
+            ...
+    """
+
+    def __init__(
+        self,
+        pubmed: Optional[PubMedSearchService] = None,
+        europepmc: Optional[EuropePMCSearchService] = None,
+        local: Optional[LocalSearchService] = None,
+        queue_size: int = 256
+    ):
+        """
+        Initialize federated search.
+
+        Args:
+            pubmed: PubMed service (defaults to a new one on the shared client)
+            europepmc: Europe PMC service (defaults to a new one)
+            local: Local store search (defaults to the ingested store)
+            queue_size: Results buffered ahead of the consumer
+        """
+        self.pubmed = pubmed or PubMedSearchService()
+        self.europepmc = europepmc or EuropePMCSearchService()
+        self.local = local or LocalSearchService()
+        self.queue_size = queue_size
+
+    @staticmethod
+    def selected_sources(request: SearchRequest) -> list[ArticleSource]:
+        """Sources a request asks for, in order and without repeats."""
+        sources = request.sources or [request.source]
+        unsupported = [s.value for s in sources if s not in SEARCHABLE_SOURCES]
+        if unsupported:
+            raise ValueError(f"Unsupported search source(s): {', '.join(unsupported)}")
+        return list(dict.fromkeys(sources))
+
+    def _iter_source(
+        self,
+        source: ArticleSource,
+        query: str,
+        limit: int
+    ) -> AsyncIterator[Union[PubMedArticle, EuropePMCArticle, ArticleSchema]]:
+        if source == ArticleSource.PUBMED:
+            return self.pubmed.iter_search(query, limit=limit)
+        if source == ArticleSource.LOCAL:
+            return self.local.iter_search(query, limit=limit)
+        return self.europepmc.iter_search(
+            query, limit=limit, source=EUROPEPMC_SOURCES[source]
+        )
+
+    async def _pump(
+        self,
+        source: ArticleSource,
+        request: SearchRequest,
+        queue: asyncio.Queue,
+        errors: dict
+    ) -> None:
+        """Push one source's normalized results onto the merge queue."""
+        try:
+            async for article in self._iter_source(source, request.query, request.max_results):
+                await queue.put(normalize_article(article, source))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # One failing source should not sink the others
+            errors[source.value] = str(e)
+        await queue.put(_DONE)
+
+    async def iter_search(
+        self,
+        request: SearchRequest,
+        errors: Optional[dict] = None
+    ) -> AsyncIterator[ArticleSchema]:
+        """
+        Stream deduplicated articles from all selected sources.
+
+        Articles are yielded in arrival order; when several sources return
+        the same article, the first copy to arrive wins.
+
+        Args:
+            request: Search request (`sources`, or `source` if unset)
+            errors: Optional dict filled with {source: error message} for
+                sources that failed
+
+        Yields:
+            Normalized, deduplicated articles
+        """
+        sources = self.selected_sources(request)
+        errors = errors if errors is not None else {}
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        index = ArticleIndex()
+
+        tasks = [
+            asyncio.create_task(self._pump(source, request, queue, errors))
+            for source in sources
+        ]
+        try:
+            pending = len(tasks)
+            while pending:
+                item = await queue.get()
+                if item is _DONE:
+                    pending -= 1
+                elif index.add(item):
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def search(self, request: SearchRequest) -> dict:
+        """
+        Run a federated search and collect the merged results.
+
+        Args:
+            request: Search request
+
+        Returns:
+            Dict with search metadata, per-source errors and articles
+        """
+        errors: dict = {}
+        articles = [a async for a in self.iter_search(request, errors=errors)]
+
+        return {
+            "query": request.query,
+            "sources": [s.value for s in self.selected_sources(request)],
+            "returned_count": len(articles),
+            "errors": errors,
+            "articles": [a.model_dump() for a in articles]
+        }
+
+
+# Convenience function
+async def federated_search(
+    query: str,
+    sources: list[ArticleSource],
+    max_results: int = 100
+) -> dict:
+    """Quick federated search."""
+    service = FederatedSearchService()
+    request = SearchRequest(query=query, sources=sources, max_results=max_results)
+    return await service.search(request)
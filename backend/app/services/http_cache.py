@@ -0,0 +1,477 @@
+"""
+HTTP Response Cache Service
+
+Persistent cache for literature API responses, installed as an httpx
+transport under the shared client so both search services use it without
+changes to their request code.
+
+Entries are keyed on the normalized request (method, URL, sorted query and
+form parameters, minus credentials such as api_key and email), stored in
+SQLite with a TTL, and evicted least-recently-used once the cache exceeds
+its size budget. Expired entries that carry an ETag or Last-Modified
+validator are revalidated with a conditional request; a 304 refreshes
+them without downloading the body again.
+
+E-utilities history requests (usehistory, WebEnv, query_key) are never
+cached: their results live on NCBI's server only for a while and are
+tied to a session. Responses that report an error in a 200 body, as
+E-utilities does, are not stored. Database calls run in worker threads,
+off the event loop.
+
+Also holds the article cache that lets Europe PMC lookups by ID be served
+locally once an article has been seen in any search result.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from urllib.parse import parse_qsl
+
+import httpx
+
+from .. import config
+
+
+# Parameters that identify the caller rather than the request
+IGNORED_PARAMS = {"api_key", "email", "tool"}
+
+CACHEABLE_METHODS = {"GET", "POST"}
+
+# E-utilities history server parameters: results are per-session and expire
+HISTORY_PARAMS = {"usehistory", "WebEnv", "query_key"}
+
+# Error markers in E-utilities 200 responses: an ERROR element in XML, an
+# "ERROR"/"error" field at the top level or in a result object in JSON
+_XML_ERROR = re.compile(rb"<ERROR>")
+_JSON_ERROR_KEYS = ("ERROR", "error")
+
+# Response headers needed to replay a body (hop-by-hop ones are dropped)
+STORED_HEADERS = {
+    "content-type", "content-encoding", "etag", "last-modified",
+    "cache-control", "retry-after"
+}
+
+
+def _open_database(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _form_params(request: httpx.Request) -> Optional[list[tuple[str, str]]]:
+    """Parameters of a form-encoded request body, or None for other bodies."""
+    body = request.content
+    if body and request.headers.get("content-type", "").startswith(
+        "application/x-www-form-urlencoded"
+    ):
+        return parse_qsl(body.decode("utf-8"), keep_blank_values=True)
+    return None
+
+
+def is_history_request(request: httpx.Request) -> bool:
+    """Whether a request creates or reads E-utilities history server results."""
+    params = request.url.params.multi_items() + (_form_params(request) or [])
+    return any(
+        k in HISTORY_PARAMS and not (k == "usehistory" and v.lower() in ("", "n", "no"))
+        for k, v in params
+    )
+
+
+def is_error_body(body: bytes, headers: dict) -> bool:
+    """
+    Whether a 200 response body reports an error.
+
+    E-utilities answers some failures (unknown database, backend errors,
+    bad history keys) with status 200 and an error in the body.
+
+    Args:
+        body: Body as received (possibly content-encoded)
+        headers: Stored response headers (lower-case names)
+    """
+    if headers.get("content-encoding"):
+        body = httpx.Response(200, headers=headers, content=body).read()
+    content_type = headers.get("content-type", "")
+    if "json" in content_type:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return True
+        if not isinstance(data, dict):
+            return False
+        objects = [data] + [value for value in data.values() if isinstance(value, dict)]
+        return any(key in obj for obj in objects for key in _JSON_ERROR_KEYS)
+    if "xml" in content_type:
+        return _XML_ERROR.search(body) is not None
+    return False
+
+
+def request_cache_key(request: httpx.Request) -> str:
+    """
+    Build the cache key for a request.
+
+    Query and form parameters are sorted and credentials dropped, so the
+    same search made with or without an API key shares one entry.
+    """
+    params = sorted(
+        (k, v) for k, v in request.url.params.multi_items()
+        if k not in IGNORED_PARAMS
+    )
+
+    body = request.content
+    form = _form_params(request)
+    if form is not None:
+        body = json.dumps(sorted(
+            (k, v) for k, v in form if k not in IGNORED_PARAMS
+        )).encode("utf-8")
+
+    digest = hashlib.sha256()
+    for part in (
+        request.method.encode("ascii"),
+        str(request.url.copy_with(query=None)).encode("utf-8"),
+        json.dumps(params).encode("utf-8"),
+        body or b""
+    ):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class HTTPCache:
+    """
+    On-disk response store with TTL and size-based LRU eviction.
+
+    Usage:
+        cache = HTTPCache("data/http_cache.sqlite3", ttl=3600, max_bytes=256 << 20)
+        entry = cache.get(key)
+    """
+
+    def __init__(self, path: str, ttl: float = 3600, max_bytes: int = 256 << 20):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds a response is served without revalidation
+            max_bytes: Total body size kept before evicting (0 for no limit)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._conn = _open_database(path)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._revalidated = 0
+        self._misses = 0
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS http_responses ("
+                "key TEXT PRIMARY KEY, status INTEGER NOT NULL, "
+                "headers TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS http_responses_accessed "
+                "ON http_responses (accessed_at)"
+            )
+            self._size = self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM http_responses"
+            ).fetchone()[0]
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Look up a stored response.
+
+        Returns:
+            Dict with status, headers, body and `fresh`, or None
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT status, headers, body, expires_at FROM http_responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE http_responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        status, headers, body, expires_at = row
+        return {
+            "status": status,
+            "headers": json.loads(headers),
+            "body": body,
+            "fresh": expires_at > now
+        }
+
+    def set(self, key: str, status: int, headers: dict, body: bytes) -> None:
+        """Store a response and evict old entries past the size budget."""
+        now = time.time()
+        with self._lock, self._conn:
+            previous = self._conn.execute(
+                "SELECT size FROM http_responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_responses "
+                "(key, status, headers, body, size, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, status, json.dumps(headers), body, len(body), now + self.ttl, now)
+            )
+            self._size += len(body) - (previous[0] if previous else 0)
+            if self.max_bytes:
+                self._evict()
+
+    def touch(self, key: str) -> None:
+        """Mark a revalidated entry fresh for another TTL."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE http_responses SET expires_at = ?, accessed_at = ? WHERE key = ?",
+                (now + self.ttl, now, key)
+            )
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until under budget (lock held)."""
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM http_responses ORDER BY accessed_at LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                return
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    return
+                self._conn.execute("DELETE FROM http_responses WHERE key = ?", (key,))
+                self._size -= size
+
+    def record(self, outcome: str) -> None:
+        """Count a lookup outcome: "hit", "revalidated" or "miss"."""
+        if outcome == "hit":
+            self._hits += 1
+        elif outcome == "revalidated":
+            self._revalidated += 1
+        else:
+            self._misses += 1
+
+    def clear(self) -> None:
+        """Delete every stored response."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM http_responses")
+            self._size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM http_responses").fetchone()[0]
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict with hits, revalidations, misses, entries and stored bytes
+        """
+        lookups = self._hits + self._revalidated + self._misses
+        return {
+            "hits": self._hits,
+            "revalidated": self._revalidated,
+            "misses": self._misses,
+            "hit_rate": round((self._hits + self._revalidated) / lookups, 4) if lookups else 0.0,
+            "entries": len(self),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes
+        }
+
+
+class _RecordingStream(httpx.AsyncByteStream):
+    """Pass a response body through while keeping a copy to cache."""
+
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_complete: Callable[[bytes], Awaitable[None]]
+    ):
+        self._stream = stream
+        self._on_complete = on_complete
+        self._chunks: list[bytes] = []
+        self._complete = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._chunks.append(chunk)
+            yield chunk
+        self._complete = True
+
+    async def aclose(self) -> None:
+        await self._stream.aclose()
+        # Partially read bodies are not cached
+        if self._complete:
+            await self._on_complete(b"".join(self._chunks))
+        self._chunks = []
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that answers from an HTTPCache when it can.
+
+    Responses served without contacting upstream carry
+    `extensions["from_cache"] = True`, so callers can tell that no
+    rate-limit budget was used. Revalidated responses (a 304 answered from
+    the cache) made a request and carry `extensions["revalidated"] = True`
+    instead.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: HTTPCache):
+        self.transport = transport
+        self.cache = cache
+
+    @staticmethod
+    def _replay(request: httpx.Request, entry: dict, revalidated: bool = False) -> httpx.Response:
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"],
+            request=request,
+            extensions={"revalidated": True} if revalidated else {"from_cache": True}
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method not in CACHEABLE_METHODS or is_history_request(request):
+            return await self.transport.handle_async_request(request)
+
+        key = request_cache_key(request)
+        entry = await asyncio.to_thread(self.cache.get, key)
+        if entry is not None and entry["fresh"]:
+            self.cache.record("hit")
+            return self._replay(request, entry)
+
+        if entry is not None:
+            # Expired: revalidate if the stored response has validators
+            etag = entry["headers"].get("etag")
+            last_modified = entry["headers"].get("last-modified")
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = await self.transport.handle_async_request(request)
+
+        if response.status_code == 304 and entry is not None:
+            await response.aclose()
+            await asyncio.to_thread(self.cache.touch, key)
+            self.cache.record("revalidated")
+            return self._replay(request, entry, revalidated=True)
+
+        self.cache.record("miss")
+        if response.status_code != 200 or "no-store" in response.headers.get("cache-control", ""):
+            return response
+
+        headers = {
+            name.lower(): value for name, value in response.headers.items()
+            if name.lower() in STORED_HEADERS
+        }
+
+        async def store(body: bytes) -> None:
+            await asyncio.to_thread(self._store, key, response.status_code, headers, body)
+
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_RecordingStream(response.stream, store),
+            extensions=response.extensions,
+            request=request
+        )
+
+    def _store(self, key: str, status: int, headers: dict, body: bytes) -> None:
+        """Cache a complete response body unless it reports an error (worker thread)."""
+        if not is_error_body(body, headers):
+            self.cache.set(key, status, headers, body)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class ArticleCache:
+    """
+    Articles seen in search results, stored as raw API records by ID.
+
+    Lets single-article lookups be answered locally once an article has
+    appeared in any search.
+    """
+
+    def __init__(self, path: str, ttl: float = 3600):
+        """
+        Initialize the article cache.
+
+        Args:
+            path: SQLite database file (may be shared with HTTPCache)
+            ttl: Seconds a stored record is served
+        """
+        self.ttl = ttl
+        self._conn = _open_database(path)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cached_articles ("
+                "source TEXT NOT NULL, id TEXT NOT NULL, record TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (source, id))"
+            )
+
+    def get(self, source: str, article_id: str) -> Optional[dict]:
+        """Get a stored record, or None if unseen or expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM cached_articles "
+                "WHERE source = ? AND id = ? AND expires_at > ?",
+                (source, article_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_many(self, records: list[tuple[str, str, dict]]) -> None:
+        """Store (source, id, record) tuples."""
+        if not records:
+            return
+        expires_at = time.time() + self.ttl
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cached_articles (source, id, record, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(source, article_id, json.dumps(record), expires_at)
+                 for source, article_id, record in records]
+            )
+
+    def clear(self) -> None:
+        """Delete every stored article."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cached_articles")
+
+
+# Singleton instances for reuse
+@lru_cache(maxsize=1)
+def get_http_cache() -> Optional[HTTPCache]:
+    """Get the shared HTTPCache, or None if disabled in settings."""
+    if not config.HTTP_CACHE_PATH:
+        return None
+    return HTTPCache(
+        config.HTTP_CACHE_PATH,
+        ttl=config.HTTP_CACHE_TTL,
+        max_bytes=config.HTTP_CACHE_MAX_MB * 1024 * 1024
+    )
+
+
+@lru_cache(maxsize=1)
+def get_article_cache() -> Optional[ArticleCache]:
+    """Get the shared ArticleCache, or None if disabled in settings."""
+    if not config.HTTP_CACHE_PATH:
+        return None
+    return ArticleCache(config.HTTP_CACHE_PATH, ttl=config.HTTP_CACHE_TTL)
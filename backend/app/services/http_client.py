@@ -0,0 +1,86 @@
+"""
+Shared HTTP Client Service
+
+One pooled httpx.AsyncClient (HTTP/2, keep-alive) shared by the literature
+search services, so repeated searches reuse connections instead of paying
+DNS, TCP and TLS setup on every call.
+
+Responses are cached on disk underneath the client when the HTTP cache
+is enabled (see http_cache.py).
+
+The client is created and closed by the FastAPI lifespan (see app.main).
+"""
+
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import httpx
+
+from .. import config
+from .http_cache import CachingTransport, get_http_cache
+
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def create_http_client(cached: bool = True) -> httpx.AsyncClient:
+    """
+    Create a pooled AsyncClient tuned from app settings.
+
+    HTTP/2 is used when the `h2` package is installed (httpx[http2]).
+    With the HTTP cache enabled, the transport is wrapped in a
+    CachingTransport.
+
+    Args:
+        cached: Use the HTTP cache if it is enabled in settings
+    """
+    try:
+        import h2  # noqa: F401
+        http2 = config.HTTP2
+    except ImportError:
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=config.HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY
+    )
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+
+    cache = get_http_cache() if cached else None
+    if cache is not None:
+        transport = CachingTransport(transport, cache)
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(30.0, connect=10.0),
+        headers={"User-Agent": "Vigi-Vault/0.1.0"}
+    )
+
+
+def get_http_client() -> Optional[httpx.AsyncClient]:
+    """Get the shared client, or None outside the app lifespan."""
+    return _shared_client
+
+
+def set_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Install (or remove, with None) the shared client."""
+    global _shared_client
+    _shared_client = client
+
+
+@asynccontextmanager
+async def http_session(
+    client: Optional[httpx.AsyncClient] = None
+) -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield a client for a request: the given one, else the shared one,
+    else a temporary client that is closed afterwards.
+    """
+    client = client or _shared_client
+    if client is not None:
+        yield client
+        return
+
+    async with httpx.AsyncClient() as temporary:
+        yield temporary
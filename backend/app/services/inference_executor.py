@@ -0,0 +1,207 @@
+"""
+Inference Executor Service
+
+Runs CPU-bound NER inference off the asyncio event loop so that a long
+forward pass never blocks other requests (including /health).
+
+Two modes are supported:
+- thread: a thread pool inside the API process (torch releases the GIL)
+- process: a process pool, each worker holding its own model copy
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+from .. import config
+
+
+def _init_worker(num_threads: int) -> None:
+    """Pin torch intra-op threads for an inference worker."""
+    if num_threads <= 0:
+        return
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(num_threads)
+
+
+def _warm_up(model_names: list[str]) -> dict[str, float]:
+    """Warm up models in the current worker."""
+    from .entity_extractor import warm_up_models
+    return warm_up_models(model_names)
+
+
+class InferenceExecutor:
+    """
+    Dedicated worker pool for model inference.
+
+    Calls are admitted through a semaphore sized to the pool, so requests
+    wait in the event loop rather than inside the pool. This keeps the
+    queue depth and wait time observable for both thread and process pools.
+
+    Usage:
+        executor = InferenceExecutor(mode="thread", max_workers=2)
+        entities = await executor.run(extract_entities, text)
+    """
+
+    MODES = ("thread", "process")
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 1,
+        num_threads: int = 0,
+        preload_models: Optional[list[str]] = None
+    ):
+        """
+        Initialize the inference executor.
+
+        Args:
+            mode: "thread" or "process"
+            max_workers: Number of concurrent inference workers
+            num_threads: torch intra-op threads per worker (0 for torch default)
+            preload_models: Models to load and warm up in each worker
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown inference executor mode '{mode}'")
+
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.num_threads = num_threads
+        self.preload_models = list(preload_models or [])
+        self._executor = self._create_executor()
+        self._slots = asyncio.Semaphore(self.max_workers)
+
+        # Metrics
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._total_run = 0.0
+
+    def _create_executor(self) -> Executor:
+        """Create the underlying worker pool."""
+        if self.mode == "process":
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.num_threads,)
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference",
+            initializer=_init_worker,
+            initargs=(self.num_threads,)
+        )
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a function on the inference pool and await its result.
+
+        In process mode `fn` and its arguments must be picklable
+        (module-level functions, plain data).
+        """
+        submitted_at = time.perf_counter()
+        self._queued += 1
+        admitted = False
+        try:
+            async with self._slots:
+                admitted = True
+                self._queued -= 1
+                wait = time.perf_counter() - submitted_at
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+
+                self._running += 1
+                started_at = time.perf_counter()
+                try:
+                    loop = asyncio.get_running_loop()
+                    result = await loop.run_in_executor(
+                        self._executor,
+                        functools.partial(fn, *args, **kwargs)
+                    )
+                except Exception:
+                    self._failed += 1
+                    raise
+                finally:
+                    self._running -= 1
+                    self._total_run += time.perf_counter() - started_at
+
+                self._completed += 1
+                return result
+        finally:
+            if not admitted:
+                self._queued -= 1
+
+    async def warm_up(self) -> dict[str, float]:
+        """
+        Load and warm up the preload models in every worker.
+
+        Threads share one model registry, so a single call is enough. In
+        process mode one call per worker is submitted at once; as model
+        loading is slow, each call lands on a separate worker process.
+
+        Returns:
+            Dict of model name to warm-up time in seconds
+        """
+        if not self.preload_models:
+            return {}
+
+        calls = self.max_workers if self.mode == "process" else 1
+        timings = await asyncio.gather(*(
+            self.run(_warm_up, self.preload_models) for _ in range(calls)
+        ))
+        return timings[0]
+
+    def stats(self) -> dict:
+        """
+        Get executor metrics.
+
+        Returns:
+            Dict with queue depth, running tasks and wait/run times
+        """
+        finished = self._completed + self._failed
+        admitted = finished + self._running
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "queue_depth": self._queued,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "avg_wait_ms": round(1000 * self._total_wait / admitted, 2) if admitted else 0.0,
+            "max_wait_ms": round(1000 * self._max_wait, 2),
+            "avg_run_ms": round(1000 * self._total_run / finished, 2) if finished else 0.0
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_inference_executor() -> InferenceExecutor:
+    """Get the shared InferenceExecutor configured from app settings."""
+    return InferenceExecutor(
+        mode=config.INFERENCE_EXECUTOR,
+        max_workers=config.INFERENCE_WORKERS,
+        num_threads=config.INFERENCE_THREADS,
+        preload_models=config.PRELOAD_MODELS
+    )
+
+
+def shutdown_inference_executor() -> None:
+    """Shut down the shared executor if it was created."""
+    if get_inference_executor.cache_info().currsize:
+        get_inference_executor().shutdown()
+        get_inference_executor.cache_clear()
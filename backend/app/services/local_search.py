@@ -0,0 +1,251 @@
+"""
+Local Search Service
+
+Offline search over our own corpus: every article queued in a screening
+project (see screening_store.py), plus the PubMed baseline mirror when
+one has been ingested (see article_store.py). Both are FTS5 indexes over
+title, abstract and keywords, ranked by BM25 and kept up to date as
+articles are added. Results have the same shape as the PubMed and
+Europe PMC services.
+
+Queries use PubMed syntax: AND, OR and NOT (upper case, applied left to
+right), parentheses, quoted phrases and trailing-* prefixes. Field tags
+such as [tiab] are ignored.
+"""
+
+import asyncio
+import re
+from typing import AsyncIterator, Optional
+
+from ..schemas.screening import ArticleSchema
+from .article_store import ArticleStore, get_article_store
+from .pubmed_search import Article
+from .screening_store import ARTICLE_DATA_FIELDS, ScreeningStore, get_screening_store
+
+
+_QUERY_TOKEN = re.compile(r'"[^"]*"?|\(|\)|\[[^\]]*\]?|[^\s()"\[\]]+')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def _match_term(token: str) -> Optional[str]:
+    """Quote a word or phrase so FTS5 reads it literally; keep a trailing *."""
+    words = re.findall(r"\w+", token)
+    if not words:
+        return None
+    term = '"' + " ".join(words) + '"'
+    return term + " *" if token.rstrip('"').endswith("*") else term
+
+
+def _parse_query(tokens: list[str], i: int) -> tuple[Optional[str], int]:
+    """Parse tokens up to the closing parenthesis, left to right like PubMed."""
+    result = None
+    operator = None
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        if token == ")":
+            break
+        if token in _OPERATORS:
+            operator = token
+            continue
+        if token == "(":
+            operand, i = _parse_query(tokens, i)
+        else:
+            operand = _match_term(token)
+        if operand is None:
+            continue
+        if result is None:
+            # A leading NOT has nothing to subtract from
+            if operator != "NOT":
+                result = operand
+        else:
+            result = f"({result} {operator or 'AND'} {operand})"
+        operator = None
+    return result, i
+
+
+def to_match_expression(query: str) -> str:
+    """
+    Turn a PubMed-style query into an FTS5 MATCH expression.
+
+    Words and phrases are quoted, so punctuation in user input cannot
+    produce syntax errors. Adjacent terms must all match; AND, OR and NOT
+    combine terms left to right, as PubMed does. Dangling operators and
+    unbalanced parentheses are dropped.
+
+    Returns:
+        The expression, or "" if the query has no searchable terms
+    """
+    tokens = []
+    depth = 0
+    for token in _QUERY_TOKEN.findall(query):
+        if token.startswith("["):
+            continue
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            if not depth:
+                continue
+            depth -= 1
+        tokens.append(token)
+    return _parse_query(tokens, 0)[0] or ""
+
+
+class LocalSearchService:
+    """
+    Service for searching screened articles and the local PubMed mirror.
+
+    Usage:
+        service = LocalSearchService()
+        results = await service.search("metformin AND lactic acidosis", max_results=100)
+    """
+
+    # Matches counted for `total_count`; counting stops here
+    MAX_COUNT = 10000
+
+    def __init__(
+        self,
+        store: Optional[ArticleStore] = None,
+        screening_store: Optional[ScreeningStore] = None
+    ):
+        """
+        Initialize local search.
+
+        Args:
+            store: PubMed article store (defaults to the ingested one, if any)
+            screening_store: Screening store whose queued articles are searched
+        """
+        self.store = store or get_article_store()
+        self.screening_store = screening_store or get_screening_store()
+
+    def _require_store(self) -> ArticleStore:
+        if self.store is None:
+            raise ValueError(
+                "No local article store; run `python -m app.services.pubmed_ingest` first"
+            )
+        return self.store
+
+    async def _rank(self, match: str, limit: Optional[int]) -> list[tuple[str, int]]:
+        """
+        Best matches across both indexes, without duplicates.
+
+        Returns:
+            (index, row ID) pairs in rank order, index "screened" or "pubmed"
+        """
+        searches = [asyncio.to_thread(self.screening_store.rank_screened, match, limit)]
+        if self.store is not None:
+            searches.append(asyncio.to_thread(self.store.rank_matches, match, limit))
+        results = await asyncio.gather(*searches)
+
+        # Scores from both indexes are BM25 on the same columns and weights
+        hits = [(score, "screened", row_id, {article_id, pmid} - {None})
+                for score, row_id, article_id, pmid in results[0]]
+        if len(results) > 1:
+            hits += [(score, "pubmed", rowid, {pmid}) for score, rowid, pmid in results[1]]
+        hits.sort(key=lambda hit: hit[0])
+
+        ranked = []
+        seen: set[str] = set()
+        for _, index, row_id, keys in hits:
+            if keys & seen:
+                continue
+            seen |= keys
+            ranked.append((index, row_id))
+        return ranked[:limit]
+
+    async def _fetch(self, ranked: list[tuple[str, int]]) -> list[ArticleSchema]:
+        """Read ranked hits, in rank order."""
+        screened_ids = [row_id for index, row_id in ranked if index == "screened"]
+        pubmed_ids = [row_id for index, row_id in ranked if index == "pubmed"]
+        articles = {
+            ("screened", row_id): article
+            for row_id, article in (
+                await asyncio.to_thread(self.screening_store.get_screened, screened_ids)
+            ).items()
+        }
+        if pubmed_ids:
+            found = await asyncio.to_thread(self._require_store().get_by_rowid, pubmed_ids)
+            articles.update(
+                (("pubmed", rowid), ArticleSchema(id=article.pmid, **article.to_dict()))
+                for rowid, article in found.items()
+            )
+        return [articles[hit] for hit in ranked if hit in articles]
+
+    async def _count(self, match: str) -> int:
+        counts = [asyncio.to_thread(self.screening_store.count_screened, match, self.MAX_COUNT)]
+        if self.store is not None:
+            counts.append(asyncio.to_thread(self.store.count_matches, match, self.MAX_COUNT))
+        return min(self.MAX_COUNT, sum(await asyncio.gather(*counts)))
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 100,
+        page: int = 1
+    ) -> dict:
+        """
+        Search the local corpus.
+
+        Args:
+            query: PubMed-style query
+            max_results: Maximum results per page
+            page: Page number (1-indexed)
+
+        Returns:
+            Dict with search results and metadata; `total_count` adds up
+            the matches in both indexes (an article in both counts twice),
+            counted up to MAX_COUNT
+        """
+        match = to_match_expression(query)
+        articles: list[ArticleSchema] = []
+        total = 0
+        if match:
+            ranked, total = await asyncio.gather(
+                self._rank(match, page * max_results), self._count(match)
+            )
+            articles = await self._fetch(ranked[(page - 1) * max_results:])
+        return {
+            "query": query,
+            "total_count": total,
+            "returned_count": len(articles),
+            "page": page,
+            "articles": [a.model_dump(include=ARTICLE_DATA_FIELDS) for a in articles]
+        }
+
+    async def iter_search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        page_size: int = 500
+    ) -> AsyncIterator[ArticleSchema]:
+        """
+        Stream matching articles, best matches first.
+
+        Matches are ranked once; articles are then read a page at a time.
+
+        Args:
+            query: PubMed-style query
+            limit: Maximum articles to yield (None for all matches)
+            page_size: Articles read per query
+
+        Yields:
+            ArticleSchema objects in rank order
+        """
+        match = to_match_expression(query)
+        if not match:
+            return
+        ranked = await self._rank(match, limit)
+        for start in range(0, len(ranked), page_size):
+            for article in await self._fetch(ranked[start:start + page_size]):
+                yield article
+
+    async def get_article_by_id(self, pmid: str) -> Optional[Article]:
+        """Get a single stored article by PMID."""
+        return await asyncio.to_thread(self._require_store().get, pmid)
+
+
+# Convenience function
+async def search_local(query: str, max_results: int = 100) -> dict:
+    """Quick local search."""
+    service = LocalSearchService()
+    return await service.search(query, max_results)
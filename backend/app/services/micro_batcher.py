@@ -0,0 +1,159 @@
+"""
+Micro-Batching Service for NER
+
+Collects texts from concurrent single-text extraction requests and runs
+them through the model as one padded batch. Each caller awaits its own
+future and receives only its own entities.
+"""
+
+import asyncio
+from functools import lru_cache
+
+from .. import config
+from .entity_extractor import extract_raw_entities_batch, get_extractor
+from .inference_executor import InferenceExecutor, get_inference_executor
+
+
+class MicroBatcher:
+    """
+    Dynamic batching layer in front of EntityExtractor.
+
+    A batch is dispatched when it reaches `max_batch_size` texts or when
+    its oldest text has waited `max_wait_ms`, whichever comes first.
+    Texts are grouped per model; each caller's confidence threshold is
+    applied to its own result after the shared forward pass.
+
+    Usage:
+        batcher = MicroBatcher(executor, max_batch_size=16, max_wait_ms=5)
+        entities = await batcher.extract(text, "biomedical-ner-all", 0.7)
+    """
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize the micro-batcher.
+
+        Args:
+            executor: Inference executor that runs the batches
+            max_batch_size: Maximum number of texts per batch
+            max_wait_ms: Maximum time a text waits for its batch to fill
+        """
+        self.executor = executor
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._pending: dict[str, list[tuple[str, asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+        # Metrics
+        self._batches = 0
+        self._texts = 0
+
+    async def extract(
+        self,
+        text: str,
+        model_name: str = "biomedical-ner-all",
+        confidence_threshold: float = 0.7
+    ) -> list[dict]:
+        """
+        Queue a text for batched extraction and await its entities.
+
+        Args:
+            text: Input text
+            model_name: Model to use
+            confidence_threshold: Minimum confidence
+
+        Returns:
+            List of extracted entities
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(model_name, [])
+        pending.append((text, future))
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(model_name)
+        elif len(pending) == 1:
+            self._timers[model_name] = loop.call_later(
+                self.max_wait, self._flush, model_name
+            )
+
+        raw_entities = await future
+        return get_extractor(model_name).filter_entities(
+            raw_entities, confidence_threshold
+        )
+
+    def _flush(self, model_name: str) -> None:
+        """Dispatch the pending batch for a model."""
+        timer = self._timers.pop(model_name, None)
+        if timer is not None:
+            timer.cancel()
+
+        batch = self._pending.pop(model_name, [])
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run_batch(model_name, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self,
+        model_name: str,
+        batch: list[tuple[str, asyncio.Future]]
+    ) -> None:
+        """Run one batch on the executor and resolve the callers' futures."""
+        texts = [text for text, _ in batch]
+
+        self._batches += 1
+        self._texts += len(texts)
+
+        try:
+            results = await self.executor.run(
+                extract_raw_entities_batch,
+                texts,
+                model_name
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), entities in zip(batch, results):
+            # Callers may have gone away (client disconnect)
+            if not future.done():
+                future.set_result(entities)
+
+    def stats(self) -> dict:
+        """
+        Get batching metrics.
+
+        Returns:
+            Dict with batch counts and average batch size
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self._batches,
+            "texts": self._texts,
+            "avg_batch_size": round(self._texts / self._batches, 2) if self._batches else 0.0,
+            "pending": sum(len(batch) for batch in self._pending.values())
+        }
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_micro_batcher() -> MicroBatcher:
+    """Get the shared MicroBatcher configured from app settings."""
+    return MicroBatcher(
+        executor=get_inference_executor(),
+        max_batch_size=config.BATCH_MAX_SIZE,
+        max_wait_ms=config.BATCH_MAX_WAIT_MS
+    )
@@ -0,0 +1,152 @@
+"""
+Model Registry Service
+
+Keeps loaded NER pipelines in memory keyed by model path, so switching
+confidence thresholds or alternating between models does not reload
+weights from disk.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable
+
+from .. import config
+
+
+def _estimate_size(pipeline: Any) -> int:
+    """Estimate the in-memory size of a pipeline's model weights in bytes."""
+    model = getattr(pipeline, "model", None)
+    try:
+        parameters = getattr(model, "parameters", None)
+        if parameters is not None:
+            return sum(p.numel() * p.element_size() for p in parameters())
+        # ONNX Runtime models: use the size of the loaded .onnx file
+        model_path = getattr(model, "model_path", None)
+        if model_path is not None:
+            return os.path.getsize(model_path)
+    except Exception:
+        pass
+    return 0
+
+
+class ModelRegistry:
+    """
+    LRU cache of loaded pipelines with optional size-aware eviction.
+
+    Usage:
+        registry = ModelRegistry(capacity=3)
+        pipe = registry.get(("d4data/biomedical-ner-all", "main", "torch", -1), loader)
+    """
+
+    def __init__(self, capacity: int = 3, max_bytes: int = 0):
+        """
+        Initialize the model registry.
+
+        Args:
+            capacity: Maximum number of loaded pipelines
+            max_bytes: Maximum total weight size in bytes (0 for no limit)
+        """
+        self.capacity = max(1, capacity)
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: dict[tuple, threading.Lock] = {}
+
+        # Metrics
+        self._hits = 0
+        self._loads = 0
+        self._evictions = 0
+
+    def get(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """
+        Get a loaded pipeline, loading it on first use.
+
+        Concurrent requests for the same key wait for a single load.
+
+        Args:
+            key: Cache key, e.g. (model_path, revision, backend, device)
+            loader: Callable that loads the pipeline
+
+        Returns:
+            The loaded pipeline
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key][0]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return self._entries[key][0]
+
+            try:
+                pipeline = loader()
+                size = _estimate_size(pipeline)
+
+                with self._lock:
+                    self._entries[key] = (pipeline, size)
+                    self._loads += 1
+                    self._evict()
+            finally:
+                # Also on a failed load, so a bad key does not leave a lock behind
+                with self._lock:
+                    self._load_locks.pop(key, None)
+
+        return pipeline
+
+    def _evict(self) -> None:
+        """Evict least recently used pipelines until within limits."""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.capacity
+            or (self.max_bytes and self._total_bytes() > self.max_bytes)
+        ):
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _total_bytes(self) -> int:
+        return sum(size for _, size in self._entries.values())
+
+    def loaded(self) -> list[tuple]:
+        """Get the keys of currently loaded pipelines, least recent first."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        """Drop all loaded pipelines."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Get registry metrics.
+
+        Returns:
+            Dict with loaded models, memory use, hits, loads and evictions
+        """
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "max_bytes": self.max_bytes,
+                "loaded": [key[0] for key in self._entries],
+                "loaded_bytes": self._total_bytes(),
+                "hits": self._hits,
+                "loads": self._loads,
+                "evictions": self._evictions
+            }
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_model_registry() -> ModelRegistry:
+    """Get the shared ModelRegistry configured from app settings."""
+    return ModelRegistry(
+        capacity=config.MODEL_CACHE_CAPACITY,
+        max_bytes=config.MODEL_CACHE_MAX_MB * 1024 * 1024
+    )
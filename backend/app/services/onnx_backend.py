@@ -0,0 +1,125 @@
+"""
+ONNX Runtime Backend for NER
+
+Exports token-classification models to ONNX, optionally applies dynamic
+int8 quantization, and loads them for use behind the regular HuggingFace
+pipeline interface. Requires the optional `optimum[onnxruntime]` package.
+
+Exported models are stored under DATA_DIR/onnx so the export runs once.
+"""
+
+import os
+import re
+
+from .. import config
+
+
+def _export_dir(model_path: str, revision: str) -> str:
+    """Directory holding the ONNX export of a model revision."""
+    slug = re.sub(r"[^A-Za-z0-9_.-]+", "--", f"{model_path}@{revision}")
+    return os.path.join(config.DATA_DIR, "onnx", slug)
+
+
+def load_onnx_model(model_path: str, revision: str = "main", quantize: bool = False):
+    """
+    Load an ONNX Runtime token-classification model, exporting it if needed.
+
+    Args:
+        model_path: HuggingFace model path
+        revision: Model revision to export
+        quantize: Apply dynamic int8 quantization
+
+    Returns:
+        ORTModelForTokenClassification usable with transformers.pipeline
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError:
+        raise RuntimeError(
+            "The ONNX backend requires optimum[onnxruntime] "
+            "(pip install 'optimum[onnxruntime]')"
+        )
+
+    export_dir = _export_dir(model_path, revision)
+    if not os.path.exists(os.path.join(export_dir, "model.onnx")):
+        model = ORTModelForTokenClassification.from_pretrained(
+            model_path, revision=revision, export=True
+        )
+        model.save_pretrained(export_dir)
+
+    if not quantize:
+        return ORTModelForTokenClassification.from_pretrained(export_dir)
+
+    quantized_file = "model_quantized.onnx"
+    if not os.path.exists(os.path.join(export_dir, quantized_file)):
+        quantizer = ORTQuantizer.from_pretrained(export_dir, file_name="model.onnx")
+        qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=export_dir, quantization_config=qconfig)
+
+    return ORTModelForTokenClassification.from_pretrained(
+        export_dir, file_name=quantized_file
+    )
+
+
+def check_parity(
+    texts: list[str],
+    model_name: str = "biomedical-ner-all",
+    backend: str = "onnx-int8",
+    confidence_threshold: float = 0.7
+) -> dict:
+    """
+    Compare entities from an ONNX backend against the torch backend.
+
+    Spans match when start, end and type agree.
+
+    Args:
+        texts: Evaluation texts
+        model_name: Model to compare
+        backend: ONNX backend to check ("onnx" or "onnx-int8")
+        confidence_threshold: Threshold applied to both backends
+
+    Returns:
+        Dict with span precision/recall/F1 against torch and the largest
+        confidence difference on matching spans
+    """
+    from .entity_extractor import EntityExtractor
+
+    reference = EntityExtractor(
+        model_name, confidence_threshold=confidence_threshold,
+        backend="torch", use_cache=False
+    ).extract_entities_batch(texts)
+    candidate = EntityExtractor(
+        model_name, confidence_threshold=confidence_threshold,
+        backend=backend, use_cache=False
+    ).extract_entities_batch(texts)
+
+    matched = 0
+    expected = 0
+    predicted = 0
+    max_score_delta = 0.0
+    for ref_entities, cand_entities in zip(reference, candidate):
+        ref_spans = {(e["start"], e["end"], e["type"]): e["confidence"] for e in ref_entities}
+        cand_spans = {(e["start"], e["end"], e["type"]): e["confidence"] for e in cand_entities}
+        expected += len(ref_spans)
+        predicted += len(cand_spans)
+        for span, score in cand_spans.items():
+            if span in ref_spans:
+                matched += 1
+                max_score_delta = max(max_score_delta, abs(score - ref_spans[span]))
+
+    precision = matched / predicted if predicted else 1.0
+    recall = matched / expected if expected else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+
+    return {
+        "model": model_name,
+        "backend": backend,
+        "texts": len(texts),
+        "reference_entities": expected,
+        "backend_entities": predicted,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+        "max_confidence_delta": round(max_score_delta, 4)
+    }
@@ -0,0 +1,161 @@
+"""
+PubMed Baseline Ingest
+
+Streams gzipped PubMed baseline and update files (pubmedYYnNNNN.xml.gz from
+https://ftp.ncbi.nlm.nih.gov/pubmed/) into the local ArticleStore.
+
+Files are parsed with the same PubMedXMLStream used for efetch responses
+and written in batched transactions. Several files are ingested in
+parallel by a process pool; fully ingested files are recorded, so an
+interrupted run resumes where it stopped. Re-ingesting a file is harmless
+(see article_store.py).
+
+Usage (from backend/):
+    python -m app.services.pubmed_ingest data/pubmed/ --workers 4
+"""
+
+import argparse
+import gzip
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+from .. import config
+from .article_store import ArticleStore, file_rank
+from .pubmed_search import PubMedSearchService, PubMedXMLStream
+
+
+def ingest_file(path: str, store_path: str, batch_size: int = 1000) -> dict:
+    """
+    Ingest one PubMed XML file (gzipped or plain) into the store.
+
+    Deletions are applied after the file's articles, matching the order
+    of DeleteCitation blocks at the end of update files.
+
+    Args:
+        path: File to ingest
+        store_path: ArticleStore database file
+        batch_size: Articles per insert transaction
+
+    Returns:
+        Dict with file name, article and deletion counts and seconds taken
+    """
+    started = time.perf_counter()
+    name = os.path.basename(path)
+    rank = file_rank(name)
+    store = ArticleStore(store_path)
+    stream = PubMedXMLStream(PubMedSearchService()._parse_article)
+
+    opener = gzip.open if path.endswith(".gz") else open
+    articles = 0
+    batch = []
+    try:
+        with opener(path, "rb") as f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                batch.extend(stream.feed(chunk))
+                if len(batch) >= batch_size:
+                    articles += store.upsert_articles(batch, rank)
+                    batch = []
+            batch.extend(stream.close())
+        articles += store.upsert_articles(batch, rank)
+        deletions = store.delete_articles(stream.deleted_pmids, rank)
+        store.mark_ingested(name, rank, articles, deletions)
+    finally:
+        store.close()
+
+    return {
+        "file": name,
+        "articles": articles,
+        "deletions": deletions,
+        "seconds": round(time.perf_counter() - started, 2)
+    }
+
+
+def find_files(paths: list[str]) -> list[str]:
+    """Expand directories to their PubMed XML files, ordered by file rank."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.endswith((".xml", ".xml.gz"))
+            )
+        else:
+            files.append(path)
+    return sorted(files, key=lambda f: (file_rank(f), f))
+
+
+def ingest(
+    paths: list[str],
+    store_path: Optional[str] = None,
+    workers: int = 1,
+    batch_size: int = 1000,
+    force: bool = False
+) -> list[dict]:
+    """
+    Ingest PubMed files, skipping those already ingested.
+
+    Args:
+        paths: Files and/or directories of files
+        store_path: ArticleStore database file (defaults to settings)
+        workers: Files ingested in parallel
+        batch_size: Articles per insert transaction
+        force: Re-ingest files that were already ingested
+
+    Returns:
+        Per-file results, in completion order
+    """
+    store_path = store_path or config.ARTICLE_STORE_PATH
+    store = ArticleStore(store_path)
+    done = set() if force else store.ingested_files()
+    store.close()
+
+    files = [f for f in find_files(paths) if os.path.basename(f) not in done]
+    if not files:
+        return []
+
+    if workers <= 1:
+        return [ingest_file(f, store_path, batch_size) for f in files]
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(ingest_file, f, store_path, batch_size) for f in files]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("paths", nargs="+", help="PubMed XML files or directories")
+    parser.add_argument("--store", default=config.ARTICLE_STORE_PATH, help="ArticleStore file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--force", action="store_true", help="Re-ingest ingested files")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = ingest(args.paths, args.store, args.workers, args.batch_size, args.force)
+    for result in results:
+        print(
+            f"{result['file']}: {result['articles']} articles, "
+            f"{result['deletions']} deletions in {result['seconds']}s"
+        )
+
+    store = ArticleStore(args.store)
+    stats = store.stats()
+    store.close()
+    print(
+        f"ingested {len(results)} file(s) in {time.perf_counter() - started:.1f}s; "
+        f"store has {stats['articles']} articles, {stats['deleted']} deleted"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,19 @@ Uses NCBI E-utilities API to search and fetch articles from PubMed.
 API Documentation: https://www.ncbi.nlm.nih.gov/books/NBK25500/
 """
 
+import asyncio
 import httpx
-from typing import Optional
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, BinaryIO, Callable, Iterator, Optional, Union
 from dataclasses import dataclass
 import xml.etree.ElementTree as ET
 
+from .http_client import http_session
+from .rate_limit import get_ncbi_rate_limiter
+
+if TYPE_CHECKING:
+    from .article_store import ArticleStore
+
 
 @dataclass
 class Article:
@@ -21,6 +29,7 @@ class Article:
     journal: str
     pub_date: str
     doi: Optional[str] = None
+    pmcid: Optional[str] = None
     keywords: list[str] = None
     source: str = "pubmed"
 
@@ -33,11 +42,68 @@ class Article:
             "journal": self.journal,
             "pub_date": self.pub_date,
             "doi": self.doi,
+            "pmcid": self.pmcid,
             "keywords": self.keywords or [],
             "source": self.source
         }
 
 
+class PubMedXMLStream:
+    """
+    Incremental parser for PubMed XML (efetch responses, baseline files).
+
+    Bytes are fed as they arrive; each completed PubmedArticle is parsed,
+    returned and then detached from the tree, so memory stays bounded by
+    one article rather than the whole document.
+
+    PMIDs listed in DeleteCitation blocks (update files) are collected in
+    `deleted_pmids`.
+    """
+
+    def __init__(self, parse_article: Callable[[ET.Element], Optional[Article]]):
+        self._parse_article = parse_article
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._depth = 0
+        self.deleted_pmids: list[str] = []
+
+    def feed(self, data: bytes) -> list[Article]:
+        """Feed bytes and return the articles completed so far."""
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> list[Article]:
+        """Finish parsing and return any remaining articles."""
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[Article]:
+        articles = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                self._depth += 1
+                continue
+
+            self._depth -= 1
+            # Only act on direct children of the root element
+            if self._depth != 1:
+                continue
+
+            if elem.tag == "PubmedArticle":
+                article = self._parse_article(elem)
+                if article is not None:
+                    articles.append(article)
+            elif elem.tag == "DeleteCitation":
+                self.deleted_pmids.extend(
+                    pmid.text for pmid in elem.iterfind("PMID") if pmid.text
+                )
+            self._root.remove(elem)
+
+        return articles
+
+
 class PubMedSearchService:
     """
     Service for searching PubMed via NCBI E-utilities.
@@ -49,16 +115,48 @@ class PubMedSearchService:
 
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
 
-    def __init__(self, api_key: Optional[str] = None, email: Optional[str] = None):
+    # Per-endpoint timeouts in seconds
+    SEARCH_TIMEOUT = 30.0
+    FETCH_TIMEOUT = 60.0
+
+    # efetch requests with more IDs than this are sent as POST
+    # (NCBI recommends POST above ~200 IDs to stay within URL limits)
+    POST_ID_THRESHOLD = 200
+
+    # Retries for 429 and 5xx responses, with exponential backoff
+    MAX_RETRIES = 3
+    RETRY_BACKOFF = 0.5
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        email: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        fetch_chunk_size: int = 200,
+        store: Optional["ArticleStore"] = None
+    ):
         """
         Initialize PubMed search service.
 
         Args:
             api_key: NCBI API key (optional, increases rate limit from 3 to 10 req/sec)
             email: Email for NCBI to contact if issues (recommended)
+            client: HTTP client to use (defaults to the app's shared client)
+            fetch_chunk_size: PMIDs per efetch request
+            store: Local article store (defaults to the ingested one, if any)
         """
         self.api_key = api_key
         self.email = email
+        self.client = client
+        self.fetch_chunk_size = max(1, fetch_chunk_size)
+        self.rate_limiter = get_ncbi_rate_limiter(api_key)
+
+        if store is None:
+            # Imported here: the store module depends on Article
+            from .article_store import get_article_store
+            store = get_article_store()
+        self.store = store
 
     def _build_params(self, **kwargs) -> dict:
         """Build request parameters with optional API key and email."""
@@ -69,11 +167,75 @@ class PubMedSearchService:
             params["email"] = self.email
         return params
 
+    @asynccontextmanager
+    async def _stream(
+        self,
+        method: str,
+        endpoint: str,
+        timeout: float,
+        **kwargs
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streamed E-utilities response under the NCBI rate limit.
+
+        Retries 429 and 5xx responses with exponential backoff, honouring
+        Retry-After when NCBI sends it. The body is not read.
+        """
+        url = f"{self.BASE_URL}/{endpoint}"
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            async with http_session(self.client) as client:
+                async with client.stream(method, url, timeout=timeout, **kwargs) as response:
+                    if response.extensions.get("from_cache"):
+                        # Served from the HTTP cache; NCBI was not contacted
+                        await self.rate_limiter.release()
+                    if (response.status_code not in self.RETRY_STATUS_CODES
+                            or attempt >= self.MAX_RETRIES):
+                        response.raise_for_status()
+                        yield response
+                        return
+
+                    retry_after = response.headers.get("Retry-After", "")
+
+            delay = float(retry_after) if retry_after.isdigit() else self.RETRY_BACKOFF * 2 ** attempt
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        timeout: float,
+        **kwargs
+    ) -> httpx.Response:
+        """Send an E-utilities request and read the whole response."""
+        async with self._stream(method, endpoint, timeout, **kwargs) as response:
+            await response.aread()
+            return response
+
+    async def _iter_articles(
+        self,
+        method: str,
+        endpoint: str,
+        timeout: float,
+        **kwargs
+    ) -> AsyncIterator[Article]:
+        """Stream an efetch response, yielding articles as they are parsed."""
+        stream = PubMedXMLStream(self._parse_article)
+        async with self._stream(method, endpoint, timeout, **kwargs) as response:
+            async for chunk in response.aiter_bytes():
+                for article in stream.feed(chunk):
+                    yield article
+        for article in stream.close():
+            yield article
+
     async def search(
         self,
         query: str,
         max_results: int = 100,
-        sort: str = "relevance"
+        sort: str = "relevance",
+        use_history: bool = False
     ) -> dict:
         """
         Search PubMed and return article IDs.
@@ -82,146 +244,293 @@ class PubMedSearchService:
             query: Search query (supports PubMed query syntax)
             max_results: Maximum number of results to return
             sort: Sort order - "relevance" or "pub_date"
+            use_history: Store the result set on the NCBI History server
 
         Returns:
-            Dict with count and list of PMIDs
+            Dict with count and list of PMIDs, plus `webenv` and
+            `query_key` when use_history is set
         """
         params = self._build_params(
             db="pubmed",
             term=query,
             retmax=max_results,
             sort=sort,
-            retmode="json"
+            retmode="json",
+            usehistory="y" if use_history else None
         )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/esearch.fcgi",
-                params=params,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await self._request(
+            "GET", "esearch.fcgi", self.SEARCH_TIMEOUT, params=params
+        )
+        data = response.json()
 
         result = data.get("esearchresult", {})
-        return {
+        search_result = {
             "total_count": int(result.get("count", 0)),
             "pmids": result.get("idlist", []),
             "query": query
         }
+        if use_history:
+            search_result["webenv"] = result.get("webenv")
+            search_result["query_key"] = result.get("querykey")
+        return search_result
+
+    async def _fetch_history_page(
+        self,
+        webenv: str,
+        query_key: str,
+        retstart: int,
+        retmax: int
+    ) -> list[Article]:
+        """Fetch one page of a History server result set."""
+        params = self._build_params(
+            db="pubmed",
+            WebEnv=webenv,
+            query_key=query_key,
+            retstart=retstart,
+            retmax=retmax,
+            retmode="xml"
+        )
+        return [
+            article async for article in self._iter_articles(
+                "GET", "efetch.fcgi", self.FETCH_TIMEOUT, params=params
+            )
+        ]
+
+    async def iter_search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        sort: str = "relevance",
+        page_size: Optional[int] = None
+    ) -> AsyncIterator[Article]:
+        """
+        Stream articles for a query page by page.
+
+        esearch stores the result set on the NCBI History server
+        (usehistory=y) and efetch pages through it with WebEnv/query_key
+        and retstart/retmax, so the PMID list is never held in memory or
+        sent in a URL. The next page is fetched while the caller consumes
+        the current one.
+
+        Usage:
+            async for article in service.iter_search(query, limit=5000):
+                ...
+
+        Args:
+            query: Search query
+            limit: Maximum articles to yield (None for all hits)
+            sort: Sort order
+            page_size: Articles per efetch page (defaults to fetch_chunk_size)
+
+        Yields:
+            Article objects in result order
+        """
+        history = await self.search(query, max_results=0, sort=sort, use_history=True)
+        total = history["total_count"]
+        if limit is not None:
+            total = min(total, limit)
+        page_size = page_size or self.fetch_chunk_size
+
+        def fetch_page(retstart: int) -> asyncio.Task:
+            return asyncio.create_task(self._fetch_history_page(
+                history["webenv"],
+                history["query_key"],
+                retstart,
+                min(page_size, total - retstart)
+            ))
+
+        next_page = fetch_page(0) if total > 0 else None
+        try:
+            retstart = 0
+            while next_page is not None:
+                articles = await next_page
+                retstart += page_size
+                next_page = fetch_page(retstart) if retstart < total else None
+                for article in articles:
+                    yield article
+        finally:
+            if next_page is not None:
+                next_page.cancel()
 
     async def fetch_articles(self, pmids: list[str]) -> list[Article]:
         """
         Fetch full article details for given PMIDs.
 
+        PMIDs present in the local article store are read from disk; the
+        rest are fetched in chunks of `fetch_chunk_size`, issued
+        concurrently under the NCBI rate limit.
+
         Args:
             pmids: List of PubMed IDs
 
         Returns:
-            List of Article objects
+            List of Article objects, in the order of `pmids`
         """
         if not pmids:
             return []
 
+        unique_pmids = list(dict.fromkeys(pmids))
+        by_pmid = (
+            await asyncio.to_thread(self.store.get_many, unique_pmids)
+            if self.store is not None else {}
+        )
+        missing = [pmid for pmid in unique_pmids if pmid not in by_pmid]
+
+        chunks = [
+            missing[i:i + self.fetch_chunk_size]
+            for i in range(0, len(missing), self.fetch_chunk_size)
+        ]
+        chunk_results = await asyncio.gather(
+            *(self._fetch_chunk(chunk) for chunk in chunks)
+        )
+
+        for articles in chunk_results:
+            for article in articles:
+                by_pmid[article.pmid] = article
+        return [by_pmid[pmid] for pmid in unique_pmids if pmid in by_pmid]
+
+    async def get_article_by_id(self, pmid: str) -> Optional[Article]:
+        """Get a single article, from the local store when available."""
+        articles = await self.fetch_articles([pmid])
+        return articles[0] if articles else None
+
+    async def _fetch_chunk(self, pmids: list[str]) -> list[Article]:
+        """Fetch one chunk of PMIDs, using POST for large ID sets."""
         params = self._build_params(
             db="pubmed",
             id=",".join(pmids),
             retmode="xml"
         )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.BASE_URL}/efetch.fcgi",
-                params=params,
-                timeout=60.0
+        if len(pmids) > self.POST_ID_THRESHOLD:
+            articles = self._iter_articles(
+                "POST", "efetch.fcgi", self.FETCH_TIMEOUT, data=params
+            )
+        else:
+            articles = self._iter_articles(
+                "GET", "efetch.fcgi", self.FETCH_TIMEOUT, params=params
             )
-            response.raise_for_status()
 
-        return self._parse_pubmed_xml(response.text)
+        return [article async for article in articles]
 
-    def _parse_pubmed_xml(self, xml_text: str) -> list[Article]:
-        """Parse PubMed XML response into Article objects."""
-        articles = []
-        root = ET.fromstring(xml_text)
-
-        for article_elem in root.findall(".//PubmedArticle"):
-            try:
-                medline = article_elem.find(".//MedlineCitation")
-                article_data = medline.find(".//Article")
-
-                # PMID
-                pmid = medline.find(".//PMID").text
-
-                # Title
-                title_elem = article_data.find(".//ArticleTitle")
-                title = self._get_text(title_elem)
-
-                # Abstract
-                abstract_elem = article_data.find(".//Abstract")
-                abstract = ""
-                if abstract_elem is not None:
-                    abstract_texts = abstract_elem.findall(".//AbstractText")
-                    abstract_parts = []
-                    for at in abstract_texts:
-                        label = at.get("Label", "")
-                        text = self._get_text(at)
-                        if label:
-                            abstract_parts.append(f"{label}: {text}")
-                        else:
-                            abstract_parts.append(text)
-                    abstract = " ".join(abstract_parts)
-
-                # Authors
-                authors = []
-                author_list = article_data.find(".//AuthorList")
-                if author_list is not None:
-                    for author in author_list.findall(".//Author"):
-                        last_name = author.find(".//LastName")
-                        fore_name = author.find(".//ForeName")
-                        if last_name is not None:
-                            name = last_name.text or ""
-                            if fore_name is not None and fore_name.text:
-                                name = f"{fore_name.text} {name}"
-                            authors.append(name)
-
-                # Journal
-                journal_elem = article_data.find(".//Journal/Title")
-                journal = self._get_text(journal_elem)
-
-                # Publication Date
-                pub_date_elem = article_data.find(".//Journal/JournalIssue/PubDate")
-                pub_date = self._parse_date(pub_date_elem)
-
-                # DOI
-                doi = None
-                for id_elem in article_elem.findall(".//ArticleId"):
-                    if id_elem.get("IdType") == "doi":
-                        doi = id_elem.text
-                        break
-
-                # Keywords
-                keywords = []
-                for kw in medline.findall(".//KeywordList/Keyword"):
-                    if kw.text:
-                        keywords.append(kw.text)
-
-                articles.append(Article(
-                    pmid=pmid,
-                    title=title,
-                    abstract=abstract,
-                    authors=authors,
-                    journal=journal,
-                    pub_date=pub_date,
-                    doi=doi,
-                    keywords=keywords,
-                    source="pubmed"
-                ))
-
-            except Exception as e:
-                # Skip malformed articles
-                continue
+    def _parse_pubmed_xml(self, xml_text: Union[str, bytes]) -> list[Article]:
+        """Parse a complete PubMed XML document into Article objects."""
+        if isinstance(xml_text, str):
+            xml_text = xml_text.encode("utf-8")
 
-        return articles
+        stream = PubMedXMLStream(self._parse_article)
+        return stream.feed(xml_text) + stream.close()
+
+    def iter_parse_pubmed_xml(
+        self,
+        source: BinaryIO,
+        chunk_size: int = 1 << 16
+    ) -> Iterator[Article]:
+        """
+        Incrementally parse PubMed XML from a binary file object.
+
+        Args:
+            source: File object opened in binary mode (e.g. gzip.open)
+            chunk_size: Bytes read per step
+
+        Yields:
+            Article objects, one PubmedArticle at a time
+        """
+        stream = PubMedXMLStream(self._parse_article)
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield from stream.feed(chunk)
+        yield from stream.close()
+
+    def _parse_article(self, article_elem: ET.Element) -> Optional[Article]:
+        """
+        Parse one PubmedArticle element, or None if it is malformed.
+
+        Uses direct child paths rather than descendant (.//) searches, which
+        would scan the whole subtree (including reference lists) per field.
+        """
+        try:
+            medline = article_elem.find("MedlineCitation")
+            article_data = medline.find("Article")
+
+            # PMID
+            pmid = medline.find("PMID").text
+
+            # Title
+            title_elem = article_data.find("ArticleTitle")
+            title = self._get_text(title_elem)
+
+            # Abstract
+            abstract_elem = article_data.find("Abstract")
+            abstract = ""
+            if abstract_elem is not None:
+                abstract_texts = abstract_elem.findall("AbstractText")
+                abstract_parts = []
+                for at in abstract_texts:
+                    label = at.get("Label", "")
+                    text = self._get_text(at)
+                    if label:
+                        abstract_parts.append(f"{label}: {text}")
+                    else:
+                        abstract_parts.append(text)
+                abstract = " ".join(abstract_parts)
+
+            # Authors
+            authors = []
+            author_list = article_data.find("AuthorList")
+            if author_list is not None:
+                for author in author_list.findall("Author"):
+                    last_name = author.find("LastName")
+                    fore_name = author.find("ForeName")
+                    if last_name is not None:
+                        name = last_name.text or ""
+                        if fore_name is not None and fore_name.text:
+                            name = f"{fore_name.text} {name}"
+                        authors.append(name)
+
+            # Journal
+            journal_elem = article_data.find("Journal/Title")
+            journal = self._get_text(journal_elem)
+
+            # Publication Date
+            pub_date_elem = article_data.find("Journal/JournalIssue/PubDate")
+            pub_date = self._parse_date(pub_date_elem)
+
+            # DOI and PMC ID
+            doi = None
+            pmcid = None
+            for id_elem in article_elem.iterfind("PubmedData/ArticleIdList/ArticleId"):
+                id_type = id_elem.get("IdType")
+                if id_type == "doi" and doi is None:
+                    doi = id_elem.text
+                elif id_type == "pmc" and pmcid is None:
+                    pmcid = id_elem.text
+
+            # Keywords
+            keywords = []
+            for kw in medline.iterfind("KeywordList/Keyword"):
+                if kw.text:
+                    keywords.append(kw.text)
+
+            return Article(
+                pmid=pmid,
+                title=title,
+                abstract=abstract,
+                authors=authors,
+                journal=journal,
+                pub_date=pub_date,
+                doi=doi,
+                pmcid=pmcid,
+                keywords=keywords,
+                source="pubmed"
+            )
+
+        except Exception:
+            # Skip malformed articles
+            return None
 
     def _get_text(self, elem) -> str:
         """Safely get text from XML element."""
@@ -266,8 +575,26 @@ class PubMedSearchService:
         Returns:
             Dict with search metadata and full article details
         """
-        search_result = await self.search(query, max_results, sort)
-        articles = await self.fetch_articles(search_result["pmids"])
+        if max_results <= self.fetch_chunk_size:
+            search_result = await self.search(query, max_results, sort)
+            articles = await self.fetch_articles(search_result["pmids"])
+        else:
+            # Larger result sets: page through the History server instead
+            # of echoing the PMID list back to efetch
+            search_result = await self.search(
+                query, max_results=0, sort=sort, use_history=True
+            )
+            total = min(search_result["total_count"], max_results)
+            pages = await asyncio.gather(*(
+                self._fetch_history_page(
+                    search_result["webenv"],
+                    search_result["query_key"],
+                    retstart,
+                    min(self.fetch_chunk_size, total - retstart)
+                )
+                for retstart in range(0, total, self.fetch_chunk_size)
+            ))
+            articles = [article for page in pages for article in page]
 
         return {
             "query": query,
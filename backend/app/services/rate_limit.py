@@ -0,0 +1,165 @@
+"""
+Rate Limiting Service
+
+Async token-bucket limiters used to stay within upstream API rate limits,
+such as NCBI E-utilities' 3 requests/second (10 with an API key).
+
+The limit applies to the whole deployment, not to each process, so the
+NCBI limiter keeps its bucket in a small SQLite file shared by every API
+worker (see gunicorn.conf.py). Each request reserves the next free slot
+in one transaction and then sleeps until it, so N workers together still
+send at most `rate` requests per second.
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Optional
+
+from .. import config
+
+
+class TokenBucket:
+    """
+    Async token bucket.
+
+    Tokens refill continuously at `rate` per second up to `capacity`;
+    each request takes one token and waits if none is available. State is
+    per process.
+
+    Usage:
+        limiter = TokenBucket(rate=3)
+        await limiter.acquire()
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to `rate`)
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def release(self) -> None:
+        """Return a token taken for a request that never went upstream."""
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket shared by all processes using the same SQLite file and key.
+
+    A request takes a token even when none is left, driving the count
+    negative, and then sleeps until its token would have refilled. Waiting
+    requests therefore get slots in arrival order without polling the file.
+
+    Usage:
+        limiter = SharedTokenBucket("data/rate_limits.sqlite3", "ncbi", rate=3)
+        await limiter.acquire()
+    """
+
+    def __init__(self, path: str, key: str, rate: float, capacity: Optional[float] = None):
+        """
+        Open (and create if needed) the bucket.
+
+        Args:
+            path: SQLite database file
+            key: Bucket name; processes using the same key share the limit
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to `rate`)
+        """
+        super().__init__(rate, capacity)
+        self.path = path
+        self.key = key
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False)
+        self._conn_lock = threading.Lock()
+        with self._conn_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS token_buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+
+    def _update(self, delta: float) -> float:
+        """
+        Refill the bucket, add `delta` tokens and store it.
+
+        Returns:
+            Seconds until the token count is back to zero (0 if not negative)
+        """
+        # Wall clock: monotonic clocks are not comparable across processes
+        now = time.time()
+        with self._conn_lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT tokens, updated FROM token_buckets WHERE key = ?", (self.key,)
+            ).fetchone()
+            tokens, updated = row if row else (self.capacity, now)
+            tokens = min(self.capacity, tokens + max(0.0, now - updated) * self.rate)
+            tokens = min(self.capacity, tokens + delta)
+            self._conn.execute(
+                "INSERT INTO token_buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens, "
+                "updated = excluded.updated",
+                (self.key, tokens, now)
+            )
+        return max(0.0, -tokens / self.rate)
+
+    async def acquire(self) -> None:
+        """Reserve the next token and wait until it is due."""
+        wait = await asyncio.to_thread(self._update, -1)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def release(self) -> None:
+        """Return a token taken for a request that never went upstream."""
+        await asyncio.to_thread(self._update, 1)
+
+
+@lru_cache(maxsize=None)
+def get_ncbi_rate_limiter(api_key: Optional[str] = None) -> TokenBucket:
+    """
+    Get the NCBI limiter for an API key.
+
+    NCBI allows 3 requests/second without an API key and 10 with one.
+    The limit applies per key (or per IP), so all services and worker
+    processes using the same key share one bucket. With
+    VIGI_RATE_LIMIT_PATH empty the bucket is per process, which is only
+    within NCBI's limit when running a single worker.
+    """
+    # No bursts: requests are spaced 1/rate apart, so no one-second
+    # window ever sees more than `rate` of them
+    rate = 10 if api_key else 3
+    if not config.RATE_LIMIT_PATH:
+        return TokenBucket(rate=rate, capacity=1)
+    # Keys are not stored in the clear
+    key = "ncbi:" + (hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else "anonymous")
+    return SharedTokenBucket(config.RATE_LIMIT_PATH, key, rate=rate, capacity=1)
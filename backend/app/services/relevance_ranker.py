@@ -0,0 +1,294 @@
+"""
+Relevance Ranker Service
+
+Active-learning prioritization of screening queues.
+
+Once a project has enough include/exclude decisions, a TF-IDF + logistic
+regression classifier is trained on them and every pending article is
+scored; the scores become queue priorities, so likely-relevant articles
+are reviewed first. The model is retrained in batches as new decisions
+arrive, in a separate worker process, so neither the review requests nor
+the event loop wait for it. Whether a retrain is due is tracked in the
+screening store, so decisions count wherever they were made and only one
+API worker process retrains a project at a time.
+
+The same scores give an estimated recall per project: the included count
+divided by the included count plus the expected number of relevant
+articles still pending. Scores are turned into probabilities by Platt
+scaling on out-of-fold scores of the reviewed articles; the estimate is
+on the low side while relevant articles are still being found.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, Optional
+
+from .. import config
+from ..schemas.screening import ReviewDecision
+from .screening_store import (
+    LABEL_DECISIONS,
+    ProjectNotFoundError,
+    ScreeningStore,
+    get_screening_store
+)
+
+# Feature matrix of the last project trained in this worker process,
+# reused while the project's articles are unchanged
+_features_cache: dict = {}
+
+
+def _project_features(key: tuple, article_ids: list[str], texts: list[str]) -> Any:
+    """
+    TF-IDF features for all of a project's articles (in the ranker worker).
+
+    Args:
+        key: (store path, project ID)
+        article_ids: The project's articles in queue order
+        texts: Their texts, from the same training set read
+
+    Returns:
+        Sparse feature matrix with one row per article
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    cached = _features_cache.get("project")
+    if cached is not None and cached[0] == key and cached[1] == article_ids:
+        return cached[2]
+
+    # Vocabulary and idf come from the whole project, labeled or not
+    vectorizer = TfidfVectorizer(
+        sublinear_tf=True,
+        stop_words="english",
+        min_df=2 if len(texts) >= 100 else 1
+    )
+    features = vectorizer.fit_transform(texts)
+    _features_cache["project"] = (key, article_ids, features)
+    return features
+
+
+def train_and_score(store_path: str, project_id: str, min_labels: int) -> Optional[dict]:
+    """
+    Train a relevance classifier for a project and score its pending articles.
+
+    Runs in the ranker worker process and reads the project from the store
+    file directly.
+
+    Args:
+        store_path: Screening store file
+        project_id: Project ID
+        min_labels: Decisions required before training
+
+    Returns:
+        Dict with priorities ({article_id: score}), label counts,
+        expected relevant articles remaining and estimated recall; None if
+        there are too few decisions or only one class
+    """
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import cross_val_predict
+
+    store = ScreeningStore(store_path)
+    try:
+        # One read, so decisions and texts describe the same articles
+        rows = store.training_set(project_id)
+    finally:
+        store.close()
+
+    decisions = [decision for _, decision, _ in rows]
+    labeled = [i for i, decision in enumerate(decisions) if decision in LABEL_DECISIONS]
+    labels = [decisions[i] == ReviewDecision.INCLUDE for i in labeled]
+    included = sum(labels)
+    excluded = len(labels) - included
+    if len(labels) < min_labels or not included or not excluded:
+        return None
+
+    article_ids = [article_id for article_id, _, _ in rows]
+    features = _project_features(
+        (store_path, project_id), article_ids, [text for _, _, text in rows]
+    )
+
+    pending = [i for i, decision in enumerate(decisions) if decision == ReviewDecision.PENDING]
+
+    classifier = LogisticRegression(class_weight="balanced", max_iter=1000)
+    classifier.fit(features[labeled], labels)
+    # Priorities are the classifier's scores; higher is reviewed first
+    scores = classifier.decision_function(features[pending]) if pending else np.zeros(0)
+
+    # Calibrate scores to probabilities on out-of-fold scores of the labeled
+    # articles (Platt scaling); the expected number of relevant articles
+    # still pending is the sum of their probabilities
+    folds = min(5, included, excluded)
+    if folds >= 2 and pending:
+        held_out = cross_val_predict(
+            LogisticRegression(class_weight="balanced", max_iter=1000),
+            features[labeled],
+            labels,
+            cv=folds,
+            method="decision_function"
+        )
+        calibrator = LogisticRegression(C=1e6).fit(held_out.reshape(-1, 1), labels)
+        probabilities = calibrator.predict_proba(scores.reshape(-1, 1))[:, 1]
+    else:
+        probabilities = np.full(len(pending), included / len(labels))
+    remaining = float(probabilities.sum())
+
+    return {
+        "priorities": {
+            article_ids[i]: float(score) for i, score in zip(pending, scores)
+        },
+        "included": included,
+        "excluded": excluded,
+        "expected_remaining": round(remaining, 2),
+        "estimated_recall": round(included / (included + remaining), 4)
+    }
+
+
+class RelevanceRanker:
+    """
+    Retrains project rankers in the background as decisions accumulate.
+
+    Usage:
+        ranker = RelevanceRanker(store, batch_size=10)
+        store.review(project_id, article_id, ReviewDecision.INCLUDE)
+        await ranker.schedule(project_id)   # retrains once 10 new decisions arrived
+        ranker.status(project_id)
+    """
+
+    def __init__(
+        self,
+        store: ScreeningStore,
+        batch_size: int = 10,
+        min_labels: int = 10
+    ):
+        """
+        Initialize the ranker and subscribe to store changes.
+
+        Args:
+            store: Screening store
+            batch_size: New include/exclude decisions that trigger a retrain
+            min_labels: Decisions required before the first training
+        """
+        self.store = store
+        self.batch_size = max(1, batch_size)
+        self.min_labels = max(2, min_labels)
+        # Results of retrains run by this process
+        self._status: dict[str, dict] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        store.add_listener(self._on_change)
+
+    def _on_change(self, event: str, project_id: str, payload: dict) -> None:
+        if event == "deleted":
+            self._status.pop(project_id, None)
+
+    async def schedule(self, project_id: str, force: bool = False) -> bool:
+        """
+        Retrain a project's ranker in the background if enough changed.
+
+        Call from the event loop, e.g. after a review. Label changes since
+        the last retrain are counted in the screening store, across all
+        worker processes.
+
+        Args:
+            project_id: Project ID
+            force: Retrain even if fewer than `batch_size` decisions arrived
+
+        Returns:
+            True if a retrain was started
+        """
+        task = self._tasks.get(project_id)
+        if task is not None and not task.done():
+            return False
+        claimed = await asyncio.to_thread(
+            self.store.begin_ranking, project_id, self.batch_size, force
+        )
+        if not claimed:
+            return False
+        self._tasks[project_id] = asyncio.get_running_loop().create_task(
+            self._retrain(project_id)
+        )
+        return True
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _retrain(self, project_id: str) -> None:
+        status = self._status.setdefault(project_id, {})
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                train_and_score,
+                self.store.path,
+                project_id,
+                self.min_labels
+            )
+            if result is None:
+                status["error"] = "Not enough include and exclude decisions to train"
+                return
+            await asyncio.to_thread(
+                self.store.set_ranking,
+                project_id,
+                result.pop("priorities"),
+                result["estimated_recall"]
+            )
+            status.update(result, error=None)
+        except asyncio.CancelledError:
+            raise
+        except ProjectNotFoundError:
+            self._status.pop(project_id, None)
+        except Exception as e:
+            status["error"] = str(e)
+
+    def status(self, project_id: str) -> dict:
+        """
+        Get a project's ranker state (reads the store; call from a worker thread).
+
+        Label counts and errors are those of retrains run by this process.
+
+        Returns:
+            Dict with last training time and label counts, estimated recall,
+            decisions waiting for the next retrain and whether one is running
+            here
+
+        Raises:
+            ProjectNotFoundError: if the project does not exist
+        """
+        task = self._tasks.get(project_id)
+        return {
+            "project_id": project_id,
+            "included": 0,
+            "excluded": 0,
+            "expected_remaining": None,
+            "error": None,
+            **self._status.get(project_id, {}),
+            **self.store.ranking_state(project_id),
+            "retraining": task is not None and not task.done()
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel running retrains and stop the worker process."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_relevance_ranker() -> RelevanceRanker:
+    """Get the shared RelevanceRanker for the shared screening store."""
+    return RelevanceRanker(
+        get_screening_store(),
+        batch_size=config.SCREENING_RANKER_BATCH_SIZE,
+        min_labels=config.SCREENING_RANKER_MIN_LABELS
+    )
@@ -0,0 +1,214 @@
+"""
+NER Result Cache Service
+
+Content-addressed cache of unfiltered entity extraction results, keyed on
+a hash of (text, model path, model revision, inference backend). Because
+entities are stored before thresholding, any confidence_threshold can be
+served from cache.
+
+Backends are pluggable; the default cache layers an in-process LRU tier
+over an on-disk SQLite tier that survives restarts.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from .. import config
+
+
+def result_cache_key(
+    text: str,
+    model_path: str,
+    revision: str,
+    backend: str = "torch"
+) -> str:
+    """
+    Build the cache key for a text and model.
+
+    Only trailing whitespace is normalized away, since anything else would
+    shift the entity offsets stored in the cached result.
+    """
+    digest = hashlib.sha256()
+    for part in (model_path, revision, backend, text.rstrip()):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class CacheBackend(ABC):
+    """Interface for result cache tiers."""
+
+    name = "backend"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[list[dict]]:
+        """Get cached entities, or None on a miss."""
+
+    @abstractmethod
+    def set(self, key: str, entities: list[dict]) -> None:
+        """Store entities under a key."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop all entries."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of cached entries."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU tier."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, list[dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        with self._lock:
+            entities = self._entries.get(key)
+            if entities is None:
+                return None
+            self._entries.move_to_end(key)
+        # Callers may mutate the returned entities
+        return [dict(entity) for entity in entities]
+
+    def set(self, key: str, entities: list[dict]) -> None:
+        with self._lock:
+            self._entries[key] = [dict(entity) for entity in entities]
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """On-disk tier stored in a SQLite database."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS ner_results ("
+                "key TEXT PRIMARY KEY, entities TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT entities FROM ner_results WHERE key = ?", (key,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, entities: list[dict]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ner_results (key, entities) VALUES (?, ?)",
+                (key, json.dumps(entities))
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ner_results")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ner_results").fetchone()[0]
+
+
+class ResultCache:
+    """
+    Tiered cache of unfiltered NER results.
+
+    Tiers are checked in order; a hit in a slower tier is promoted to the
+    faster ones.
+
+    Usage:
+        cache = ResultCache([MemoryCacheBackend(), SQLiteCacheBackend(path)])
+        key = result_cache_key(text, model_path, revision, backend)
+        entities = cache.get(key)
+    """
+
+    def __init__(self, tiers: list[CacheBackend]):
+        self.tiers = tiers
+        self._hits = {tier.name: 0 for tier in tiers}
+        self._misses = 0
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        """Look up a key across tiers, or None on a miss."""
+        for level, tier in enumerate(self.tiers):
+            entities = tier.get(key)
+            if entities is not None:
+                self._hits[tier.name] += 1
+                for faster in self.tiers[:level]:
+                    faster.set(key, entities)
+                return entities
+
+        self._misses += 1
+        return None
+
+    def set(self, key: str, entities: list[dict]) -> None:
+        """Store a result in every tier."""
+        for tier in self.tiers:
+            tier.set(key, entities)
+
+    def clear(self) -> None:
+        """Empty every tier."""
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> dict:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict with hits per tier, misses, hit rate and tier sizes
+        """
+        hits = sum(self._hits.values())
+        lookups = hits + self._misses
+        return {
+            "hits": hits,
+            "misses": self._misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "tiers": [
+                {"name": tier.name, "hits": self._hits[tier.name], "entries": len(tier)}
+                for tier in self.tiers
+            ]
+        }
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_result_cache() -> ResultCache:
+    """Get the shared ResultCache configured from app settings."""
+    tiers: list[CacheBackend] = [
+        MemoryCacheBackend(max_entries=config.RESULT_CACHE_MEMORY_ENTRIES)
+    ]
+    if config.RESULT_CACHE_PATH:
+        tiers.append(SQLiteCacheBackend(config.RESULT_CACHE_PATH))
+    return ResultCache(tiers)
@@ -0,0 +1,416 @@
+"""
+Review Prefetch Service
+
+Per-reviewer lookahead buffers for the screening queue.
+
+Each reviewer of a project gets a buffer of the next N pending articles
+in ranked queue order, already serialized to JSON, so a review submission
+can answer with the next article without querying or serializing it on
+the request path.
+Buffered articles are leased to their reviewer in the screening store, so
+reviewers working the same project get disjoint articles. Each buffer
+leases under its own token, so renewing or releasing one buffer's leases
+never touches those of the same reviewer's buffer in another API worker
+process. Buffers are topped up in the background after each review,
+leases are renewed before they run out, and articles missing entities are
+sent through NER while they wait in the buffer. Near the end of a queue,
+buffers stop leasing ahead, so the last articles are spread over the
+reviewers instead of sitting in one reviewer's buffer.
+
+Buffers stay consistent through screening store change events: reviewed
+articles, and articles claimed by another reviewer after a lease expired,
+are dropped from buffers; stored entities are patched into buffered
+articles; and changes that can put articles back in front of a buffer
+(new articles, a decision undone, a re-ranked queue) invalidate the
+project's buffers so they are rebuilt on next use. A rebuild keeps the
+article the reviewer is currently looking at. Changes made through other
+worker processes raise no events here, so before serving an article the
+buffer checks in the store that it still holds the article's lease at the
+buffered version.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from .. import config
+from ..schemas.screening import ArticleSchema, ReviewDecision
+from .entity_extractor import extract_entities_batch
+from .entity_index import get_entity_index
+from .inference_executor import get_inference_executor
+from .screening_store import ProjectNotFoundError, ScreeningStore, get_screening_store
+
+
+# Seconds before NER is tried again for a project after it failed
+EXTRACT_RETRY_SECONDS = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefetchedArticle:
+    """A buffered article, its serialized JSON and when its lease runs out."""
+    position: int
+    article: ArticleSchema
+    payload: bytes
+    lease_expires: float
+
+
+@dataclass
+class _Buffer:
+    entries: deque = field(default_factory=deque)
+    stale: bool = True
+    # Serializes fills of this buffer (background refill vs. request path)
+    fill_lock: threading.Lock = field(default_factory=threading.Lock)
+    refilling: bool = False
+    # Lease token: identifies this buffer's leases in the store
+    token: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+class ReviewPrefetcher:
+    """
+    Lookahead buffers of pre-serialized pending articles per reviewer.
+
+    Usage:
+        prefetcher = ReviewPrefetcher(store, depth=5)
+        current = prefetcher.next(project_id, reviewer)
+        store.review(project_id, current.article.id, decision, reviewer=reviewer)
+        current = prefetcher.next(project_id, reviewer)
+        prefetcher.release(project_id, reviewer)
+    """
+
+    def __init__(self, store: ScreeningStore, depth: int = 5, lease_seconds: float = 600.0):
+        """
+        Initialize the prefetcher and subscribe to store changes.
+
+        Args:
+            store: Screening store
+            depth: Articles buffered (and leased) per reviewer
+            lease_seconds: Lease duration; leases are renewed when less
+                than half of it remains
+        """
+        self.store = store
+        self.depth = max(1, depth)
+        self.lease_seconds = lease_seconds
+        self._buffers: dict[tuple[str, str], _Buffer] = {}
+        # Bumped on changes that can make claimed articles stale or
+        # reorder the queue; fills that raced with one are redone
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        # When NER last failed per project; not retried on every refill
+        self._extract_failed: dict[str, float] = {}
+        # Background refills in flight; referenced so they are not collected
+        self._tasks: set[asyncio.Task] = set()
+        self._hits = 0
+        self._misses = 0
+        self._refill_errors = 0
+        store.add_listener(self._on_change)
+
+    @staticmethod
+    def _serialize(
+        position: int,
+        article: ArticleSchema,
+        lease_expires: float
+    ) -> PrefetchedArticle:
+        return PrefetchedArticle(
+            position, article, article.model_dump_json().encode("utf-8"), lease_expires
+        )
+
+    def _project_buffers(self, project_id: str) -> list[_Buffer]:
+        return [buffer for (pid, _), buffer in self._buffers.items() if pid == project_id]
+
+    def _on_change(self, event: str, project_id: str, payload: dict) -> None:
+        if event == "claimed":
+            # Expired leases taken over by another buffer
+            claimed = set(payload["article_ids"])
+            with self._lock:
+                for (pid, _), buffer in self._buffers.items():
+                    if pid == project_id and buffer.token != payload["token"]:
+                        buffer.entries = deque(
+                            entry for entry in buffer.entries
+                            if entry.article.id not in claimed
+                        )
+            return
+
+        with self._lock:
+            buffers = self._project_buffers(project_id)
+            if event != "reviewed" or payload["decision"] == ReviewDecision.PENDING:
+                # Reviews only remove articles, which is handled below
+                self._generations[project_id] = self._generations.get(project_id, 0) + 1
+
+            if event == "deleted":
+                self._extract_failed.pop(project_id, None)
+                for key in [key for key in self._buffers if key[0] == project_id]:
+                    del self._buffers[key]
+
+            elif event == "reviewed":
+                if payload["decision"] == ReviewDecision.PENDING:
+                    # An undone decision may belong in front of any buffer
+                    for buffer in buffers:
+                        buffer.stale = True
+                else:
+                    for buffer in buffers:
+                        buffer.entries = deque(
+                            entry for entry in buffer.entries
+                            if entry.article.id != payload["article_id"]
+                        )
+
+            elif event == "entities":
+                entities = payload["entities"]
+                for buffer in buffers:
+                    for i, entry in enumerate(buffer.entries):
+                        if entry.article.id in entities:
+                            article = entry.article.model_copy(update={
+                                "entities": entities[entry.article.id],
+                                "entities_extracted": True
+                            })
+                            buffer.entries[i] = self._serialize(
+                                entry.position, article, entry.lease_expires
+                            )
+
+            elif event == "added":
+                # Only buffers that reached the end of the queue miss them
+                for buffer in buffers:
+                    if len(buffer.entries) < self.depth:
+                        buffer.stale = True
+
+            elif event == "ranked":
+                for buffer in buffers:
+                    buffer.stale = True
+
+    def _fill(self, project_id: str, reviewer: str) -> None:
+        """Claim articles from the store to top a buffer up to `depth`."""
+        with self._lock:
+            buffer = self._buffers.setdefault((project_id, reviewer), _Buffer())
+        with buffer.fill_lock:
+            self._fill_locked(project_id, reviewer, buffer)
+
+    def _target_depth(self, project_id: str) -> int:
+        """Articles to buffer: `depth`, or only the current one near the end of the queue."""
+        reserve = 2 * self.depth
+        if self.depth > 1 and self.store.claimable(project_id, reserve) < reserve:
+            # Few articles left to claim: leave them to other reviewers
+            # rather than leasing them ahead
+            return 1
+        return self.depth
+
+    def _fill_locked(self, project_id: str, reviewer: str, buffer: _Buffer) -> None:
+        target = self._target_depth(project_id)
+        attempts = 3
+        for attempt in range(attempts):
+            with self._lock:
+                generation = self._generations.get(project_id, 0)
+                stale = buffer.stale
+                # A rebuild keeps the article currently shown to the reviewer
+                kept = list(buffer.entries)[:1] if stale else list(buffer.entries)
+                surplus = kept[target:]
+                kept = kept[:target]
+                if not stale and not surplus and len(kept) >= target:
+                    return
+
+            if stale:
+                # Return the rest of this buffer's leases before claiming anew
+                self.store.release(
+                    project_id, reviewer,
+                    keep=[entry.article.id for entry in kept],
+                    token=buffer.token
+                )
+            elif surplus:
+                self.store.release(
+                    project_id, reviewer,
+                    [entry.article.id for entry in surplus],
+                    token=buffer.token
+                )
+            lease_expires = time.time() + self.lease_seconds
+            rows = self.store.claim(
+                project_id, reviewer, target - len(kept), self.lease_seconds, buffer.token
+            ) if len(kept) < target else []
+            entries = [
+                self._serialize(position, article, lease_expires) for position, article in rows
+            ]
+
+            with self._lock:
+                changed = self._generations.get(project_id, 0) != generation
+                if not changed or attempt == attempts - 1:
+                    # Kept articles as they are now: reviewed ones dropped,
+                    # entity updates applied
+                    current = {entry.article.id: entry for entry in buffer.entries}
+                    kept = [
+                        current[entry.article.id] for entry in kept
+                        if entry.article.id in current
+                    ]
+                    buffer.entries = deque(kept + entries)
+                    # Rebuild next time if the final attempt raced too
+                    buffer.stale = changed
+                    return
+            # Changed while claiming; try again against the new state
+            self.store.release(
+                project_id, reviewer, [entry.article.id for entry in entries], token=buffer.token
+            )
+
+    def _renew(self, project_id: str, reviewer: str, buffer: _Buffer) -> None:
+        """Extend the buffer's leases before they can be taken over."""
+        lease_expires = time.time() + self.lease_seconds
+        self.store.renew_leases(project_id, reviewer, self.lease_seconds, buffer.token)
+        with self._lock:
+            for entry in buffer.entries:
+                entry.lease_expires = lease_expires
+
+    def _validate(self, project_id: str, buffer: _Buffer) -> None:
+        """
+        Drop buffered articles whose lease the buffer no longer holds.
+
+        Catches changes made through other worker processes: articles
+        reviewed there, leases released there, and expired leases taken
+        over by a buffer there.
+        """
+        with self._lock:
+            article_ids = {entry.article.id for entry in buffer.entries}
+        held = self.store.held_leases(project_id, buffer.token, list(article_ids))
+        with self._lock:
+            buffer.entries = deque(
+                entry for entry in buffer.entries
+                if entry.article.id not in article_ids
+                or held.get(entry.article.id) == entry.article.version
+            )
+
+    def next(self, project_id: str, reviewer: str) -> Optional[PrefetchedArticle]:
+        """
+        Get the reviewer's current article: the head of their buffer.
+
+        Reviewed articles leave every buffer, so after a review this is the
+        reviewer's next article.
+
+        Args:
+            project_id: Project ID
+            reviewer: Reviewer name
+
+        Returns:
+            The buffered article, or None when nothing is left to claim
+        """
+        with self._lock:
+            buffer = self._buffers.setdefault((project_id, reviewer), _Buffer())
+            renew = bool(buffer.entries) and (
+                buffer.entries[0].lease_expires - time.time() < self.lease_seconds / 2
+            )
+        if renew:
+            self._renew(project_id, reviewer, buffer)
+
+        self._validate(project_id, buffer)
+        with self._lock:
+            if buffer.entries and not buffer.stale:
+                self._hits += 1
+                return buffer.entries[0]
+            self._misses += 1
+
+        self._fill(project_id, reviewer)
+        with self._lock:
+            return buffer.entries[0] if buffer.entries else None
+
+    def release(self, project_id: str, reviewer: str) -> int:
+        """
+        Drop a reviewer's buffer and release all of their leases.
+
+        Leases held by the reviewer's buffers in other worker processes are
+        released too; those buffers drop the articles on their next use.
+
+        Returns:
+            Number of leases released
+        """
+        with self._lock:
+            self._buffers.pop((project_id, reviewer), None)
+        return self.store.release(project_id, reviewer)
+
+    def schedule_refill(self, project_id: str, reviewer: str) -> None:
+        """Top up a reviewer's buffer in the background (call from the event loop)."""
+        with self._lock:
+            buffer = self._buffers.get((project_id, reviewer))
+            if buffer is None or buffer.refilling:
+                return
+            buffer.refilling = True
+        task = asyncio.get_running_loop().create_task(self._refill(project_id, reviewer, buffer))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refill(self, project_id: str, reviewer: str, buffer: _Buffer) -> None:
+        try:
+            await asyncio.to_thread(self._fill, project_id, reviewer)
+            failed_at = self._extract_failed.get(project_id)
+            if config.SCREENING_PREFETCH_EXTRACT and (
+                failed_at is None or time.time() - failed_at >= EXTRACT_RETRY_SECONDS
+            ):
+                await self._extract_missing(project_id, buffer)
+        except ProjectNotFoundError:
+            pass
+        except Exception:
+            # E.g. the database locked by another worker; the next request
+            # fills the buffer on the request path
+            self._refill_errors += 1
+            logger.exception("Refilling review buffer of %s in project %s failed",
+                             reviewer, project_id)
+        finally:
+            buffer.refilling = False
+
+    async def _extract_missing(self, project_id: str, buffer: _Buffer) -> None:
+        """Run NER for buffered articles that have no entities yet."""
+        with self._lock:
+            missing = [
+                entry.article for entry in buffer.entries
+                if not entry.article.entities_extracted
+            ]
+        if not missing:
+            return
+        try:
+            batch_entities = await get_inference_executor().run(
+                extract_entities_batch,
+                [article.abstract or article.title for article in missing],
+                config.SCREENING_NER_MODEL,
+                config.SCREENING_NER_THRESHOLD
+            )
+        except Exception:
+            # Articles are still reviewable without entities
+            self._extract_failed[project_id] = time.time()
+            return
+        self._extract_failed.pop(project_id, None)
+
+        results = {article.id: entities for article, entities in zip(missing, batch_entities)}
+        await asyncio.to_thread(self.store.set_entities, project_id, results)
+        await asyncio.to_thread(get_entity_index().index_articles, results)
+
+    def stats(self) -> dict:
+        """
+        Get prefetch metrics.
+
+        Returns:
+            Dict with buffer count, buffered articles, hits, misses and
+            failed background refills
+        """
+        with self._lock:
+            buffered = sum(len(buffer.entries) for buffer in self._buffers.values())
+            lookups = self._hits + self._misses
+            return {
+                "buffers": len(self._buffers),
+                "buffered_articles": buffered,
+                "depth": self.depth,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "refill_errors": self._refill_errors
+            }
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_review_prefetcher() -> ReviewPrefetcher:
+    """Get the shared ReviewPrefetcher for the shared screening store."""
+    return ReviewPrefetcher(
+        get_screening_store(),
+        depth=config.SCREENING_PREFETCH_DEPTH,
+        lease_seconds=config.SCREENING_LEASE_SECONDS
+    )
@@ -0,0 +1,338 @@
+"""
+Screening Job Service
+
+Builds screening projects in the background as a streaming pipeline:
+
+    search + fetch  ->  queue insert  ->  entity extraction
+
+Search and insert are connected by a bounded asyncio queue, so a slow
+insert applies backpressure to fetching instead of buffering the whole
+result set. Articles become reviewable as soon as they are fetched and
+inserted. Entity extraction does not take articles from the insert stage:
+it reads articles still missing entities from the screening store, woken
+after each insert, so slow NER never holds up inserts. It fills in
+`entities` / `entities_extracted` afterwards and feeds the entity index.
+
+Job progress is saved in the screening store after every batch, so any
+API worker process can report a job or cancel it; the pipeline itself
+runs in the process that started it.
+"""
+
+import asyncio
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+from .. import config
+from ..schemas.screening import ArticleSchema, SearchRequest
+from .entity_extractor import extract_entities_batch
+from .entity_index import get_entity_index
+from .federated_search import FederatedSearchService
+from .inference_executor import get_inference_executor
+from .screening_store import ScreeningStore, get_screening_store
+
+
+# End-of-stream marker between stages
+_DONE = object()
+
+
+@dataclass
+class ScreeningJob:
+    """Progress of one project-building pipeline."""
+    id: str
+    project_id: str
+    query: str
+    status: str = "running"
+    found: int = 0
+    queued: int = 0
+    extracted: int = 0
+    extract_entities: bool = True
+    errors: dict = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "project_id": self.project_id,
+            "query": self.query,
+            "status": self.status,
+            "found": self.found,
+            "queued": self.queued,
+            "extracted": self.extracted,
+            "extract_entities": self.extract_entities,
+            "errors": self.errors,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ScreeningJob":
+        """Rebuild a job from saved progress (see `to_dict`)."""
+        return cls(**{
+            **data,
+            "created_at": datetime.fromisoformat(data["created_at"]),
+            "finished_at": (
+                datetime.fromisoformat(data["finished_at"]) if data["finished_at"] else None
+            )
+        })
+
+
+class ScreeningJobManager:
+    """
+    Runs and tracks background screening jobs.
+
+    Usage:
+        manager = ScreeningJobManager()
+        job = await manager.start(search_request)
+        manager.get(job.id).to_dict()
+        await manager.cancel(job.id)
+    """
+
+    def __init__(
+        self,
+        store: Optional[ScreeningStore] = None,
+        queue_size: int = 256,
+        batch_size: int = 32,
+        max_finished: int = 100
+    ):
+        """
+        Initialize the job manager.
+
+        Args:
+            store: Screening store (defaults to the shared one)
+            queue_size: Articles buffered between search and insert
+            batch_size: Articles per insert / extraction batch
+            max_finished: Finished jobs kept for status queries
+        """
+        self.store = store or get_screening_store()
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.max_finished = max_finished
+        # Jobs running in this process
+        self._jobs: dict[str, ScreeningJob] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    async def start(self, request: SearchRequest) -> ScreeningJob:
+        """
+        Create a project for a search request and build it in the background.
+
+        Raises:
+            ValueError: if the request selects an unsupported source
+        """
+        search = FederatedSearchService()
+        sources = search.selected_sources(request)
+        project = await asyncio.to_thread(
+            self.store.create_project,
+            request.project_name or request.query,
+            request.query,
+            sources[0].value
+        )
+
+        job = ScreeningJob(
+            id=uuid.uuid4().hex[:12],
+            project_id=project.id,
+            query=request.query,
+            extract_entities=request.extract_entities
+        )
+        self._jobs[job.id] = job
+        await self._save(job)
+        self._tasks[job.id] = asyncio.create_task(self._run(job, request, search))
+        return job
+
+    def get(self, job_id: str) -> Optional[ScreeningJob]:
+        """
+        Get a job by ID: live progress if it runs in this process, else its
+        last saved progress. Reads the store; call from a worker thread.
+        """
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+        saved = self.store.get_job(job_id)
+        return ScreeningJob.from_dict(saved) if saved else None
+
+    def list(self) -> list[ScreeningJob]:
+        """Recent jobs of all processes, newest first (reads the store)."""
+        return [
+            self._jobs.get(saved["id"]) or ScreeningJob.from_dict(saved)
+            for saved in self.store.list_jobs(self.max_finished)
+        ]
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a running job. Articles already queued stay in the project.
+
+        A job running in another process stops at its next progress save.
+
+        Returns:
+            True if the job was running
+        """
+        task = self._tasks.get(job_id)
+        if task is not None:
+            if task.done():
+                return False
+            task.cancel()
+            return True
+        return await asyncio.to_thread(self.store.request_job_cancel, job_id)
+
+    async def shutdown(self) -> None:
+        """Cancel all running jobs and wait for them to stop."""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _save(self, job: ScreeningJob) -> None:
+        """Save a job's progress; cancel it if another process asked to."""
+        cancel = await asyncio.to_thread(self.store.save_job, job.to_dict())
+        task = self._tasks.get(job.id)
+        if cancel and job.finished_at is None and task is not None:
+            task.cancel()
+
+    async def _run(
+        self,
+        job: ScreeningJob,
+        request: SearchRequest,
+        search: FederatedSearchService
+    ) -> None:
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        # Set after each insert, to wake the extraction stage
+        inserted = asyncio.Event()
+
+        inserting = asyncio.create_task(self._insert_stage(job, fetched, inserted))
+        stages = [
+            asyncio.create_task(self._search_stage(job, request, search, fetched)),
+            inserting
+        ]
+        if job.extract_entities:
+            stages.append(asyncio.create_task(self._extract_stage(job, inserted, inserting)))
+
+        try:
+            await asyncio.gather(*stages)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.errors["job"] = str(e)
+        finally:
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+            job.finished_at = datetime.now()
+            await self._save(job)
+            # Finished jobs are served from the store
+            self._jobs.pop(job.id, None)
+            self._tasks.pop(job.id, None)
+            await asyncio.to_thread(self.store.prune_jobs, self.max_finished)
+
+    async def _search_stage(
+        self,
+        job: ScreeningJob,
+        request: SearchRequest,
+        search: FederatedSearchService,
+        fetched: asyncio.Queue
+    ) -> None:
+        """Stream deduplicated, fully fetched articles from every source."""
+        async for article in search.iter_search(request, errors=job.errors):
+            job.found += 1
+            await fetched.put(article)
+        await fetched.put(_DONE)
+
+    async def _next_batch(self, queue: asyncio.Queue) -> tuple[list, bool]:
+        """
+        Wait for one item, then take whatever else is ready up to a batch.
+
+        Returns:
+            (items, True if the end-of-stream marker was reached)
+        """
+        items = []
+        item = await queue.get()
+        while item is not _DONE:
+            items.append(item)
+            if len(items) >= self.batch_size or queue.empty():
+                return items, False
+            item = queue.get_nowait()
+        return items, True
+
+    async def _insert_stage(
+        self,
+        job: ScreeningJob,
+        fetched: asyncio.Queue,
+        inserted: asyncio.Event
+    ) -> None:
+        """Append fetched articles to the project queue as they arrive."""
+        try:
+            done = False
+            while not done:
+                batch, done = await self._next_batch(fetched)
+                if batch:
+                    job.queued += await asyncio.to_thread(
+                        self.store.add_articles, job.project_id, batch
+                    )
+                    inserted.set()
+                    await self._save(job)
+        finally:
+            inserted.set()
+
+    async def _extract_stage(
+        self,
+        job: ScreeningJob,
+        inserted: asyncio.Event,
+        inserting: asyncio.Task
+    ) -> None:
+        """
+        Run NER over queued articles and store the entities.
+
+        Articles still missing entities are read from the store in queue
+        order, so extraction catches up at its own pace while inserts go on.
+        """
+        after_position = 0
+        while True:
+            inserted.clear()
+            finished = inserting.done()
+            rows = await asyncio.to_thread(
+                self.store.unextracted, job.project_id, self.batch_size, after_position
+            )
+            if not rows:
+                if finished:
+                    return
+                await inserted.wait()
+                continue
+            after_position = rows[-1][0]
+            batch: list[ArticleSchema] = [article for _, article in rows]
+
+            # Offsets refer to the abstract (the title when there is none)
+            texts = [article.abstract or article.title for article in batch]
+            try:
+                batch_entities = await get_inference_executor().run(
+                    extract_entities_batch,
+                    texts,
+                    config.SCREENING_NER_MODEL,
+                    config.SCREENING_NER_THRESHOLD
+                )
+            except Exception as e:
+                # Articles stay reviewable without entities
+                job.errors["ner"] = str(e)
+                continue
+
+            results = {
+                article.id: entities for article, entities in zip(batch, batch_entities)
+            }
+            await asyncio.to_thread(self.store.set_entities, job.project_id, results)
+            await asyncio.to_thread(get_entity_index().index_articles, results)
+            job.extracted += len(results)
+            await self._save(job)
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_job_manager() -> ScreeningJobManager:
+    """Get the shared ScreeningJobManager configured from app settings."""
+    return ScreeningJobManager(
+        queue_size=config.SCREENING_JOB_QUEUE_SIZE,
+        batch_size=config.SCREENING_JOB_BATCH_SIZE
+    )
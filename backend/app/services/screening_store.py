@@ -0,0 +1,1085 @@
+"""
+Screening Store Service
+
+Persistent storage for screening projects and their article queues.
+
+Articles are indexed on (project, decision, priority, position), so
+fetching the next pending article is a single index seek regardless of
+project size. Priorities are relevance scores set by the active-learning
+ranker; until a project has one, its queue is in insertion order.
+Per-project decision counters are updated in the same transaction as each
+review rather than recounted, so project statistics are a primary-key
+read.
+
+Several reviewers can work one project concurrently. Pending articles
+are handed out by `claim`, a single UPDATE ... RETURNING that leases the
+next unleased articles to one reviewer for a limited time, so two
+reviewers never receive the same article and no lock is held between
+reading the queue and taking from it. A lease records the reviewer and,
+optionally, a token naming the holder (e.g. one prefetch buffer in one
+API worker), so a holder can renew or release its own leases without
+touching those of the same reviewer elsewhere. Every review bumps the
+article's `version`; a review made against a stale version, or of an
+article leased to someone else, is rejected with ReviewConflictError.
+Read-then-write updates run in one BEGIN IMMEDIATE transaction, so the
+checks and counters hold across worker processes too.
+
+Listeners registered with `add_listener` are told about every change
+(articles added, claimed, reviewed, entities stored, queue re-ranked,
+project deleted),
+which lets in-memory caches such as the review prefetcher stay consistent.
+
+Every queued article is also kept once in a full-text index of screened
+articles, the local corpus searched by local_search.py.
+
+The store also keeps the progress of background project-building jobs,
+so every API worker process can report on (and cancel) a job no matter
+which one runs it.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from .. import config
+from ..schemas.screening import ArticleSchema, ReviewDecision, ScreeningProject
+
+
+# Counter column per decision
+DECISION_COUNTERS = {
+    ReviewDecision.PENDING: "pending_count",
+    ReviewDecision.INCLUDE: "included_count",
+    ReviewDecision.EXCLUDE: "excluded_count",
+    ReviewDecision.MAYBE: "maybe_count",
+}
+
+# Decisions the relevance ranker learns from
+LABEL_DECISIONS = {ReviewDecision.INCLUDE, ReviewDecision.EXCLUDE}
+
+# Article fields stored as one JSON document; screening fields have columns
+ARTICLE_DATA_FIELDS = {
+    "id", "pmid", "doi", "pmcid", "title", "abstract", "authors",
+    "journal", "pub_date", "keywords", "source"
+}
+
+_JOB_COLUMNS = (
+    "id", "project_id", "query", "status", "found", "queued", "extracted",
+    "extract_entities", "errors", "created_at", "finished_at"
+)
+
+_ARTICLE_COLUMNS = (
+    "article_id, position, decision, notes, reviewed_at, data, "
+    "entities, entities_extracted, version"
+)
+
+# Columns added after the first release, created on open if missing
+_MIGRATIONS = {
+    "projects": {
+        "estimated_recall": "REAL",
+        "label_changes": "INTEGER NOT NULL DEFAULT 0",
+        "ranked_label_changes": "INTEGER NOT NULL DEFAULT 0",
+        "ranked_total": "INTEGER NOT NULL DEFAULT 0",
+        "ranked_at": "TEXT",
+    },
+    "project_articles": {
+        "version": "INTEGER NOT NULL DEFAULT 0",
+        "leased_by": "TEXT",
+        "lease_expires": "REAL",
+        "lease_token": "TEXT",
+        "priority": "REAL NOT NULL DEFAULT 0",
+    },
+}
+
+# Rows per transaction when re-ranking, so reviews interleave
+_RANKING_CHUNK = 500
+
+
+class ProjectNotFoundError(KeyError):
+    """Raised when a screening project does not exist."""
+
+
+class ArticleNotFoundError(KeyError):
+    """Raised when an article is not in a project's queue."""
+
+
+class ReviewConflictError(Exception):
+    """Raised when a review is based on a stale version or a foreign lease."""
+
+    def __init__(self, message: str, version: int):
+        super().__init__(message)
+        self.version = version
+
+
+class ScreeningStore:
+    """
+    SQLite-backed store of screening projects and queues.
+
+    Usage:
+        store = ScreeningStore("data/screening.sqlite3")
+        project = store.create_project("Metformin Safety Review", query, source)
+        store.add_articles(project.id, articles)
+        [(position, article)] = store.claim(project.id, "reviewer-1")
+        store.review(project.id, article.id, ReviewDecision.INCLUDE,
+                     reviewer="reviewer-1", expected_version=article.version)
+    """
+
+    def __init__(self, path: str):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=60.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[str, str, dict], None]] = []
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS projects ("
+                "id TEXT PRIMARY KEY, name TEXT NOT NULL, query TEXT NOT NULL, "
+                "source TEXT NOT NULL, created_at TEXT NOT NULL, "
+                "total_articles INTEGER NOT NULL DEFAULT 0, "
+                "pending_count INTEGER NOT NULL DEFAULT 0, "
+                "included_count INTEGER NOT NULL DEFAULT 0, "
+                "excluded_count INTEGER NOT NULL DEFAULT 0, "
+                "maybe_count INTEGER NOT NULL DEFAULT 0, "
+                "estimated_recall REAL, "
+                "label_changes INTEGER NOT NULL DEFAULT 0, "
+                "ranked_label_changes INTEGER NOT NULL DEFAULT 0, "
+                "ranked_total INTEGER NOT NULL DEFAULT 0, ranked_at TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS project_articles ("
+                "project_id TEXT NOT NULL, article_id TEXT NOT NULL, "
+                "position INTEGER NOT NULL, "
+                "decision TEXT NOT NULL DEFAULT 'pending', "
+                "notes TEXT, reviewed_at TEXT, data TEXT NOT NULL, "
+                "entities TEXT NOT NULL DEFAULT '[]', "
+                "entities_extracted INTEGER NOT NULL DEFAULT 0, "
+                "version INTEGER NOT NULL DEFAULT 0, "
+                "leased_by TEXT, lease_expires REAL, lease_token TEXT, "
+                "priority REAL NOT NULL DEFAULT 0, "
+                "PRIMARY KEY (project_id, article_id))"
+            )
+            for table, columns in _MIGRATIONS.items():
+                existing = {
+                    row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")
+                }
+                for column, definition in columns.items():
+                    if column not in existing:
+                        self._conn.execute(
+                            f"ALTER TABLE {table} ADD COLUMN {column} {definition}"
+                        )
+            # Listing in queue order, and claiming in ranked order
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS project_articles_queue "
+                "ON project_articles (project_id, decision, position)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS project_articles_ranked "
+                "ON project_articles (project_id, decision, priority DESC, position)"
+            )
+            # Articles still waiting for NER; shrinks as extraction catches up
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS project_articles_unextracted "
+                "ON project_articles (project_id, position) WHERE entities_extracted = 0"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS screening_jobs ("
+                "id TEXT PRIMARY KEY, project_id TEXT NOT NULL, query TEXT NOT NULL, "
+                "status TEXT NOT NULL, found INTEGER NOT NULL DEFAULT 0, "
+                "queued INTEGER NOT NULL DEFAULT 0, extracted INTEGER NOT NULL DEFAULT 0, "
+                "extract_entities INTEGER NOT NULL, errors TEXT NOT NULL DEFAULT '{}', "
+                "created_at TEXT NOT NULL, finished_at TEXT, "
+                "cancel_requested INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._create_search_index()
+
+    def _create_search_index(self) -> None:
+        """
+        Create the full-text index of screened articles (lock held).
+
+        Every article queued in any project is kept once in
+        `screened_articles`, with the number of projects holding it, and
+        indexed by an external-content FTS5 table kept in sync by triggers
+        (see local_search.py). Projects created before the index existed
+        are indexed on open.
+        """
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'screened_articles'"
+        ).fetchone()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS screened_articles ("
+            "id INTEGER PRIMARY KEY, article_id TEXT NOT NULL UNIQUE, pmid TEXT, "
+            "title TEXT NOT NULL, abstract TEXT NOT NULL, keywords TEXT NOT NULL, "
+            "data TEXT NOT NULL, projects INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS screened_articles_fts USING fts5("
+            "title, abstract, keywords, content='screened_articles', content_rowid='id')"
+        )
+        remove_old = (
+            "INSERT INTO screened_articles_fts "
+            "(screened_articles_fts, rowid, title, abstract, keywords) "
+            "VALUES ('delete', old.id, old.title, old.abstract, old.keywords); "
+        )
+        add_new = (
+            "INSERT INTO screened_articles_fts (rowid, title, abstract, keywords) "
+            "VALUES (new.id, new.title, new.abstract, new.keywords); "
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS screened_articles_fts_insert "
+            "AFTER INSERT ON screened_articles BEGIN " + add_new + "END"
+        )
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS screened_articles_fts_delete "
+            "AFTER DELETE ON screened_articles BEGIN " + remove_old + "END"
+        )
+        # Project counts change often; only text changes touch the index
+        self._conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS screened_articles_fts_update "
+            "AFTER UPDATE OF title, abstract, keywords ON screened_articles "
+            "BEGIN " + remove_old + add_new + "END"
+        )
+        if not exists:
+            self._conn.execute(
+                "INSERT INTO screened_articles "
+                "(article_id, pmid, title, abstract, keywords, data, projects) "
+                "SELECT article_id, json_extract(data, '$.pmid'), "
+                "json_extract(data, '$.title'), json_extract(data, '$.abstract'), "
+                "json_extract(data, '$.keywords'), data, COUNT(*) "
+                "FROM project_articles GROUP BY article_id"
+            )
+
+    @contextmanager
+    def _write(self):
+        """
+        Hold the lock and a write transaction taken before the first read.
+
+        sqlite3 only begins a transaction at the first write, so a read
+        before it could be stale by the time the write lands if another
+        process wrote in between. BEGIN IMMEDIATE takes the database write
+        lock up front, making read-then-write sequences atomic across
+        worker processes.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            yield
+
+    def add_listener(self, listener: Callable[[str, str, dict], None]) -> None:
+        """
+        Register a change listener.
+
+        Listeners are called after each committed change as
+        `listener(event, project_id, payload)` with event one of "added",
+        "claimed", "reviewed", "entities", "ranked" or "deleted".
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, event: str, project_id: str, payload: dict) -> None:
+        for listener in self._listeners:
+            listener(event, project_id, payload)
+
+    @staticmethod
+    def _row_to_project(row: tuple) -> ScreeningProject:
+        (project_id, name, query, source, created_at, total,
+         pending, included, excluded, maybe, estimated_recall) = row
+        return ScreeningProject(
+            id=project_id,
+            name=name,
+            query=query,
+            source=source,
+            created_at=datetime.fromisoformat(created_at),
+            total_articles=total,
+            pending_count=pending,
+            included_count=included,
+            excluded_count=excluded,
+            maybe_count=maybe,
+            estimated_recall=estimated_recall
+        )
+
+    @staticmethod
+    def _row_to_article(row: tuple) -> tuple[int, ArticleSchema]:
+        (_, position, decision, notes, reviewed_at, data,
+         entities, entities_extracted, version) = row
+        article = ArticleSchema(
+            **json.loads(data),
+            decision=decision,
+            reviewer_notes=notes,
+            reviewed_at=datetime.fromisoformat(reviewed_at) if reviewed_at else None,
+            entities=json.loads(entities),
+            entities_extracted=bool(entities_extracted),
+            version=version
+        )
+        return position, article
+
+    def _project_row(self, project_id: str) -> tuple:
+        """Fetch a project row or raise (lock held)."""
+        row = self._conn.execute(
+            "SELECT id, name, query, source, created_at, total_articles, pending_count, "
+            "included_count, excluded_count, maybe_count, estimated_recall FROM projects WHERE id = ?",
+            (project_id,)
+        ).fetchone()
+        if row is None:
+            raise ProjectNotFoundError(project_id)
+        return row
+
+    def create_project(self, name: str, query: str, source: str) -> ScreeningProject:
+        """
+        Create an empty project.
+
+        Args:
+            name: Project name
+            query: Search query the project was built from
+            source: Data source (ArticleSource value)
+
+        Returns:
+            The new project
+        """
+        project_id = uuid.uuid4().hex[:12]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO projects (id, name, query, source, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (project_id, name, query, source, datetime.now().isoformat())
+            )
+            return self._row_to_project(self._project_row(project_id))
+
+    def get_project(self, project_id: str) -> ScreeningProject:
+        """Get a project with its counters."""
+        with self._lock:
+            return self._row_to_project(self._project_row(project_id))
+
+    def list_projects(self) -> list[ScreeningProject]:
+        """All projects, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, name, query, source, created_at, total_articles, pending_count, "
+                "included_count, excluded_count, maybe_count, estimated_recall FROM projects "
+                "ORDER BY created_at DESC"
+            ).fetchall()
+        return [self._row_to_project(row) for row in rows]
+
+    def delete_project(self, project_id: str) -> None:
+        """Delete a project and its queue, unindexing articles no other project holds."""
+        with self._write():
+            self._project_row(project_id)
+            in_project = "SELECT article_id FROM project_articles WHERE project_id = ?"
+            self._conn.execute(
+                "UPDATE screened_articles SET projects = projects - 1 "
+                f"WHERE article_id IN ({in_project})",
+                (project_id,)
+            )
+            self._conn.execute(
+                f"DELETE FROM screened_articles WHERE article_id IN ({in_project}) "
+                "AND projects <= 0",
+                (project_id,)
+            )
+            self._conn.execute("DELETE FROM project_articles WHERE project_id = ?", (project_id,))
+            self._conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+        self._notify("deleted", project_id, {})
+
+    def add_articles(self, project_id: str, articles: Iterable[ArticleSchema]) -> int:
+        """
+        Append articles to the end of a project's queue as pending.
+
+        Articles already in the project are skipped. New articles are
+        added to the full-text index of screened articles in the same
+        transaction.
+
+        Returns:
+            Number of articles added
+        """
+        with self._write():
+            total = self._project_row(project_id)[5]
+            added = 0
+            for article in articles:
+                data = json.dumps(article.model_dump(include=ARTICLE_DATA_FIELDS))
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO project_articles "
+                    "(project_id, article_id, position, data, entities, entities_extracted) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (project_id, article.id, total + added + 1, data,
+                     json.dumps(article.entities), int(article.entities_extracted))
+                )
+                if not cursor.rowcount:
+                    continue
+                added += 1
+                self._conn.execute(
+                    "INSERT INTO screened_articles "
+                    "(article_id, pmid, title, abstract, keywords, data, projects) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 1) "
+                    "ON CONFLICT (article_id) DO UPDATE SET projects = projects + 1",
+                    (article.id, article.pmid, article.title, article.abstract,
+                     json.dumps(article.keywords), data)
+                )
+
+            self._conn.execute(
+                "UPDATE projects SET total_articles = total_articles + ?, "
+                "pending_count = pending_count + ? WHERE id = ?",
+                (added, added, project_id)
+            )
+        if added:
+            self._notify("added", project_id, {"count": added})
+        return added
+
+    def get_article(self, project_id: str, article_id: str) -> tuple[int, ArticleSchema]:
+        """
+        Get an article and its queue position.
+
+        Raises:
+            ArticleNotFoundError: if the article is not in the project
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM project_articles "
+                "WHERE project_id = ? AND article_id = ?",
+                (project_id, article_id)
+            ).fetchone()
+        if row is None:
+            raise ArticleNotFoundError(article_id)
+        return self._row_to_article(row)
+
+    def next_pending(
+        self,
+        project_id: str,
+        after_position: int = 0
+    ) -> Optional[tuple[int, ArticleSchema]]:
+        """
+        Get the first pending article after a queue position.
+
+        Returns:
+            (position, article), or None if nothing is pending
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM project_articles "
+                "WHERE project_id = ? AND decision = 'pending' AND position > ? "
+                "ORDER BY position LIMIT 1",
+                (project_id, after_position)
+            ).fetchone()
+        return self._row_to_article(row) if row else None
+
+    def claim(
+        self,
+        project_id: str,
+        reviewer: str,
+        limit: int = 1,
+        lease_seconds: float = 600.0,
+        token: Optional[str] = None
+    ) -> list[tuple[int, ArticleSchema]]:
+        """
+        Lease the next pending articles to a reviewer.
+
+        Articles are taken in ranked queue order (highest priority, then
+        earliest position), skipping leased ones; expired leases are taken
+        over. The lookup and the lease are one statement, so concurrent
+        claims never hand out the same article.
+
+        Args:
+            project_id: Project ID
+            reviewer: Reviewer taking the articles
+            limit: Maximum articles to lease
+            lease_seconds: Lease duration
+            token: Lease token of the holder
+
+        Returns:
+            Leased (position, article) pairs in ranked order
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "UPDATE project_articles SET leased_by = ?, lease_expires = ?, lease_token = ? "
+                "WHERE rowid IN ("
+                "SELECT rowid FROM project_articles "
+                "WHERE project_id = ? AND decision = 'pending' "
+                "AND (leased_by IS NULL OR lease_expires <= ?) "
+                "ORDER BY priority DESC, position LIMIT ?) "
+                f"RETURNING priority, {_ARTICLE_COLUMNS}",
+                (reviewer, now + lease_seconds, token, project_id, now, limit)
+            ).fetchall()
+        rows.sort(key=lambda row: (-row[0], row[2]))
+        claimed = [self._row_to_article(row[1:]) for row in rows]
+        if claimed:
+            self._notify("claimed", project_id, {
+                "reviewer": reviewer,
+                "token": token,
+                "article_ids": [article.id for _, article in claimed]
+            })
+        return claimed
+
+    def renew_leases(
+        self,
+        project_id: str,
+        reviewer: str,
+        lease_seconds: float = 600.0,
+        token: Optional[str] = None
+    ) -> int:
+        """
+        Extend a reviewer's leases in a project.
+
+        Args:
+            project_id: Project ID
+            reviewer: Reviewer holding the leases
+            lease_seconds: New lease duration from now
+            token: Only renew leases taken with this token
+
+        Returns:
+            Number of leases renewed
+        """
+        query = (
+            "UPDATE project_articles SET lease_expires = ? "
+            "WHERE project_id = ? AND leased_by = ?"
+        )
+        params: list = [time.time() + lease_seconds, project_id, reviewer]
+        if token is not None:
+            query += " AND lease_token = ?"
+            params.append(token)
+        with self._lock, self._conn:
+            return self._conn.execute(query, params).rowcount
+
+    def release(
+        self,
+        project_id: str,
+        reviewer: str,
+        article_ids: Optional[Iterable[str]] = None,
+        keep: Iterable[str] = (),
+        token: Optional[str] = None
+    ) -> int:
+        """
+        Give up a reviewer's leases so others can claim the articles.
+
+        Args:
+            project_id: Project ID
+            reviewer: Reviewer holding the leases
+            article_ids: Leases to release (default: all of the reviewer's)
+            keep: Leases to hold on to when releasing all
+            token: Only release leases taken with this token
+
+        Returns:
+            Number of leases released
+        """
+        query = (
+            "UPDATE project_articles SET leased_by = NULL, lease_expires = NULL, "
+            "lease_token = NULL WHERE project_id = ? AND leased_by = ?"
+        )
+        params: list = [project_id, reviewer]
+        if token is not None:
+            query += " AND lease_token = ?"
+            params.append(token)
+        with self._lock, self._conn:
+            if article_ids is None:
+                keep = list(keep)
+                if keep:
+                    query += f" AND article_id NOT IN ({', '.join('?' * len(keep))})"
+                return self._conn.execute(query, (*params, *keep)).rowcount
+            return sum(
+                self._conn.execute(query + " AND article_id = ?", (*params, article_id)).rowcount
+                for article_id in article_ids
+            )
+
+    def held_leases(self, project_id: str, token: str, article_ids: list[str]) -> dict[str, int]:
+        """
+        Check which articles are still pending and leased with a token.
+
+        Args:
+            project_id: Project ID
+            token: Lease token of the holder
+            article_ids: Articles to check
+
+        Returns:
+            {article_id: version} for the articles whose lease is held
+        """
+        if not article_ids:
+            return {}
+        now = time.time()
+        with self._lock:
+            # Primary key lookups; filtering in SQL makes SQLite scan the
+            # project's pending articles instead
+            rows = self._conn.execute(
+                "SELECT article_id, version, decision, lease_token, lease_expires "
+                "FROM project_articles WHERE project_id = ? "
+                f"AND article_id IN ({', '.join('?' * len(article_ids))})",
+                (project_id, *article_ids)
+            ).fetchall()
+        return {
+            article_id: version
+            for article_id, version, decision, lease_token, lease_expires in rows
+            if decision == ReviewDecision.PENDING.value
+            and lease_token == token and lease_expires > now
+        }
+
+    def claimable(self, project_id: str, limit: int) -> int:
+        """
+        Count pending articles nobody holds a lease on, up to `limit`.
+
+        Stops counting at `limit`, so the cost does not grow with the queue.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM project_articles "
+                "WHERE project_id = ? AND decision = 'pending' "
+                "AND (leased_by IS NULL OR lease_expires <= ?) LIMIT ?)",
+                (project_id, time.time(), limit)
+            ).fetchone()[0]
+
+    def unextracted(
+        self,
+        project_id: str,
+        limit: int = 32,
+        after_position: int = 0
+    ) -> list[tuple[int, ArticleSchema]]:
+        """
+        Articles without extracted entities, in queue order.
+
+        Args:
+            project_id: Project ID
+            limit: Maximum articles returned
+            after_position: Only articles after this queue position
+
+        Returns:
+            (position, article) pairs
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM project_articles "
+                "WHERE project_id = ? AND position > ? AND entities_extracted = 0 "
+                "ORDER BY position LIMIT ?",
+                (project_id, after_position, limit)
+            ).fetchall()
+        return [self._row_to_article(row) for row in rows]
+
+    def list_articles(
+        self,
+        project_id: str,
+        decision: Optional[ReviewDecision] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> list[tuple[int, ArticleSchema]]:
+        """Articles in queue order, optionally with one decision."""
+        query = f"SELECT {_ARTICLE_COLUMNS} FROM project_articles WHERE project_id = ? "
+        params: list = [project_id]
+        if decision is not None:
+            query += "AND decision = ? "
+            params.append(decision.value)
+        query += "ORDER BY position LIMIT ? OFFSET ?"
+        params += [limit, offset]
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._row_to_article(row) for row in rows]
+
+    def article_ids(self, project_id: str, decision: ReviewDecision) -> list[str]:
+        """IDs of a project's articles with one decision."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT article_id FROM project_articles "
+                "WHERE project_id = ? AND decision = ? ORDER BY position",
+                (project_id, decision.value)
+            ).fetchall()
+        return [article_id for (article_id,) in rows]
+
+    def review(
+        self,
+        project_id: str,
+        article_id: str,
+        decision: ReviewDecision,
+        notes: Optional[str] = None,
+        reviewer: Optional[str] = None,
+        expected_version: Optional[int] = None
+    ) -> tuple[int, ArticleSchema]:
+        """
+        Record a decision, release the article's lease and update the counters.
+
+        Changing an earlier decision moves the article between counters;
+        setting it back to pending returns it to the queue.
+
+        Args:
+            project_id: Project ID
+            article_id: Article to review
+            decision: New decision
+            notes: Reviewer notes
+            reviewer: Reviewer submitting the decision; rejected if the
+                article is leased to someone else
+            expected_version: Article version the decision was based on;
+                rejected if the article has been reviewed since
+
+        Returns:
+            (position, reviewed article)
+
+        Raises:
+            ProjectNotFoundError, ArticleNotFoundError, ReviewConflictError
+        """
+        now = time.time()
+        reviewed_at = None if decision == ReviewDecision.PENDING else datetime.now().isoformat()
+        with self._write():
+            row = self._conn.execute(
+                "SELECT decision, version, leased_by, lease_expires FROM project_articles "
+                "WHERE project_id = ? AND article_id = ?",
+                (project_id, article_id)
+            ).fetchone()
+            if row is None:
+                self._project_row(project_id)
+                raise ArticleNotFoundError(article_id)
+
+            previous, version, leased_by, lease_expires = row
+            previous = ReviewDecision(previous)
+            if expected_version is not None and expected_version != version:
+                raise ReviewConflictError(
+                    f"Article {article_id} was changed (version {version}, "
+                    f"expected {expected_version})",
+                    version
+                )
+            if (reviewer is not None and leased_by is not None
+                    and leased_by != reviewer and lease_expires > now):
+                raise ReviewConflictError(
+                    f"Article {article_id} is leased to another reviewer", version
+                )
+
+            self._conn.execute(
+                "UPDATE project_articles SET decision = ?, notes = ?, reviewed_at = ?, "
+                "version = version + 1, leased_by = NULL, lease_expires = NULL, "
+                "lease_token = NULL "
+                "WHERE project_id = ? AND article_id = ?",
+                (decision.value, notes, reviewed_at, project_id, article_id)
+            )
+            if previous != decision:
+                old_counter = DECISION_COUNTERS[previous]
+                new_counter = DECISION_COUNTERS[decision]
+                # Label changes since the last ranking decide when to retrain
+                labeled = int(previous in LABEL_DECISIONS or decision in LABEL_DECISIONS)
+                self._conn.execute(
+                    f"UPDATE projects SET {old_counter} = {old_counter} - 1, "
+                    f"{new_counter} = {new_counter} + 1, "
+                    "label_changes = label_changes + ? WHERE id = ?",
+                    (labeled, project_id)
+                )
+
+            row = self._conn.execute(
+                f"SELECT {_ARTICLE_COLUMNS} FROM project_articles "
+                "WHERE project_id = ? AND article_id = ?",
+                (project_id, article_id)
+            ).fetchone()
+        self._notify("reviewed", project_id, {
+            "article_id": article_id,
+            "previous": previous,
+            "decision": decision
+        })
+        return self._row_to_article(row)
+
+    def rank_screened(self, match: str, limit: Optional[int] = None) -> list[tuple]:
+        """
+        Full-text search of screened articles, best BM25 matches first.
+
+        Weighted like ArticleStore.rank_matches, so scores from the two
+        indexes can be merged.
+
+        Args:
+            match: FTS5 MATCH expression
+            limit: Maximum matches (None for all)
+
+        Returns:
+            List of (score, id, article_id, pmid); lower scores rank higher
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT hits.score, s.id, s.article_id, s.pmid FROM ("
+                "SELECT rowid, bm25(screened_articles_fts, 10.0, 1.0, 5.0) AS score "
+                "FROM screened_articles_fts WHERE screened_articles_fts MATCH ? "
+                "ORDER BY score LIMIT ?"
+                ") AS hits JOIN screened_articles AS s ON s.id = hits.rowid "
+                "ORDER BY hits.score",
+                (match, -1 if limit is None else limit)
+            ).fetchall()
+
+    def count_screened(self, match: str, limit: int) -> int:
+        """Count screened articles matching an FTS5 expression, up to `limit`."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM (SELECT 1 FROM screened_articles_fts "
+                "WHERE screened_articles_fts MATCH ? LIMIT ?)",
+                (match, limit)
+            ).fetchone()[0]
+
+    def get_screened(self, ids: list[int]) -> dict[int, ArticleSchema]:
+        """
+        Get screened articles by index ID (from `rank_screened`).
+
+        Returns:
+            {id: article} with article data only, no screening fields
+        """
+        if not ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, data FROM screened_articles "
+                f"WHERE id IN ({', '.join('?' * len(ids))})",
+                ids
+            ).fetchall()
+        return {row_id: ArticleSchema(**json.loads(data)) for row_id, data in rows}
+
+    def set_entities(self, project_id: str, entities: dict[str, list[dict]]) -> None:
+        """
+        Store extracted entities for articles in a project.
+
+        Args:
+            project_id: Project ID
+            entities: {article_id: entities}
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE project_articles SET entities = ?, entities_extracted = 1 "
+                "WHERE project_id = ? AND article_id = ?",
+                [(json.dumps(ents), project_id, article_id)
+                 for article_id, ents in entities.items()]
+            )
+        self._notify("entities", project_id, {"entities": entities})
+
+    def training_set(
+        self,
+        project_id: str,
+        texts: bool = True
+    ) -> list[tuple[str, ReviewDecision, Optional[str]]]:
+        """
+        Articles for training the relevance ranker, in queue order.
+
+        Args:
+            project_id: Project ID
+            texts: Include article texts (title, abstract and keywords);
+                without them only IDs and decisions are read
+
+        Returns:
+            List of (article_id, decision, text or None)
+        """
+        columns = "article_id, decision, data" if texts else "article_id, decision"
+        with self._lock:
+            self._project_row(project_id)
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM project_articles "
+                "WHERE project_id = ? ORDER BY position",
+                (project_id,)
+            ).fetchall()
+
+        if not texts:
+            return [(article_id, ReviewDecision(decision), None) for article_id, decision in rows]
+        result = []
+        for article_id, decision, data in rows:
+            data = json.loads(data)
+            text = " ".join([data["title"], data["abstract"], *data["keywords"]])
+            result.append((article_id, ReviewDecision(decision), text))
+        return result
+
+    def set_ranking(
+        self,
+        project_id: str,
+        priorities: dict[str, float],
+        estimated_recall: Optional[float] = None
+    ) -> None:
+        """
+        Store relevance priorities for a project's articles.
+
+        Updates are committed in chunks so reviews are not held up while a
+        large queue is re-ranked.
+
+        Args:
+            project_id: Project ID
+            priorities: {article_id: priority}, higher is reviewed first
+            estimated_recall: Recall estimate to report for the project
+        """
+        items = [(priority, project_id, article_id) for article_id, priority in priorities.items()]
+        for i in range(0, len(items), _RANKING_CHUNK):
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE project_articles SET priority = ? "
+                    "WHERE project_id = ? AND article_id = ?",
+                    items[i:i + _RANKING_CHUNK]
+                )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE projects SET estimated_recall = ?, ranked_at = ? WHERE id = ?",
+                (estimated_recall, datetime.now().isoformat(), project_id)
+            )
+        self._notify("ranked", project_id, {"count": len(items)})
+
+    def begin_ranking(self, project_id: str, min_label_changes: int, force: bool = False) -> bool:
+        """
+        Claim a project's next relevance ranker retrain, if one is due.
+
+        A retrain is due once `min_label_changes` include/exclude decisions
+        were made or changed since the last one began, or when articles
+        were added since the queue was last ranked. Checking and claiming
+        is one statement, so of several worker processes only one retrains.
+
+        Args:
+            project_id: Project ID
+            min_label_changes: Label changes that make a retrain due
+            force: Claim the retrain even if it is not due
+
+        Returns:
+            True if the caller should retrain now
+
+        Raises:
+            ProjectNotFoundError: if the project does not exist
+        """
+        with self._lock, self._conn:
+            claimed = self._conn.execute(
+                "UPDATE projects SET ranked_label_changes = label_changes, "
+                "ranked_total = total_articles WHERE id = ? AND (? "
+                "OR label_changes - ranked_label_changes >= ? "
+                "OR (ranked_at IS NOT NULL AND total_articles > ranked_total))",
+                (project_id, int(force), min_label_changes)
+            ).rowcount
+            if not claimed:
+                self._project_row(project_id)
+        return bool(claimed)
+
+    def ranking_state(self, project_id: str) -> dict:
+        """
+        Get a project's ranking progress.
+
+        Returns:
+            Dict with when the queue was last ranked, the estimated recall,
+            and label changes since the last retrain began
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT ranked_at, estimated_recall, label_changes - ranked_label_changes "
+                "FROM projects WHERE id = ?",
+                (project_id,)
+            ).fetchone()
+        if row is None:
+            raise ProjectNotFoundError(project_id)
+        ranked_at, estimated_recall, new_decisions = row
+        return {
+            "trained_at": ranked_at,
+            "estimated_recall": estimated_recall,
+            "new_decisions": new_decisions
+        }
+
+    def save_job(self, job: dict) -> bool:
+        """
+        Insert or update a background job's progress.
+
+        Args:
+            job: Job fields (id, project_id, query, status, found, queued,
+                extracted, extract_entities, errors, created_at, finished_at)
+
+        Returns:
+            True if another process asked for the job to be cancelled
+        """
+        values = [job[column] for column in _JOB_COLUMNS]
+        values[_JOB_COLUMNS.index("extract_entities")] = int(job["extract_entities"])
+        values[_JOB_COLUMNS.index("errors")] = json.dumps(job["errors"])
+        updates = ", ".join(f"{column} = excluded.{column}" for column in _JOB_COLUMNS[3:])
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"INSERT INTO screening_jobs ({', '.join(_JOB_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(_JOB_COLUMNS))}) "
+                f"ON CONFLICT (id) DO UPDATE SET {updates} "
+                "RETURNING cancel_requested",
+                values
+            ).fetchone()
+        return bool(row[0])
+
+    @staticmethod
+    def _row_to_job(row: tuple) -> dict:
+        job = dict(zip(_JOB_COLUMNS, row))
+        job["extract_entities"] = bool(job["extract_entities"])
+        job["errors"] = json.loads(job["errors"])
+        return job
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """Get a job's last saved progress, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM screening_jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, limit: int = 100) -> list[dict]:
+        """Most recent jobs, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM screening_jobs "
+                "ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def request_job_cancel(self, job_id: str) -> bool:
+        """
+        Ask the process running a job to cancel it at its next progress save.
+
+        Returns:
+            True if the job is running
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE screening_jobs SET cancel_requested = 1 "
+                "WHERE id = ? AND status = 'running'",
+                (job_id,)
+            ).rowcount > 0
+
+    def prune_jobs(self, keep: int = 100) -> int:
+        """
+        Delete the oldest finished jobs beyond `keep`.
+
+        Returns:
+            Number of jobs deleted
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM screening_jobs WHERE id IN ("
+                "SELECT id FROM screening_jobs WHERE finished_at IS NOT NULL "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (keep,)
+            ).rowcount
+
+    def stats(self, project_id: str) -> dict:
+        """
+        Get project counters.
+
+        Returns:
+            Dict with total, pending, included, excluded, maybe, progress
+            and the ranker's estimated recall
+        """
+        project = self.get_project(project_id)
+        total = project.total_articles
+        reviewed = total - project.pending_count
+        return {
+            "project_id": project.id,
+            "project_name": project.name,
+            "total": total,
+            "pending": project.pending_count,
+            "included": project.included_count,
+            "excluded": project.excluded_count,
+            "maybe": project.maybe_count,
+            "progress_percent": round(100 * reviewed / total, 1) if total else 0.0,
+            "estimated_recall": project.estimated_recall
+        }
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+# Singleton instance for reuse
+@lru_cache(maxsize=1)
+def get_screening_store() -> ScreeningStore:
+    """Get the shared ScreeningStore configured from app settings."""
+    return ScreeningStore(config.SCREENING_DB_PATH)
@@ -0,0 +1,115 @@
+"""
+Shared Model Memory Service
+
+Supports serving several API worker processes from one copy of the model
+weights: models are loaded in a parent process before it forks workers,
+so the read-only weight pages stay shared copy-on-write. Also reports
+per-process RSS against shared pages so the sharing can be verified.
+
+See gunicorn.conf.py for the serving setup.
+"""
+
+import gc
+import os
+from typing import Optional
+
+
+def preload_shared_models(model_names: list[str]) -> list[str]:
+    """
+    Load model weights into the model registry before forking workers.
+
+    Only the weights are loaded, no inference is run: starting torch's
+    intra-op thread pool in the parent is not fork-safe. Workers run their
+    own warm-up inference at startup (see app.main).
+
+    Args:
+        model_names: Keys from SUPPORTED_MODELS or HuggingFace model paths
+
+    Returns:
+        Paths of the loaded models
+    """
+    from .entity_extractor import get_extractor
+
+    loaded = []
+    for model_name in model_names:
+        extractor = get_extractor(model_name)
+        extractor.pipeline
+        loaded.append(extractor.model_path)
+
+    # Move everything allocated so far out of the GC's tracked generations,
+    # so collections in the workers don't write to (and unshare) these pages
+    gc.collect()
+    gc.freeze()
+    return loaded
+
+
+def process_memory(pid: Optional[int] = None) -> dict:
+    """
+    Get RSS and shared/private page totals for a process (Linux only).
+
+    Args:
+        pid: Process ID (defaults to the current process)
+
+    Returns:
+        Dict of sizes in MB read from /proc/<pid>/smaps_rollup
+    """
+    pid = pid or os.getpid()
+    fields = {
+        "Rss": "rss_mb",
+        "Pss": "pss_mb",
+        "Shared_Clean": "shared_clean_mb",
+        "Shared_Dirty": "shared_dirty_mb",
+        "Private_Clean": "private_clean_mb",
+        "Private_Dirty": "private_dirty_mb",
+    }
+
+    report = {"pid": pid}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            name, _, value = line.partition(":")
+            if name in fields:
+                report[fields[name]] = round(int(value.split()[0]) / 1024, 1)
+
+    report["shared_mb"] = round(
+        report.get("shared_clean_mb", 0) + report.get("shared_dirty_mb", 0), 1
+    )
+    report["private_mb"] = round(
+        report.get("private_clean_mb", 0) + report.get("private_dirty_mb", 0), 1
+    )
+    return report
+
+
+def worker_memory_report() -> dict:
+    """
+    Get memory use of the parent process and all of its worker processes.
+
+    Under gunicorn the parent is the master that preloaded the models and
+    its children are the API workers. PSS splits shared pages evenly
+    between the processes mapping them, so the PSS total is the real
+    footprint of the whole group.
+
+    Returns:
+        Dict with per-process reports and group totals
+    """
+    parent = os.getppid()
+    pids = [parent]
+    try:
+        with open(f"/proc/{parent}/task/{parent}/children") as f:
+            pids.extend(int(pid) for pid in f.read().split())
+    except OSError:
+        pids.append(os.getpid())
+
+    processes = []
+    for pid in pids:
+        try:
+            processes.append(process_memory(pid))
+        except OSError:
+            # Process exited or is not readable
+            continue
+
+    return {
+        "current_pid": os.getpid(),
+        "processes": processes,
+        "total_rss_mb": round(sum(p.get("rss_mb", 0) for p in processes), 1),
+        "total_pss_mb": round(sum(p.get("pss_mb", 0) for p in processes), 1)
+    }
@@ -0,0 +1,89 @@
+"""
+Benchmark sequential searches with a per-call client vs the shared client.
+
+Starts a local keep-alive stub of the E-utilities esearch endpoint and
+runs the same number of PubMedSearchService.search calls twice: once
+opening a fresh httpx.AsyncClient per call (the old behaviour), and once
+through the shared pooled client. The NCBI rate limit and the HTTP
+cache are bypassed, so only connection handling is measured.
+
+Usage (from backend/):
+    python -m benchmarks.http_client --requests 100
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.services.http_client import create_http_client
+from app.services.pubmed_search import PubMedSearchService
+from app.services.rate_limit import TokenBucket
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers every GET with a small esearch JSON payload."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; avoid delayed-ACK stalls
+    disable_nagle_algorithm = True
+    body = json.dumps({
+        "esearchresult": {"count": "3", "idlist": ["1", "2", "3"]}
+    }).encode()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def run_searches(service: PubMedSearchService, count: int) -> float:
+    """Run `count` sequential searches, returning elapsed seconds."""
+    started = time.perf_counter()
+    for i in range(count):
+        await service.search(f"metformin {i}")
+    return time.perf_counter() - started
+
+
+def stub_service(base_url: str, client=None) -> PubMedSearchService:
+    """A search service pointed at the stub, without NCBI's rate limit."""
+    service = PubMedSearchService(client=client)
+    service.BASE_URL = base_url
+    service.rate_limiter = TokenBucket(rate=1e9)
+    return service
+
+
+async def benchmark(base_url: str, count: int) -> None:
+    per_call_time = await run_searches(stub_service(base_url), count)
+
+    async with create_http_client(cached=False) as client:
+        shared_time = await run_searches(stub_service(base_url, client), count)
+
+    print(f"{count} sequential searches against {base_url}")
+    print(f"  per-call client: {per_call_time:.3f}s ({1000 * per_call_time / count:.2f} ms/search)")
+    print(f"  shared client:   {shared_time:.3f}s ({1000 * shared_time / count:.2f} ms/search)")
+    print(f"  speedup:         {per_call_time / shared_time:.2f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(benchmark(f"http://127.0.0.1:{server.server_port}", args.requests))
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Import-time budget check for the API.
+
+Imports app.main in a fresh interpreter and fails (exit code 1) if it
+takes longer than the budget or pulls in the ML stack, which must only
+be imported when an extractor first loads a model.
+
+Usage (from backend/):
+    python -m benchmarks.import_time --budget 1.0
+"""
+
+import argparse
+import subprocess
+import sys
+
+
+HEAVY_MODULES = ("torch", "transformers", "optimum", "onnxruntime")
+
+PROBE = f"""
+import sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]
+print(elapsed)
+print(",".join(heavy))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds allowed for import app.main")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    timings = []
+    heavy = ""
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+        timings.append(float(output[0]))
+        heavy = output[1] if len(output) > 1 else ""
+
+    best = min(timings)
+    print(f"import app.main: {best:.3f}s (budget {args.budget:.3f}s)")
+
+    failed = False
+    if best > args.budget:
+        print("FAIL: import time over budget")
+        failed = True
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {heavy}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Benchmark the ONNX Runtime backends against the torch backend.
+
+Reports extraction latency per backend and batch size, the speedup over
+torch, and span parity (F1 against torch output). The speedup depends on
+the batch size: ONNX Runtime mostly saves per-call overhead, so it gains
+most on small batches, while large batches are bound by matrix multiply
+throughput on every backend.
+
+Usage (from backend/):
+    python -m benchmarks.onnx_backend --model biomedical-ner-all --texts abstracts.txt
+    python -m benchmarks.onnx_backend --batch-size 1 4 16
+"""
+
+import argparse
+import statistics
+import time
+
+from app.services.entity_extractor import EntityExtractor
+from app.services.onnx_backend import check_parity
+
+
+SAMPLE_TEXTS = [
+    "The patient was treated with Metformin 500mg for Type 2 Diabetes. "
+    "BRCA1 gene mutation was detected.",
+    "Lactic acidosis is a rare but serious adverse event associated with "
+    "metformin use in patients with renal impairment.",
+    "Warfarin combined with amiodarone increased INR and caused "
+    "gastrointestinal bleeding in elderly patients with atrial fibrillation.",
+    "Severe hepatotoxicity was reported after acetaminophen overdose; "
+    "N-acetylcysteine was administered within eight hours.",
+]
+
+
+def time_backend(model_name: str, backend: str, texts: list[str], rounds: int, batch_size: int) -> list[float]:
+    """Time batched extraction, returning seconds per round (after one warm-up)."""
+    extractor = EntityExtractor(model_name, backend=backend, use_cache=False)
+    extractor.extract_entities_batch(texts[:1])
+
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        extractor.extract_entities_batch(texts, batch_size)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="biomedical-ner-all")
+    parser.add_argument("--texts", help="File with one text per line (defaults to built-in samples)")
+    parser.add_argument("--backends", nargs="+", default=["onnx", "onnx-int8"])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args()
+
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = SAMPLE_TEXTS * 8
+
+    parity = {backend: check_parity(texts, args.model, backend) for backend in args.backends}
+    print(f"{len(texts)} texts, model={args.model}")
+    print(f"{'backend':<10} {'batch':>5} {'median s':>9} {'speedup':>8} {'F1':>7} {'max dconf':>10}")
+
+    for batch_size in args.batch_size:
+        baseline = statistics.median(
+            time_backend(args.model, "torch", texts, args.rounds, batch_size)
+        )
+        print(f"{'torch':<10} {batch_size:>5} {baseline:>9.3f} {1.0:>7.2f}x {1.0:>7.4f} {0.0:>10.4f}")
+
+        for backend in args.backends:
+            median = statistics.median(
+                time_backend(args.model, backend, texts, args.rounds, batch_size)
+            )
+            print(
+                f"{backend:<10} {batch_size:>5} {median:>9.3f} {baseline / median:>7.2f}x "
+                f"{parity[backend]['f1']:>7.4f} {parity[backend]['max_confidence_delta']:>10.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
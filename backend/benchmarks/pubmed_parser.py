@@ -0,0 +1,109 @@
+"""
+Benchmark PubMed XML parsing: full-tree vs streaming.
+
+"tree" reproduces the previous approach (decode the whole response to a
+string and build a full ElementTree), "stream" feeds the bytes through
+PubMedXMLStream in chunks. Each mode runs in a fresh interpreter so peak
+RSS is measured independently.
+
+Usage (from backend/):
+    python -m benchmarks.pubmed_parser --fixture efetch_1000.xml
+    python -m benchmarks.pubmed_parser --articles 1000   # synthetic fixture
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+from app.services.pubmed_search import PubMedSearchService
+
+
+def synthetic_article(pmid: int) -> str:
+    """Build a PubmedArticle roughly the size of a real abstract record."""
+    authors = "".join(
+        f"<Author><LastName>Author{i}</LastName><ForeName>F{i}</ForeName></Author>"
+        for i in range(8)
+    )
+    references = "".join(
+        f"<Reference><ArticleIdList><ArticleId IdType=\"pubmed\">{pmid * 100 + i}</ArticleId>"
+        f"</ArticleIdList></Reference>"
+        for i in range(30)
+    )
+    abstract = " ".join(["Metformin was associated with lactic acidosis in renal impairment."] * 20)
+    return (
+        f"<PubmedArticle><MedlineCitation><PMID>{pmid}</PMID><Article>"
+        f"<Journal><Title>Journal of Pharmacovigilance</Title><JournalIssue><PubDate>"
+        f"<Year>2024</Year><Month>Jan</Month></PubDate></JournalIssue></Journal>"
+        f"<ArticleTitle>Article {pmid}</ArticleTitle>"
+        f"<Abstract><AbstractText Label=\"RESULTS\">{abstract}</AbstractText></Abstract>"
+        f"<AuthorList>{authors}</AuthorList></Article>"
+        f"<KeywordList><Keyword>metformin</Keyword><Keyword>safety</Keyword></KeywordList>"
+        f"</MedlineCitation><PubmedData><ArticleIdList>"
+        f"<ArticleId IdType=\"doi\">10.1000/{pmid}</ArticleId></ArticleIdList>"
+        f"<ReferenceList>{references}</ReferenceList></PubmedData></PubmedArticle>"
+    )
+
+
+def run_mode(mode: str, path: str) -> None:
+    """Parse the fixture once and print count, seconds and peak RSS (MB)."""
+    service = PubMedSearchService()
+
+    started = time.perf_counter()
+    with open(path, "rb") as f:
+        if mode == "tree":
+            root = ET.fromstring(f.read().decode("utf-8"))
+            count = sum(
+                1 for elem in root.findall("PubmedArticle")
+                if service._parse_article(elem) is not None
+            )
+        else:
+            # Chunked reads, as the response byte stream arrives
+            count = sum(1 for _ in service.iter_parse_pubmed_xml(f))
+    elapsed = time.perf_counter() - started
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{count} {elapsed:.4f} {peak_mb:.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixture", help="Recorded efetch XML response")
+    parser.add_argument("--articles", type=int, default=1000, help="Synthetic fixture size")
+    parser.add_argument("--mode", choices=["tree", "stream"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.fixture)
+        return
+
+    path = args.fixture
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".xml")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("<PubmedArticleSet>")
+            for pmid in range(1, args.articles + 1):
+                f.write(synthetic_article(pmid))
+            f.write("</PubmedArticleSet>")
+
+    try:
+        print(f"fixture: {path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+        print(f"{'mode':<8} {'articles':>8} {'seconds':>8} {'peak RSS MB':>12}")
+        for mode in ("tree", "stream"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.pubmed_parser", "--mode", mode, "--fixture", path],
+                capture_output=True, text=True, check=True
+            ).stdout.split()
+            count, seconds, peak = output
+            print(f"{mode:<8} {count:>8} {float(seconds):>8.3f} {float(peak):>12.1f}")
+    finally:
+        if args.fixture is None:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
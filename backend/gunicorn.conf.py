@@ -0,0 +1,45 @@
+"""
+Gunicorn configuration for multi-worker serving with shared model weights.
+
+`uvicorn --workers N` spawns fresh interpreters, so each worker loads its
+own copy of every model. Here the master loads the preload models once
+and then forks the uvicorn workers, which share the weight pages
+copy-on-write. Workers should use the thread inference executor
+(the default), since a process pool would load private copies again.
+
+Usage (from backend/):
+    gunicorn app.main:app -c gunicorn.conf.py
+
+Check sharing with GET /memory: per-worker PSS should be well below RSS.
+
+Workers share the NCBI rate limit through VIGI_RATE_LIMIT_PATH (see
+app/services/rate_limit.py), so adding workers does not raise the
+request rate sent to NCBI.
+"""
+
+import multiprocessing
+import os
+
+from app import config
+from app.services.shared_memory import preload_shared_models
+
+
+bind = os.getenv("VIGI_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("VIGI_WORKERS", multiprocessing.cpu_count()))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Model warm-up runs in each worker after fork
+timeout = 120
+
+
+def on_starting(server):
+    """Load model weights in the master before any worker is forked."""
+    if config.INFERENCE_EXECUTOR != "thread":
+        server.log.warning(
+            "VIGI_INFERENCE_EXECUTOR=%s: workers will load private model copies",
+            config.INFERENCE_EXECUTOR
+        )
+        return
+
+    loaded = preload_shared_models(config.PRELOAD_MODELS)
+    server.log.info("Preloaded shared models: %s", ", ".join(loaded) or "none")